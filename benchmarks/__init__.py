@@ -0,0 +1 @@
+"""Бенчмарки конвейера событий, см. benchmarks/run.py."""
@@ -0,0 +1,91 @@
+"""Запуск бенчмарков и сравнение с базовой линией.
+
+    python -m benchmarks.run                         # все, сравнение с benchmarks/baseline.json
+    python -m benchmarks.run --only bus pipeline     # выборочно
+    python -m benchmarks.run --quick --output out.json
+    python -m benchmarks.run --update-baseline       # записать текущие результаты как базу
+
+Код возврата 1, если хоть одна метрика хуже базы больше чем на ``--tolerance``.
+Хвостовые перцентили (``p99``) только печатаются: на общих машинах они
+скачут в разы от запуска к запуску.
+Базовая линия привязана к машине: обновляйте её на той же машине, где гоняете CI.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import platform
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from benchmarks.suite import BENCHMARKS, Metrics, run_all
+
+BASELINE = Path(__file__).with_name("baseline.json")
+UNGATED = (".p99_us",)
+
+
+def compare(results: Metrics, baseline: Metrics, tolerance: float) -> List[Tuple[str, float, float, float, bool]]:
+    """Строки (метрика, база, сейчас, изменение в долях, регрессия)."""
+    rows = []
+    for metric, value in results.items():
+        base = baseline.get(metric)
+        if not base:
+            continue
+        change = (value - base) / base
+        regressed = change < -tolerance if metric.endswith("_per_sec") else change > tolerance
+        regressed = regressed and not metric.endswith(UNGATED)
+        rows.append((metric, base, value, change, regressed))
+    return rows
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="BotPlatform benchmarks")
+    parser.add_argument("--only", nargs="*", choices=sorted(BENCHMARKS), help="run only these benchmarks")
+    parser.add_argument("--quick", action="store_true", help="smaller workloads (scale 0.1)")
+    parser.add_argument("--scale", type=float, default=1.0, help="workload multiplier")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per benchmark, best one is kept")
+    parser.add_argument("--output", type=Path, help="write results JSON here")
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--tolerance", type=float, default=0.3, help="allowed relative slowdown")
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    scale = 0.1 if args.quick else args.scale
+    results = run_all(args.only, scale, args.repeat)
+    report: Dict = {
+        "timestamp": int(time.time()),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "scale": scale,
+        "repeat": args.repeat,
+        "results": results,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2, sort_keys=True))
+
+    if args.update_baseline:
+        baseline = json.loads(args.baseline.read_text())["results"] if args.baseline.exists() else {}
+        baseline.update(results)
+        args.baseline.write_text(json.dumps({**report, "results": baseline}, indent=2, sort_keys=True) + "\n")
+        print(f"baseline updated: {args.baseline}")
+
+    baseline = json.loads(args.baseline.read_text())["results"] if args.baseline.exists() else {}
+    rows = compare(results, baseline, args.tolerance)
+    compared = {r[0] for r in rows}
+    width = max(len(m) for m in results) if results else 10
+    print(f"{'metric'.ljust(width)} {'baseline':>14} {'current':>14} {'change':>9}")
+    for metric, base, value, change, regressed in rows:
+        flag = "  REGRESSION" if regressed else ""
+        print(f"{metric.ljust(width)} {base:14.2f} {value:14.2f} {change:+9.1%}{flag}")
+    for metric in results:
+        if metric not in compared:
+            print(f"{metric.ljust(width)} {'-':>14} {results[metric]:14.2f}")
+    return 1 if any(r[4] for r in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
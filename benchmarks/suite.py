@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from typing import Callable, Dict, List
+
+from botplatform.core.clock import SimulatedClock
+from botplatform.core.event_bus import EventBus
+from botplatform.core.events import Event
+from botplatform.core.models import MarketSnapshot, OrderBookLevel, OrderIntent, Trade
+from botplatform.core.records import MarketRecord
+from botplatform.engines.backtest import BacktestEngine, random_walk_ticks, run_backtest
+from botplatform.engines.signals_indicators import IndicatorSignalsEngine
+from botplatform.engines.strategy_runtime import StrategyRuntime
+from botplatform.exchanges.mock import MockExchange
+from botplatform.legs.base import LegState
+from botplatform.storage.history import MarketHistory
+from botplatform.utils.latency import LATENCY
+
+# Метрики с суффиксом ``_per_sec`` — чем больше, тем лучше; ``_us`` — чем меньше.
+Metrics = Dict[str, float]
+Benchmark = Callable[[float], Metrics]
+
+
+def _rate(n: int, seconds: float) -> float:
+    return n / seconds if seconds > 0 else 0.0
+
+
+def _snapshot(symbol: str, price: float, ts: int) -> MarketSnapshot:
+    return MarketSnapshot(
+        symbol=symbol,
+        price=price,
+        bid=price - 0.5,
+        ask=price + 0.5,
+        bids=[OrderBookLevel(price=price - 0.5, size=1.0)],
+        asks=[OrderBookLevel(price=price + 0.5, size=1.0)],
+        trades=[Trade(price=price, size=0.1, side="BUY", timestamp=ts)],
+        timestamp=ts,
+    )
+
+
+def bench_bus(scale: float) -> Metrics:
+    """Пропускная способность EventBus: публикация -> доставка одному подписчику."""
+    n = int(200_000 * scale)
+
+    async def run() -> float:
+        bus = EventBus()
+        seen = 0
+
+        async def on_event(event: Event) -> None:
+            nonlocal seen
+            seen += 1
+
+        bus.subscribe("market.snapshot", on_event)
+        await bus.start()
+        events = [Event(type="market.snapshot", timestamp=i, source="bench") for i in range(n)]
+        t0 = time.perf_counter()
+        for event in events:
+            await bus.publish(event)
+        await bus.join()
+        elapsed = time.perf_counter() - t0
+        await bus.stop()
+        assert seen == n
+        return elapsed
+
+    return {"bus.publish_dispatch.events_per_sec": _rate(n, asyncio.run(run()))}
+
+
+def bench_snapshot(scale: float) -> Metrics:
+    """Стоимость построения и сериализации MarketSnapshot в сравнении с MarketRecord."""
+    n = int(50_000 * scale)
+    t0 = time.perf_counter()
+    snaps = [_snapshot("BTCUSDT", 100.0 + i * 1e-3, i) for i in range(n)]
+    build = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for s in snaps:
+        s.dict()
+    to_dict = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for s in snaps:
+        json.dumps(s.dict())
+    to_json = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    records = [MarketRecord.from_model(s) for s in snaps]
+    record_build = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for r in records:
+        r.to_model()
+    record_to_model = time.perf_counter() - t0
+
+    return {
+        "snapshot.build_us": build / n * 1e6,
+        "snapshot.dict_us": to_dict / n * 1e6,
+        "snapshot.json_us": to_json / n * 1e6,
+        "record.from_model_us": record_build / n * 1e6,
+        "record.to_model_us": record_to_model / n * 1e6,
+    }
+
+
+def bench_tick_to_intent(scale: float) -> Metrics:
+    """StrategyRuntime + HedgeStrategy: задержка от появления тика до отправки интентов.
+
+    Ноги после каждого исполнения обнуляются, иначе интенты были бы только
+    на первом тике, и стратегия открывает позицию на каждом тике.
+    """
+    n = int(5_000 * scale)
+    symbol = "BTCUSDT"
+
+    async def run() -> None:
+        clock = SimulatedClock()
+        bus = EventBus()
+        engine = BacktestEngine(bus, clock, random_walk_ticks([symbol], n, seed=1))
+        exchange = MockExchange(price_provider=engine.price, clock=clock)
+        history = MarketHistory()
+        history.subscribe(bus)
+        runtime = StrategyRuntime(
+            event_bus=bus,
+            exchange=exchange,
+            symbols=[symbol],
+            history=history,
+            signals=IndicatorSignalsEngine(),
+            clock=clock,
+            reconcile_interval=0.0,
+        )
+        legs = runtime.strategy_engine.get(f"hedge-{symbol}").legs()
+
+        async def flatten(event: Event) -> None:
+            for leg in legs:
+                leg.state = LegState(side=leg.state.side)
+
+        bus.subscribe("order.update", flatten)
+        await bus.start()
+        await runtime.start()
+        try:
+            await engine.run()
+        finally:
+            await runtime.stop()
+            await bus.stop()
+
+    LATENCY.reset()
+    asyncio.run(run())
+    hist = LATENCY.stage("execution.submit")
+    on_tick = LATENCY.stage("strategy.on_tick.end")
+    return {
+        "runtime.tick_to_intent.p50_us": hist.percentile(50) / 1000.0,
+        "runtime.tick_to_intent.p99_us": hist.percentile(99) / 1000.0,
+        "runtime.on_tick_end.p50_us": on_tick.percentile(50) / 1000.0,
+    }
+
+
+def bench_place_order(scale: float) -> Metrics:
+    """Пропускная способность исполнения MockExchange.place_order."""
+    n = int(50_000 * scale)
+    exchange = MockExchange()
+    intents = [
+        OrderIntent(
+            symbol=f"S{i % 10}",
+            side="BUY" if i % 3 else "SELL",
+            type="MARKET",
+            size=1.0,
+            client_id=str(i),
+            source="bench",
+        )
+        for i in range(n)
+    ]
+
+    async def run() -> float:
+        t0 = time.perf_counter()
+        for intent in intents:
+            await exchange.place_order(intent)
+        return time.perf_counter() - t0
+
+    return {"mock_exchange.fills_per_sec": _rate(n, asyncio.run(run()))}
+
+
+def bench_pipeline(scale: float) -> Metrics:
+    """Весь конвейер (шина, история, индикаторы, стратегия, исполнение) на 1/10/100/1000 символах."""
+    total = int(5_000 * scale)
+    metrics: Metrics = {}
+    for n_symbols in (1, 10, 100, 1000):
+        symbols = [f"S{i:04d}" for i in range(n_symbols)]
+        steps = max(1, total // n_symbols)
+        report = asyncio.run(run_backtest(symbols, random_walk_ticks(symbols, steps, seed=1)))
+        metrics[f"pipeline.symbols_{n_symbols}.ticks_per_sec"] = report.ticks_per_sec
+    return metrics
+
+
+BENCHMARKS: Dict[str, Benchmark] = {
+    "bus": bench_bus,
+    "snapshot": bench_snapshot,
+    "tick_to_intent": bench_tick_to_intent,
+    "place_order": bench_place_order,
+    "pipeline": bench_pipeline,
+}
+
+
+def best(metric: str, a: float, b: float) -> float:
+    return max(a, b) if metric.endswith("_per_sec") else min(a, b)
+
+
+def run_all(names: List[str] | None = None, scale: float = 1.0, repeat: int = 3) -> Metrics:
+    """Каждый бенчмарк гоняется ``repeat`` раз, берётся лучший результат — он меньше всего шумит."""
+    results: Metrics = {}
+    for name, bench in BENCHMARKS.items():
+        if names and name not in names:
+            continue
+        for _ in range(repeat):
+            for metric, value in bench(scale).items():
+                results[metric] = best(metric, results[metric], value) if metric in results else value
+    return results
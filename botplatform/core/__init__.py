@@ -9,5 +9,6 @@ from .models import (
     OrderIntent,
     OrderUpdate,
 )
+from .records import MarketRecord, TradeRecord
 from .context import StrategyContext
 from .events import Event
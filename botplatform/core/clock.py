@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import time
+
+
+class Clock:
+    """Источник времени для движков и бирж.
+
+    Всё время платформы берётся отсюда, а не из ``time.time()``: в боевом
+    режиме это ``SystemClock``, в бэктесте — ``SimulatedClock``, который
+    двигается по времени событий.
+    """
+
+    def time(self) -> float:
+        """Текущее время, секунды от эпохи."""
+        raise NotImplementedError
+
+    def now_ms(self) -> int:
+        return int(self.time() * 1000)
+
+
+class SystemClock(Clock):
+    def time(self) -> float:
+        return time.time()
+
+
+class SimulatedClock(Clock):
+    """Время, которое двигает владелец (обычно ``BacktestEngine``).
+
+    Время не идёт назад: ``advance_to`` с меньшей меткой игнорируется.
+    """
+
+    def __init__(self, start_ms: int = 0) -> None:
+        self._now_ms = start_ms
+
+    def time(self) -> float:
+        return self._now_ms / 1000.0
+
+    def now_ms(self) -> int:
+        return self._now_ms
+
+    def advance_to(self, ts_ms: int) -> None:
+        if ts_ms > self._now_ms:
+            self._now_ms = ts_ms
+
+    def advance(self, ms: int) -> None:
+        self._now_ms += ms
+
+
+SYSTEM_CLOCK = SystemClock()
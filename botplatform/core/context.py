@@ -1,14 +1,17 @@
 from __future__ import annotations
 
 from pydantic import BaseModel
-from typing import Optional
+from typing import Any, Optional
 
-from .models import MarketSnapshot, SignalSnapshot, PositionSnapshot
+from .models import SignalSnapshot, PositionSnapshot
 
 
 class StrategyContext(BaseModel):
     symbol: str
-    market: MarketSnapshot
+    # MarketSnapshot или MarketRecord (core.records) — как пришло в шину;
+    # скалярные поля symbol/price/bid/ask/timestamp у них общие.
+    market: Any
     signals: Optional[SignalSnapshot] = None
     position: Optional[PositionSnapshot] = None
+    history: Optional[Any] = None  # TickRingBuffer символа, см. storage.history
     timestamp: int  # unix ms
@@ -1,43 +1,175 @@
 from __future__ import annotations
 
 import asyncio
+import logging
 from collections import defaultdict
-from typing import Awaitable, Callable, DefaultDict, List
+from typing import Awaitable, Callable, DefaultDict, Dict, Hashable, Iterable, List, Optional, Sequence
 
+from botplatform.core.event_queue import (
+    DEFAULT_DROPPABLE_TYPES,
+    DEFAULT_LANES,
+    EventQueue,
+    OverflowPolicy,
+    PriorityFn,
+    symbol_partition_key,
+)
 from botplatform.core.events import Event
+from botplatform.core.profiler import BusProfiler, callback_name
+from botplatform.utils.latency import LATENCY, now_ns
+
+PartitionKey = Callable[[Event], Optional[Hashable]]
+PublishHook = Callable[[Event], None]
+
+log = logging.getLogger("botplatform.bus")
 
 
 class EventBus:
-    """Простая асинхронная шина событий."""
+    """Асинхронная шина событий.
+
+    По умолчанию все события обрабатываются одним воркером в порядке публикации.
+    При ``shards > 1`` события раскладываются по воркерам по ключу
+    ``(event.type, partition_key(event))``: порядок внутри ключа сохраняется,
+    а медленный обработчик одного символа не задерживает остальные.
+
+    ``maxsize`` ограничивает очередь каждого воркера по рыночным данным,
+    поведение при переполнении задаётся ``overflow``. Внутри воркера события
+    разложены по полосам приоритета ``lanes``: обновления ордеров обгоняют
+    риск-события, а те — рыночные данные (см. ``EventQueue``).
 
-    def __init__(self) -> None:
-        self._queue: asyncio.Queue[Event] = asyncio.Queue()
+    ``profiler`` (``BusProfiler``) собирает время обработчиков и ожидания в
+    очереди и ловит обработчики, блокирующие loop.
+    """
+
+    def __init__(
+        self,
+        shards: int = 1,
+        partition_key: PartitionKey | None = None,
+        maxsize: int = 0,
+        overflow: OverflowPolicy = "block",
+        droppable_types: Iterable[str] = DEFAULT_DROPPABLE_TYPES,
+        lanes: Sequence[str] = DEFAULT_LANES,
+        priority: PriorityFn | None = None,
+        max_skip: int = 16,
+        profiler: BusProfiler | None = None,
+    ) -> None:
+        if shards < 1:
+            raise ValueError("shards must be >= 1")
+        self._shards = shards
+        self._partition_key: PartitionKey = partition_key or symbol_partition_key
+        self._queues: List[EventQueue] = [
+            EventQueue(
+                maxsize=maxsize,
+                overflow=overflow,
+                droppable_types=droppable_types,
+                conflate_key=self._partition_key,
+                lanes=lanes,
+                priority=priority,
+                max_skip=max_skip,
+            )
+            for _ in range(shards)
+        ]
         self._subscribers: DefaultDict[str, List[Callable[[Event], Awaitable[None]]]] = defaultdict(list)
         self._running: bool = False
-        self._task: asyncio.Task | None = None
+        self._tasks: List[asyncio.Task] = []
+        self._active: int = 0
+        self._hooks: List[PublishHook] = []
+        self.profiler = profiler
+        self._idle = asyncio.Event()
+
+    @property
+    def shards(self) -> int:
+        return self._shards
+
+    def queue_stats(self) -> Dict[str, int]:
+        return {
+            "depth": sum(q.qsize() for q in self._queues),
+            "dropped": sum(q.dropped for q in self._queues),
+            "conflated": sum(q.conflated for q in self._queues),
+        }
+
+    def lane_stats(self) -> Dict[str, Dict[str, int]]:
+        """Метрики по полосам приоритета, суммированные по всем воркерам."""
+        total: Dict[str, Dict[str, int]] = {}
+        for q in self._queues:
+            for lane, stats in q.lane_stats().items():
+                acc = total.setdefault(lane, dict.fromkeys(stats, 0))
+                for k, v in stats.items():
+                    acc[k] = max(acc[k], v) if k == "max_depth" else acc[k] + v
+        return total
+
+    def _shard_for(self, event: Event) -> int:
+        if self._shards == 1:
+            return 0
+        return hash((event.type, self._partition_key(event))) % self._shards
+
+    def add_publish_hook(self, hook: PublishHook) -> None:
+        """Синхронный вызов ``hook(event)`` на каждую публикацию (запись журнала и т.п.).
+
+        Хук вызывается в event loop до постановки в очередь и должен быть дешёвым.
+        """
+        self._hooks.append(hook)
 
     async def publish(self, event: Event) -> None:
-        await self._queue.put(event)
+        for hook in self._hooks:
+            hook(event)
+        if event.type.startswith("market."):
+            LATENCY.since("bus.enqueue", event.ingest_ns)
+        await self._queues[self._shard_for(event)].put(event)
 
     def subscribe(self, event_type: str, callback: Callable[[Event], Awaitable[None]]) -> None:
         self._subscribers[event_type].append(callback)
 
-    async def _loop(self) -> None:
-        self._running = True
+    def _drained(self) -> bool:
+        return self._active == 0 and all(q.empty() for q in self._queues)
+
+    async def join(self) -> None:
+        """Дождаться, пока все очереди опустеют и обработчики завершатся.
+
+        Учитываются и события, опубликованные самими обработчиками.
+        Нужна, когда источник событий сам задаёт темп (бэктест).
+        """
+        while not self._drained():
+            self._idle.clear()
+            await self._idle.wait()
+
+    async def _loop(self, queue: EventQueue) -> None:
         while self._running:
-            event = await self._queue.get()
+            event, enqueued_ns = await queue.get_timed()
+            self._active += 1
+            t = now_ns()
+            LATENCY.record("bus.queue_wait", t - enqueued_ns)
+            if event.type.startswith("market."):
+                LATENCY.record("bus.dequeue", t - event.ingest_ns)
+            profiler = self.profiler
+            if profiler is not None:
+                profiler.on_dequeue(event.type, t - enqueued_ns)
             callbacks = list(self._subscribers.get(event.type, []))
             for cb in callbacks:
+                token = profiler.enter(cb, event.type) if profiler is not None else None
+                failed = False
                 try:
                     await cb(event)
-                except Exception as exc:  # noqa: BLE001
-                    print(f"[EventBus] Error in subscriber {cb}: {exc!r}")
+                except Exception:  # noqa: BLE001
+                    failed = True
+                    log.exception("Error in subscriber %s for %s", callback_name(cb), event.type)
+                if token is not None:
+                    profiler.exit(token, failed)
+            self._active -= 1
+            if self._drained():
+                self._idle.set()
 
     async def start(self) -> None:
-        if self._task is None or self._task.done():
-            self._task = asyncio.create_task(self._loop())
+        if self._tasks and not all(t.done() for t in self._tasks):
+            return
+        self._running = True
+        self._tasks = [asyncio.create_task(self._loop(q)) for q in self._queues]
+        if self.profiler is not None:
+            await self.profiler.start()
 
     async def stop(self) -> None:
         self._running = False
-        if self._task:
-            self._task.cancel()
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+        if self.profiler is not None:
+            await self.profiler.stop()
@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Hashable, Iterable, List, Literal, Optional, Sequence, Tuple
+
+from botplatform.core.events import Event
+
+OverflowPolicy = Literal["block", "drop_oldest", "conflate"]
+PriorityFn = Callable[[Event], int]
+
+# Рыночные данные можно терять или схлопывать: важна только последняя цена.
+DEFAULT_DROPPABLE_TYPES = ("market.snapshot", "market.book")
+
+# Полосы приоритета, от старшей к младшей.
+DEFAULT_LANES = ("order", "risk", "normal", "market")
+
+
+def symbol_partition_key(event: Event) -> Optional[Hashable]:
+    """Символ события: из типизированного ``data``, иначе из ``payload``."""
+    if event.data is not None:
+        return getattr(event.data, "symbol", None)
+    return event.payload.get("symbol")
+
+
+def default_priority(event: Event) -> int:
+    """Индекс полосы в DEFAULT_LANES: ордера (fills/rejects/cancels) → риск → прочее → рынок."""
+    t = event.type
+    if t.startswith("order."):
+        return 0
+    if t.startswith("risk."):
+        return 1
+    if t.startswith("market."):
+        return 3
+    return 2
+
+
+class _Lane:
+    def __init__(self, name: str) -> None:
+        self.name = name
+        # Слот — [event, conflate_key, enqueue_ns]; conflate подменяет event прямо в слоте.
+        self.items: Deque[List] = deque()
+        self.pending: Dict[Hashable, List] = {}
+        self.size: int = 0
+        self.droppable_size: int = 0
+        self.skipped: int = 0
+        self.not_full = asyncio.Event()
+        self.not_full.set()
+        self.max_depth: int = 0
+        self.enqueued: int = 0
+        self.dispatched: int = 0
+        self.dropped: int = 0
+        self.conflated: int = 0
+
+    def forget(self, slot: List) -> None:
+        key = slot[1]
+        if key is not None and self.pending.get(key) is slot:
+            del self.pending[key]
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "depth": self.size,
+            "max_depth": self.max_depth,
+            "enqueued": self.enqueued,
+            "dispatched": self.dispatched,
+            "dropped": self.dropped,
+            "conflated": self.conflated,
+        }
+
+
+class EventQueue:
+    """Очередь событий шины с полосами приоритета и опциональным ограничением размера.
+
+    Событие попадает в полосу ``lanes[priority(event)]``; читатель всегда берёт
+    событие из старшей непустой полосы. Чтобы младшие полосы не голодали,
+    полоса, пропущенная ``max_skip`` раз подряд при наличии событий,
+    обслуживается вне очереди.
+
+    Ограничение ``maxsize`` действует на каждую полосу и только на
+    «сбрасываемые» типы событий (``droppable_types``, по умолчанию
+    ``market.snapshot`` и ``market.book``). Остальные события, в том числе
+    ``order.update``, принимаются всегда и никогда не теряются.
+
+    Политики переполнения:
+
+    - ``block`` — издатель ждёт, пока в полосе освободится место;
+    - ``drop_oldest`` — вытесняется самое старое сбрасываемое событие полосы;
+    - ``conflate`` — для каждого ключа (тип, символ) в очереди хранится только
+      последнее событие: новое заменяет ожидающее на его месте; если полоса
+      всё равно заполнена, вытесняется самое старое.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 0,
+        overflow: OverflowPolicy = "block",
+        droppable_types: Iterable[str] = DEFAULT_DROPPABLE_TYPES,
+        conflate_key: Callable[[Event], Optional[Hashable]] | None = None,
+        lanes: Sequence[str] = DEFAULT_LANES,
+        priority: PriorityFn | None = None,
+        max_skip: int = 16,
+    ) -> None:
+        if overflow not in ("block", "drop_oldest", "conflate"):
+            raise ValueError(f"unknown overflow policy: {overflow!r}")
+        if not lanes:
+            raise ValueError("at least one lane is required")
+        self.maxsize = maxsize
+        self.overflow: OverflowPolicy = overflow
+        self.max_skip = max_skip
+        self._droppable = frozenset(droppable_types)
+        self._conflate_key = conflate_key or symbol_partition_key
+        self._lanes: List[_Lane] = [_Lane(name) for name in lanes]
+        if priority is None:
+            priority = default_priority if tuple(lanes) == DEFAULT_LANES else (lambda event: 0)
+        self._priority = priority
+        self._size: int = 0
+        self._not_empty = asyncio.Event()
+
+    def qsize(self) -> int:
+        return self._size
+
+    def empty(self) -> bool:
+        return self._size == 0
+
+    @property
+    def dropped(self) -> int:
+        return sum(lane.dropped for lane in self._lanes)
+
+    @property
+    def conflated(self) -> int:
+        return sum(lane.conflated for lane in self._lanes)
+
+    def lane_stats(self) -> Dict[str, Dict[str, int]]:
+        return {lane.name: lane.stats() for lane in self._lanes}
+
+    def _lane_for(self, event: Event) -> _Lane:
+        idx = self._priority(event)
+        return self._lanes[min(max(idx, 0), len(self._lanes) - 1)]
+
+    def _full(self, lane: _Lane) -> bool:
+        return 0 < self.maxsize <= lane.droppable_size
+
+    async def put(self, event: Event) -> None:
+        lane = self._lane_for(event)
+        if event.type not in self._droppable:
+            self._append(lane, event, None)
+            return
+
+        key: Optional[Hashable] = None
+        if self.overflow == "conflate":
+            symbol = self._conflate_key(event)
+            if symbol is not None:
+                key = (event.type, symbol)
+                slot = lane.pending.get(key)
+                if slot is not None:
+                    slot[0] = event
+                    lane.conflated += 1
+                    return
+
+        while self._full(lane):
+            if self.overflow == "block":
+                lane.not_full.clear()
+                await lane.not_full.wait()
+            else:
+                self._drop_oldest(lane)
+
+        lane.droppable_size += 1
+        self._append(lane, event, key)
+
+    def _append(self, lane: _Lane, event: Event, key: Optional[Hashable]) -> None:
+        slot = [event, key, time.perf_counter_ns()]
+        lane.items.append(slot)
+        if key is not None:
+            lane.pending[key] = slot
+        lane.size += 1
+        lane.enqueued += 1
+        if lane.size > lane.max_depth:
+            lane.max_depth = lane.size
+        self._size += 1
+        self._not_empty.set()
+
+    def _drop_oldest(self, lane: _Lane) -> None:
+        # Слот удаляется из deque сразу: просматриваются только несбрасываемые
+        # события перед ним, обычно это голова полосы.
+        items = lane.items
+        for i, slot in enumerate(items):
+            if slot[0].type in self._droppable:
+                if i == 0:
+                    items.popleft()
+                else:
+                    del items[i]
+                lane.forget(slot)
+                lane.size -= 1
+                lane.droppable_size -= 1
+                lane.dropped += 1
+                self._size -= 1
+                return
+
+    def _next_lane(self) -> _Lane:
+        chosen: _Lane | None = None
+        starving: _Lane | None = None
+        for lane in self._lanes:
+            if lane.size == 0:
+                continue
+            if chosen is None:
+                chosen = lane
+            elif lane.skipped >= self.max_skip and (starving is None or lane.skipped > starving.skipped):
+                starving = lane
+        if starving is not None:
+            chosen = starving
+        for lane in self._lanes:
+            if lane is chosen:
+                lane.skipped = 0
+            elif lane.size:
+                lane.skipped += 1
+        assert chosen is not None
+        return chosen
+
+    async def get(self) -> Event:
+        event, _ = await self.get_timed()
+        return event
+
+    async def get_timed(self) -> Tuple[Event, int]:
+        """Событие и момент его постановки в очередь (perf_counter_ns)."""
+        while self._size == 0:
+            self._not_empty.clear()
+            await self._not_empty.wait()
+        lane = self._next_lane()
+        slot = lane.items.popleft()
+        event = slot[0]
+        lane.forget(slot)
+        lane.size -= 1
+        lane.dispatched += 1
+        self._size -= 1
+        if event.type in self._droppable:
+            lane.droppable_size -= 1
+            lane.not_full.set()
+        return event, slot[2]
@@ -1,7 +1,11 @@
 from __future__ import annotations
 
+import time
+
 from pydantic import BaseModel, Field
-from typing import Optional, Dict
+from typing import Any, Optional, Dict, Type, TypeVar
+
+M = TypeVar("M", bound=BaseModel)
 
 
 class Event(BaseModel):
@@ -10,3 +14,29 @@ class Event(BaseModel):
     source: str
     correlation_id: Optional[str] = None
     payload: Dict = Field(default_factory=dict)
+    # Готовый объект модели для доставки внутри процесса: подписчики получают
+    # его как есть, без копирования и повторной валидации. В сериализацию не
+    # попадает — см. to_wire().
+    data: Any = Field(default=None, exclude=True)
+    # Момент появления события в процессе (perf_counter_ns) — начало отсчёта
+    # задержек тракта «тик → ордер», см. utils.latency. Не сериализуется.
+    ingest_ns: int = Field(default_factory=time.perf_counter_ns, exclude=True)
+
+    def as_model(self, model: Type[M]) -> M:
+        data = self.data
+        if isinstance(data, model):
+            return data
+        # Компактные записи (core.records) конвертируются в модель на границе API.
+        to_model = getattr(data, "to_model", None)
+        if to_model is not None:
+            converted = to_model()
+            if isinstance(converted, model):
+                return converted
+        return model(**self.payload)
+
+    def to_wire(self) -> Dict:
+        """Сериализованное представление события для передачи за пределы процесса."""
+        wire = self.dict()
+        if self.data is not None:
+            wire["payload"] = self.data.dict()
+        return wire
@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+from typing import Tuple
+
+from botplatform.core.models import OrderUpdate
+
+TERMINAL_STATUSES = frozenset({"FILLED", "CANCELLED", "REJECTED"})
+
+# Сколько последних ордеров помнят биржи (``get_order``, ``order_fills``).
+ORDER_HISTORY = 100_000
+
+
+def fill_delta(update: OrderUpdate, prev_filled: float, prev_avg: float) -> Tuple[float, float]:
+    """Приращение исполнения между двумя накопительными обновлениями ордера: (объём, цена)."""
+    delta = update.filled_size - prev_filled
+    if delta <= 0.0 or update.avg_fill_price is None:
+        return 0.0, 0.0
+    price = (update.avg_fill_price * update.filled_size - prev_avg * prev_filled) / delta
+    return delta, price
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from .models import PositionSnapshot
+
+
+class PositionLedger:
+    """Учёт позиций по символам в колоночных массивах NumPy.
+
+    Позиция хранится как знаковый объём ``qty`` (LONG > 0, SHORT < 0),
+    средняя цена входа ``entry``, реализованный и нереализованный PnL и
+    последняя цена ``mark``. Правила учёта исполнения:
+
+    - сделка в сторону позиции (или из нуля) усредняет цену входа;
+    - встречная сделка закрывает ``min(|qty|, size)`` и фиксирует PnL
+      по цене входа;
+    - если встречная сделка больше позиции, остаток открывает позицию
+      в обратную сторону по цене сделки.
+
+    ``apply_fills`` применяет пачку исполнений векторно; повторы одного
+    символа обрабатываются раундами в исходном порядке. ``mark`` /
+    ``mark_many`` пересчитывают нереализованный PnL всех позиций за один
+    векторный проход.
+    """
+
+    def __init__(self, capacity: int = 64) -> None:
+        self._index: Dict[str, int] = {}
+        self._symbols: List[str] = []
+        self._capacity = capacity
+        self.qty = np.zeros(capacity, dtype=np.float64)
+        self.entry = np.zeros(capacity, dtype=np.float64)
+        self.realized = np.zeros(capacity, dtype=np.float64)
+        self.unrealized = np.zeros(capacity, dtype=np.float64)
+        self.mark_price = np.zeros(capacity, dtype=np.float64)
+
+    def __len__(self) -> int:
+        return len(self._symbols)
+
+    @property
+    def symbols(self) -> List[str]:
+        return list(self._symbols)
+
+    def slot(self, symbol: str) -> int:
+        idx = self._index.get(symbol)
+        if idx is None:
+            idx = len(self._symbols)
+            if idx >= self._capacity:
+                self._grow()
+            self._index[symbol] = idx
+            self._symbols.append(symbol)
+        return idx
+
+    def _grow(self) -> None:
+        old, new = self._capacity, self._capacity * 2
+        for name in ("qty", "entry", "realized", "unrealized", "mark_price"):
+            arr = np.zeros(new, dtype=np.float64)
+            arr[:old] = getattr(self, name)
+            setattr(self, name, arr)
+        self._capacity = new
+
+    def apply_fill(self, symbol: str, side: str, size: float, price: float) -> None:
+        # Одиночное исполнение считаем скалярно: векторный путь на одном
+        # элементе в разы дороже из-за накладных расходов NumPy.
+        idx = self.slot(symbol)
+        q = float(self.qty[idx])
+        e = float(self.entry[idx])
+        d = size if side == "BUY" else -size
+        new = q + d
+        if q * d >= 0.0:
+            entry = (abs(q) * e + abs(d) * price) / abs(new) if new else 0.0
+        else:
+            closed = min(abs(q), abs(d))
+            self.realized[idx] += closed * (price - e) * (1.0 if q > 0 else -1.0)
+            entry = 0.0 if new == 0.0 else price if (new > 0) != (q > 0) else e
+        self.qty[idx] = new
+        self.entry[idx] = entry
+        mark = float(self.mark_price[idx])
+        self.unrealized[idx] = new * (mark - entry) if mark > 0.0 else 0.0
+
+    def apply_fills(
+        self,
+        symbols: Sequence[str],
+        sides: Sequence[str],
+        sizes: Sequence[float],
+        prices: Sequence[float],
+    ) -> None:
+        slots = [self.slot(s) for s in symbols]
+        signed = np.array(
+            [size if side == "BUY" else -size for side, size in zip(sides, sizes)], dtype=np.float64
+        )
+        px = np.asarray(prices, dtype=np.float64)
+        start = 0
+        while start < len(slots):
+            seen: set = set()
+            end = start
+            while end < len(slots) and slots[end] not in seen:
+                seen.add(slots[end])
+                end += 1
+            self._apply(np.array(slots[start:end]), signed[start:end], px[start:end])
+            start = end
+
+    def _apply(self, idx: np.ndarray, d: np.ndarray, p: np.ndarray) -> None:
+        q = self.qty[idx]
+        e = self.entry[idx]
+        new = q + d
+        adding = q * d >= 0.0
+        closed = np.minimum(np.abs(q), np.abs(d))
+        self.realized[idx] += np.where(adding, 0.0, closed * (p - e) * np.sign(q))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            averaged = (np.abs(q) * e + np.abs(d) * p) / np.abs(new)
+        flipped = np.sign(new) != np.sign(q)
+        entry = np.where(adding, averaged, np.where(flipped, p, e))
+        entry = np.where(new == 0.0, 0.0, entry)
+        self.qty[idx] = new
+        self.entry[idx] = entry
+        mark = self.mark_price[idx]
+        self.unrealized[idx] = np.where(mark > 0.0, new * (mark - entry), 0.0)
+
+    def mark(self, symbol: str, price: float) -> None:
+        idx = self.slot(symbol)  # slot() может пересоздать массивы
+        self.mark_price[idx] = price
+        self._revalue()
+
+    def mark_many(self, prices: Mapping[str, float]) -> None:
+        for symbol, price in prices.items():
+            idx = self.slot(symbol)
+            self.mark_price[idx] = price
+        self._revalue()
+
+    def _revalue(self) -> None:
+        n = len(self._symbols)
+        mark = self.mark_price[:n]
+        np.multiply(self.qty[:n], mark - self.entry[:n], out=self.unrealized[:n])
+        self.unrealized[:n][mark <= 0.0] = 0.0
+
+    def set_position(self, pos: PositionSnapshot) -> None:
+        idx = self.slot(pos.symbol)
+        self.qty[idx] = pos.size if pos.side == "LONG" else -pos.size if pos.side == "SHORT" else 0.0
+        self.entry[idx] = pos.entry_price if self.qty[idx] else 0.0
+        self.realized[idx] = pos.realized_pnl
+        mark = self.mark_price[idx]
+        self.unrealized[idx] = self.qty[idx] * (mark - self.entry[idx]) if mark > 0.0 else 0.0
+
+    def replace(self, positions: Iterable[PositionSnapshot]) -> None:
+        """Полная замена позиций (сверка с биржей); последние цены сохраняются."""
+        n = len(self._symbols)
+        for arr in (self.qty, self.entry, self.realized, self.unrealized):
+            arr[:n] = 0.0
+        for pos in positions:
+            self.set_position(pos)
+
+    def snapshot(self, symbol: str) -> PositionSnapshot:
+        idx = self._index.get(symbol)
+        if idx is None:
+            return PositionSnapshot(symbol=symbol)
+        q = float(self.qty[idx])
+        return PositionSnapshot(
+            symbol=symbol,
+            side="LONG" if q > 0 else "SHORT" if q < 0 else None,
+            size=abs(q),
+            entry_price=float(self.entry[idx]),
+            realized_pnl=float(self.realized[idx]),
+            unrealized_pnl=float(self.unrealized[idx]),
+        )
+
+    def snapshots(self, symbols: Optional[Iterable[str]] = None) -> Dict[str, PositionSnapshot]:
+        if symbols is None:
+            symbols = self._symbols
+        return {s: self.snapshot(s) for s in symbols}
@@ -66,6 +66,7 @@ class OrderUpdate(BaseModel):
     order_id: str
     client_id: str
     symbol: str
+    side: Optional[Literal["BUY", "SELL"]] = None
     status: Literal["NEW", "PARTIAL", "FILLED", "CANCELLED", "REJECTED"]
     filled_size: float
     remaining_size: float
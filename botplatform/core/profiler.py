@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from botplatform.utils.latency import LatencyHistogram, now_ns
+
+log = logging.getLogger("botplatform.bus.profiler")
+
+
+def callback_name(cb: Callable[..., Any]) -> str:
+    name = getattr(cb, "__qualname__", None) or repr(cb)
+    module = getattr(cb, "__module__", None)
+    return f"{module}.{name}" if module else name
+
+
+@dataclass
+class Stall:
+    """Эпизод, когда event loop не отвечал дольше порога."""
+
+    handler: Optional[str]
+    event_type: Optional[str]
+    blocked_ms: float
+    stack: str
+
+
+class SubscriberStats:
+    __slots__ = ("calls", "errors", "slow", "total_ns", "hist")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.errors = 0
+        self.slow = 0
+        self.total_ns = 0
+        self.hist = LatencyHistogram()
+
+    def summary(self) -> Dict[str, float]:
+        h = self.hist
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "slow": self.slow,
+            "total_ms": self.total_ns / 1e6,
+            "mean_us": self.total_ns / self.calls / 1000.0 if self.calls else 0.0,
+            "p50_us": h.percentile(50) / 1000.0,
+            "p99_us": h.percentile(99) / 1000.0,
+            "max_us": (h.max or 0) / 1000.0,
+        }
+
+
+class BusProfiler:
+    """Профилировщик подписчиков ``EventBus``.
+
+    Для каждого обработчика считает вызовы, ошибки, суммарное время и
+    гистограмму длительности (включая время в ``await``), для каждого типа
+    события — время ожидания в очереди. Вызов дольше ``slow_ms`` считается
+    медленным.
+
+    Блокировку loop ловит сторожевой поток: корутина-пульс обновляет метку
+    каждые ``slow_ms / 2``; если метка не менялась дольше ``slow_ms``, значит
+    loop занят синхронным кодом — снимается стек потока loop (там видно
+    блокирующий вызов, например синхронный HTTP-запрос) и пишется в
+    ``stalls`` и в лог вместе с обработчиком, запущенным последним.
+    """
+
+    def __init__(self, slow_ms: float = 50.0, max_stalls: int = 100) -> None:
+        self.slow_ms = slow_ms
+        self._slow_ns = int(slow_ms * 1e6)
+        self.subscribers: Dict[str, SubscriberStats] = {}
+        self.queue_wait: Dict[str, LatencyHistogram] = {}
+        self.stalls: Deque[Stall] = deque(maxlen=max_stalls)
+        self._names: Dict[Any, str] = {}
+        self._current: Optional[Tuple[str, str]] = None
+        self._beat = time.monotonic()
+        self._loop_thread: Optional[int] = None
+        self._beat_task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    # --- вызывается шиной ---
+
+    def on_dequeue(self, event_type: str, wait_ns: int) -> None:
+        hist = self.queue_wait.get(event_type)
+        if hist is None:
+            hist = self.queue_wait[event_type] = LatencyHistogram()
+        hist.record(wait_ns)
+
+    def enter(self, cb: Callable[..., Any], event_type: str) -> Tuple[str, int]:
+        name = self._names.get(cb)
+        if name is None:
+            name = self._names[cb] = callback_name(cb)
+        self._current = (name, event_type)
+        return name, now_ns()
+
+    def exit(self, token: Tuple[str, int], failed: bool = False) -> None:
+        name, t0 = token
+        elapsed = now_ns() - t0
+        stats = self.subscribers.get(name)
+        if stats is None:
+            stats = self.subscribers[name] = SubscriberStats()
+        stats.calls += 1
+        stats.total_ns += elapsed
+        stats.hist.record(elapsed)
+        if failed:
+            stats.errors += 1
+        if elapsed > self._slow_ns:
+            stats.slow += 1
+
+    # --- сторож ---
+
+    async def start(self) -> None:
+        if self._beat_task is not None:
+            return
+        self._loop_thread = threading.get_ident()
+        self._beat = time.monotonic()
+        self._stop.clear()
+        self._beat_task = asyncio.create_task(self._heartbeat())
+        self._watchdog = threading.Thread(target=self._watch, name="bus-watchdog", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._beat_task is not None:
+            self._beat_task.cancel()
+            self._beat_task = None
+        if self._watchdog is not None:
+            self._watchdog.join()
+            self._watchdog = None
+
+    async def _heartbeat(self) -> None:
+        period = self.slow_ms / 2000.0
+        while True:
+            self._beat = time.monotonic()
+            await asyncio.sleep(period)
+
+    def _watch(self) -> None:
+        period = self.slow_ms / 2000.0
+        threshold = self.slow_ms / 1000.0 + period
+        reported = None
+        while not self._stop.wait(period / 2):
+            beat = self._beat
+            blocked = time.monotonic() - beat
+            if blocked < threshold or beat == reported:
+                continue
+            reported = beat
+            frame = sys._current_frames().get(self._loop_thread)
+            stack = "".join(traceback.format_stack(frame)) if frame is not None else ""
+            handler, event_type = self._current or (None, None)
+            stall = Stall(handler, event_type, (blocked - period) * 1000.0, stack)
+            self.stalls.append(stall)
+            log.warning(
+                "Event loop blocked for >%.0f ms, last handler %s (%s):\n%s",
+                stall.blocked_ms, handler, event_type, stack,
+            )
+
+    # --- отчёт ---
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "subscribers": {name: s.summary() for name, s in self.subscribers.items()},
+            "queue_wait_us": {
+                t: {"count": h.count, "p50": h.percentile(50) / 1000.0, "p99": h.percentile(99) / 1000.0,
+                    "max": (h.max or 0) / 1000.0}
+                for t, h in self.queue_wait.items()
+            },
+            "stalls": len(self.stalls),
+        }
+
+    def format_table(self) -> str:
+        rows: List[Tuple[str, Dict[str, float]]] = sorted(
+            ((n, s.summary()) for n, s in self.subscribers.items()), key=lambda r: -r[1]["total_ms"]
+        )
+        columns = ("calls", "errors", "slow", "total_ms", "mean_us", "p50_us", "p99_us", "max_us")
+        width = max([len("subscriber")] + [len(n) for n, _ in rows])
+        lines = ["subscriber".ljust(width) + "".join(c.rjust(11) for c in columns)]
+        for name, s in rows:
+            lines.append(name.ljust(width) + "".join(
+                (f"{s[c]:.0f}" if c in ("calls", "errors", "slow") else f"{s[c]:.1f}").rjust(11) for c in columns
+            ))
+        return "\n".join(lines)
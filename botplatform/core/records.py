@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+from array import array
+from typing import Any, Dict, Iterable, Type, TypeVar
+
+from pydantic import BaseModel
+
+from .models import MarketSnapshot, OrderBookLevel, Trade
+
+M = TypeVar("M", bound=BaseModel)
+
+_SIDE_CODES = {"BUY": 1, "SELL": -1}
+_SIDE_NAMES = {1: "BUY", -1: "SELL"}
+
+
+def _construct(model: Type[M], **fields: Any) -> M:
+    """Сборка модели из заведомо корректных данных без валидации (pydantic v1 и v2)."""
+    construct = getattr(model, "model_construct", None) or model.construct
+    return construct(**fields)
+
+
+def trade_volume(snapshot: Any) -> float:
+    """Суммарный объём сделок снимка; принимает ``MarketSnapshot`` и ``MarketRecord``."""
+    trade_sz = getattr(snapshot, "trade_sz", None)
+    if trade_sz is not None:
+        return sum(trade_sz)
+    return sum(t.size for t in snapshot.trades)
+
+
+class TradeRecord:
+    """Лёгкая запись сделки для горячего пути; зеркало ``Trade``."""
+
+    __slots__ = ("price", "size", "side", "timestamp")
+
+    def __init__(self, price: float, size: float, side: str, timestamp: int) -> None:
+        self.price = price
+        self.size = size
+        self.side = side
+        self.timestamp = timestamp
+
+    @classmethod
+    def from_model(cls, trade: Trade) -> "TradeRecord":
+        return cls(trade.price, trade.size, trade.side, trade.timestamp)
+
+    def to_model(self) -> Trade:
+        return _construct(Trade, price=self.price, size=self.size, side=self.side, timestamp=self.timestamp)
+
+
+class MarketRecord:
+    """Компактный снимок рынка для горячего пути; зеркало ``MarketSnapshot``.
+
+    Скалярные поля совпадают по именам с ``MarketSnapshot``, поэтому код,
+    читающий ``symbol/price/bid/ask/timestamp``, работает с обоими типами.
+    Уровни стакана и сделки хранятся в упакованных массивах ``array('d')``
+    вместо списков отдельных объектов: ``bid_px[i]``/``bid_sz[i]`` — i-й
+    уровень бидов, стороны сделок закодированы как +1 (BUY) / -1 (SELL).
+    """
+
+    __slots__ = (
+        "symbol",
+        "price",
+        "bid",
+        "ask",
+        "bid_px",
+        "bid_sz",
+        "ask_px",
+        "ask_sz",
+        "trade_px",
+        "trade_sz",
+        "trade_side",
+        "trade_ts",
+        "timestamp",
+    )
+
+    def __init__(
+        self,
+        symbol: str,
+        price: float,
+        bid: float,
+        ask: float,
+        timestamp: int,
+        bid_px: array | None = None,
+        bid_sz: array | None = None,
+        ask_px: array | None = None,
+        ask_sz: array | None = None,
+        trade_px: array | None = None,
+        trade_sz: array | None = None,
+        trade_side: array | None = None,
+        trade_ts: array | None = None,
+    ) -> None:
+        self.symbol = symbol
+        self.price = price
+        self.bid = bid
+        self.ask = ask
+        self.timestamp = timestamp
+        self.bid_px = bid_px if bid_px is not None else array("d")
+        self.bid_sz = bid_sz if bid_sz is not None else array("d")
+        self.ask_px = ask_px if ask_px is not None else array("d")
+        self.ask_sz = ask_sz if ask_sz is not None else array("d")
+        self.trade_px = trade_px if trade_px is not None else array("d")
+        self.trade_sz = trade_sz if trade_sz is not None else array("d")
+        self.trade_side = trade_side if trade_side is not None else array("b")
+        self.trade_ts = trade_ts if trade_ts is not None else array("q")
+
+    @property
+    def depth(self) -> int:
+        return max(len(self.bid_px), len(self.ask_px))
+
+    @classmethod
+    def from_model(cls, snap: MarketSnapshot) -> "MarketRecord":
+        return cls(
+            symbol=snap.symbol,
+            price=snap.price,
+            bid=snap.bid,
+            ask=snap.ask,
+            timestamp=snap.timestamp,
+            bid_px=array("d", [lvl.price for lvl in snap.bids]),
+            bid_sz=array("d", [lvl.size for lvl in snap.bids]),
+            ask_px=array("d", [lvl.price for lvl in snap.asks]),
+            ask_sz=array("d", [lvl.size for lvl in snap.asks]),
+            trade_px=array("d", [t.price for t in snap.trades]),
+            trade_sz=array("d", [t.size for t in snap.trades]),
+            trade_side=array("b", [_SIDE_CODES[t.side] for t in snap.trades]),
+            trade_ts=array("q", [t.timestamp for t in snap.trades]),
+        )
+
+    def add_trade(self, price: float, size: float, side: str, timestamp: int) -> None:
+        self.trade_px.append(price)
+        self.trade_sz.append(size)
+        self.trade_side.append(_SIDE_CODES[side])
+        self.trade_ts.append(timestamp)
+
+    def iter_trades(self) -> Iterable[TradeRecord]:
+        for px, sz, side, ts in zip(self.trade_px, self.trade_sz, self.trade_side, self.trade_ts):
+            yield TradeRecord(px, sz, _SIDE_NAMES[side], ts)
+
+    def to_model(self) -> MarketSnapshot:
+        return _construct(
+            MarketSnapshot,
+            symbol=self.symbol,
+            price=self.price,
+            bid=self.bid,
+            ask=self.ask,
+            bids=[_construct(OrderBookLevel, price=p, size=s) for p, s in zip(self.bid_px, self.bid_sz)],
+            asks=[_construct(OrderBookLevel, price=p, size=s) for p, s in zip(self.ask_px, self.ask_sz)],
+            trades=[t.to_model() for t in self.iter_trades()],
+            timestamp=self.timestamp,
+        )
+
+    def dict(self) -> Dict[str, Any]:
+        return {
+            "symbol": self.symbol,
+            "price": self.price,
+            "bid": self.bid,
+            "ask": self.ask,
+            "bids": [{"price": p, "size": s} for p, s in zip(self.bid_px, self.bid_sz)],
+            "asks": [{"price": p, "size": s} for p, s in zip(self.ask_px, self.ask_sz)],
+            "trades": [
+                {"price": t.price, "size": t.size, "side": t.side, "timestamp": t.timestamp}
+                for t in self.iter_trades()
+            ],
+            "timestamp": self.timestamp,
+        }
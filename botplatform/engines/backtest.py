@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import math
+import random
+import time
+from array import array
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List
+
+import numpy as np
+
+from botplatform.core.clock import SimulatedClock
+from botplatform.core.event_bus import EventBus
+from botplatform.core.events import Event
+from botplatform.core.models import PositionSnapshot
+from botplatform.core.records import MarketRecord
+from botplatform.engines.signals_indicators import IndicatorSignalsEngine
+from botplatform.engines.strategy_runtime import StrategyRuntime
+from botplatform.exchanges.mock import MockExchange
+from botplatform.legs.base import LegState
+from botplatform.storage.history import MarketHistory
+
+
+def random_walk_ticks(
+    symbols: List[str],
+    n_ticks: int,
+    seed: int = 0,
+    start_ms: int = 1_700_000_000_000,
+    interval_ms: int = 500,
+    start_price: float = 100.0,
+    volatility: float = 0.001,
+    spread: float = 0.5,
+) -> Iterator[MarketRecord]:
+    """Детерминированный поток тиков: геометрическое случайное блуждание по каждому символу.
+
+    На каждом шаге ``interval_ms`` выдаётся по тику на символ; одинаковый
+    ``seed`` даёт одинаковую последовательность.
+    """
+    rng = random.Random(seed)
+    prices = dict.fromkeys(symbols, start_price)
+    for step in range(n_ticks):
+        ts = start_ms + step * interval_ms
+        for symbol in symbols:
+            move = rng.gauss(0.0, volatility)
+            price = prices[symbol] = prices[symbol] * math.exp(move)
+            half = spread / 2.0
+            yield MarketRecord(
+                symbol=symbol,
+                price=price,
+                bid=price - half,
+                ask=price + half,
+                timestamp=ts,
+                bid_px=array("d", [price - half]),
+                bid_sz=array("d", [1.0]),
+                ask_px=array("d", [price + half]),
+                ask_sz=array("d", [1.0]),
+                trade_px=array("d", [price]),
+                trade_sz=array("d", [0.1]),
+                trade_side=array("b", [1 if move >= 0.0 else -1]),
+                trade_ts=array("q", [ts]),
+            )
+
+
+@dataclass
+class BacktestReport:
+    ticks: int
+    start_ms: int
+    end_ms: int
+    wall_seconds: float
+    positions: Dict[str, PositionSnapshot] = field(default_factory=dict)
+    # Ноги стратегий по имени. Позиции на бирже у хеджа взаимно гасятся,
+    # и результат стратегии виден только по ногам.
+    legs: Dict[str, LegState] = field(default_factory=dict)
+    latencies_ns: array = field(default_factory=lambda: array("q"))
+
+    @property
+    def ticks_per_sec(self) -> float:
+        return self.ticks / self.wall_seconds if self.wall_seconds > 0 else 0.0
+
+    @property
+    def realized_pnl(self) -> float:
+        return sum(p.realized_pnl for p in self.positions.values())
+
+    @property
+    def unrealized_pnl(self) -> float:
+        return sum(p.unrealized_pnl for p in self.positions.values())
+
+    def leg_pnl(self, suffix: str = "") -> float:
+        """Реализованный и нереализованный PnL ног, чьё имя оканчивается на ``suffix``."""
+        return sum(s.realized_pnl + s.unrealized_pnl for name, s in self.legs.items() if name.endswith(suffix))
+
+    def latency_us(self, q: float) -> float:
+        """Перцентиль ``q`` (0..100) времени обработки тика, мкс."""
+        if not self.latencies_ns:
+            return 0.0
+        return float(np.percentile(np.frombuffer(self.latencies_ns, dtype=np.int64), q)) / 1000.0
+
+
+class BacktestEngine:
+    """Прогон исторических тиков через шину во времени событий, без пауз.
+
+    Перед каждым тиком ``SimulatedClock`` переводится на его метку, тик
+    публикуется как ``market.snapshot``, после чего движок ждёт ``join()``
+    шины — включая ордера и исполнения, порождённые этим тиком. Поэтому
+    порядок обработки и результат не зависят от скорости машины.
+    ``price()`` отдаёт последнюю цену символа — её удобно передать
+    ``MockExchange`` как ``price_provider``.
+    """
+
+    def __init__(self, event_bus: EventBus, clock: SimulatedClock, ticks: Iterable[MarketRecord]) -> None:
+        self.event_bus = event_bus
+        self.clock = clock
+        self.ticks = ticks
+        self.prices: Dict[str, float] = {}
+
+    def price(self, symbol: str) -> float:
+        return self.prices[symbol]
+
+    async def run(self) -> BacktestReport:
+        count = 0
+        start_ms = end_ms = self.clock.now_ms()
+        latencies = array("q")
+        started = time.perf_counter()
+        for tick in self.ticks:
+            t0 = time.perf_counter_ns()
+            self.clock.advance_to(tick.timestamp)
+            if not count:
+                start_ms = tick.timestamp
+            self.prices[tick.symbol] = tick.price
+            await self.event_bus.publish(Event(
+                type="market.snapshot",
+                timestamp=tick.timestamp,
+                source="BacktestEngine",
+                data=tick,
+            ))
+            await self.event_bus.join()
+            latencies.append(time.perf_counter_ns() - t0)
+            count += 1
+            end_ms = tick.timestamp
+        return BacktestReport(
+            ticks=count,
+            start_ms=start_ms,
+            end_ms=end_ms,
+            wall_seconds=time.perf_counter() - started,
+            latencies_ns=latencies,
+        )
+
+
+async def run_backtest(
+    symbols: List[str],
+    ticks: Iterable[MarketRecord],
+    history_capacity: int = 4096,
+    strategy_params: Dict[str, Any] | None = None,
+) -> BacktestReport:
+    """Собрать связку шина + ``StrategyRuntime`` + ``MockExchange`` на симулированных часах и прогнать тики."""
+    clock = SimulatedClock()
+    event_bus = EventBus()
+    engine = BacktestEngine(event_bus, clock, ticks)
+    exchange = MockExchange(price_provider=engine.price, clock=clock)
+    history = MarketHistory(capacity=history_capacity)
+    history.subscribe(event_bus)
+    runtime = StrategyRuntime(
+        event_bus=event_bus,
+        exchange=exchange,
+        symbols=symbols,
+        history=history,
+        signals=IndicatorSignalsEngine(),
+        clock=clock,
+        reconcile_interval=0.0,
+        strategy_params=strategy_params,
+        per_symbol=True,
+    )
+
+    await event_bus.start()
+    await runtime.start()
+    try:
+        report = await engine.run()
+    finally:
+        await runtime.stop()
+        await event_bus.stop()
+    # Открытые позиции переоцениваются по последним ценам прогона.
+    exchange.ledger.mark_many(engine.prices)
+    report.positions = await exchange.get_positions(None)
+    for strategy in runtime.strategy_engine.all():
+        prices = [engine.prices[s] for s in strategy.symbols or () if s in engine.prices]
+        for leg in strategy.legs():
+            if len(prices) == 1:
+                leg.mark(prices[0])
+            report.legs[leg.name] = leg.state.copy()
+    return report
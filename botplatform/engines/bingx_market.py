@@ -1,15 +1,18 @@
 
 from __future__ import annotations
-import time
+from array import array
 from typing import Optional, List
 from botplatform.exchanges.bingx.websocket import BingXWebSocket
+from botplatform.core.clock import SYSTEM_CLOCK, Clock
 from botplatform.core.event_bus import EventBus
 from botplatform.core.events import Event
-from botplatform.core.models import MarketSnapshot, OrderBookLevel, Trade
+from botplatform.core.records import MarketRecord
+from botplatform.utils.latency import LATENCY, now_ns
 
 class BingXMarketEngine:
-    def __init__(self, event_bus: EventBus, ws_url: str, symbols: List[str]):
+    def __init__(self, event_bus: EventBus, ws_url: str, symbols: List[str], clock: Clock | None = None):
         self.event_bus = event_bus
+        self.clock = clock or SYSTEM_CLOCK
         self.ws_url = ws_url
         self.symbols = symbols
         self.ws = BingXWebSocket(
@@ -24,17 +27,20 @@ class BingXMarketEngine:
         await self.ws.stop()
 
     async def _on_msg(self, msg: dict):
+        recv_ns = self.ws.last_recv_ns or now_ns()
         snap = self._to_snapshot(msg)
         if snap:
+            LATENCY.since("snapshot.build", recv_ns)
             event = Event(
                 type="market.snapshot",
                 timestamp=snap.timestamp,
                 source="BingXMarketEngine",
-                payload=snap.dict()
+                data=snap,
+                ingest_ns=recv_ns
             )
             await self.event_bus.publish(event)
 
-    def _to_snapshot(self, msg: dict) -> Optional[MarketSnapshot]:
+    def _to_snapshot(self, msg: dict) -> Optional[MarketRecord]:
         data = msg.get("data")
         if not data:
             return None
@@ -47,15 +53,18 @@ class BingXMarketEngine:
         bid = float(data.get("bidPrice", price))
         ask = float(data.get("askPrice", price))
 
-        ts = int(data.get("timestamp", time.time()*1000))
+        ts = int(data.get("timestamp") or self.clock.now_ms())
 
-        return MarketSnapshot(
+        record = MarketRecord(
             symbol=symbol,
             price=price,
             bid=bid,
             ask=ask,
-            bids=[OrderBookLevel(price=bid, size=0)],
-            asks=[OrderBookLevel(price=ask, size=0)],
-            trades=[Trade(price=price, size=0, side="BUY", timestamp=ts)],
-            timestamp=ts
+            timestamp=ts,
+            bid_px=array("d", (bid,)),
+            bid_sz=array("d", (0.0,)),
+            ask_px=array("d", (ask,)),
+            ask_sz=array("d", (0.0,)),
         )
+        record.add_trade(price, 0.0, "BUY", ts)
+        return record
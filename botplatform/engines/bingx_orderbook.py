@@ -0,0 +1,175 @@
+
+from __future__ import annotations
+import asyncio
+import logging
+from typing import Dict, List, Optional
+from botplatform.core.clock import SYSTEM_CLOCK, Clock
+from botplatform.core.event_bus import EventBus
+from botplatform.core.events import Event
+from botplatform.engines.orderbook import OrderBook
+from botplatform.utils.latency import LATENCY, now_ns
+from botplatform.exchanges.bingx.rest import BingXRest
+from botplatform.exchanges.bingx.websocket import BingXWebSocket
+
+log = logging.getLogger("botplatform.bingx.orderbook")
+
+
+class BingXOrderBookEngine:
+    """Локальные L2-стаканы по depth-потоку BingX, публикует ``market.book``.
+
+    Сообщение потока: ``{"data": {"symbol", "action": "all" | "update",
+    "lastUpdateId", "bids": [[price, size], ...], "asks": [...], "T"}}``.
+    ``all`` — полный снимок, ``update`` — инкремент с абсолютными размерами
+    уровней (0 — удалить уровень).
+
+    При разрыве последовательности инкременты буферизуются, стакан
+    восстанавливается снимком из REST (если передан ``rest``) или следующим
+    ``all`` из потока, после чего буфер доигрывается поверх снимка (для
+    REST-снимка без ``lastUpdateId`` — только инкременты новее снимка).
+    Неудачный запрос снимка повторяется с удвоением паузы от
+    ``resync_delay`` до ``max_resync_delay`` секунд, пока стакан не
+    восстановлен. Буфер ограничен ``max_pending`` инкрементами: при
+    переполнении он сбрасывается и запрашивается новый снимок.
+    В событие уходит ``MarketRecord`` с ``publish_depth`` лучшими уровнями.
+    """
+
+    def __init__(self, event_bus: EventBus, ws_url: str, symbols: List[str],
+                 rest: Optional[BingXRest] = None, depth: int = 100, publish_depth: int = 10,
+                 clock: Clock | None = None, max_pending: int = 10_000,
+                 resync_delay: float = 0.5, max_resync_delay: float = 30.0):
+        self.event_bus = event_bus
+        self.clock = clock or SYSTEM_CLOCK
+        self.ws_url = ws_url
+        self.symbols = symbols
+        self.rest = rest
+        self.depth = depth
+        self.publish_depth = publish_depth
+        self.max_pending = max_pending
+        self.resync_delay = resync_delay
+        self.max_resync_delay = max_resync_delay
+        self.books: Dict[str, OrderBook] = {s: OrderBook(s) for s in symbols}
+        self._pending: Dict[str, List[dict]] = {}
+        self._resync_tasks: Dict[str, asyncio.Task] = {}
+        self.gaps = 0
+        self.resyncs = 0
+        self.overflows = 0
+        self.ws = BingXWebSocket(
+            ws_url,
+            {"op": "subscribe", "args": [f"swap/depth:{s}" for s in symbols]}
+        )
+
+    async def start(self):
+        await self.ws.run(self._on_msg)
+
+    async def stop(self):
+        await self.ws.stop()
+        for task in self._resync_tasks.values():
+            task.cancel()
+
+    async def _on_msg(self, msg: dict):
+        data = msg.get("data")
+        if not data:
+            return
+        book = self.books.get(data.get("symbol"))
+        if book is None:
+            return
+
+        if data.get("action") == "all":
+            self._apply_snapshot(book, data)
+        elif book.symbol in self._pending:
+            pending = self._pending[book.symbol]
+            if len(pending) >= self.max_pending:
+                self.overflows += 1
+                log.warning("Order book buffer for %s overflowed, requesting a new snapshot", book.symbol)
+                pending.clear()
+                self._request_resync(book.symbol)
+            pending.append(data)
+            return
+        elif not self._apply_diff(book, data):
+            self.gaps += 1
+            log.warning("Order book gap on %s after update %s", book.symbol, book.last_update_id)
+            self._pending[book.symbol] = [data]
+            self._request_resync(book.symbol)
+            return
+        await self._publish(book)
+
+    def _apply_snapshot(self, book: OrderBook, data: dict) -> None:
+        book.apply_snapshot(data.get("bids", []), data.get("asks", []),
+                            int(data.get("lastUpdateId", 0)), self._ts(data))
+        pending = self._pending.pop(book.symbol, None)
+        task = self._resync_tasks.pop(book.symbol, None)
+        if task is not None:
+            task.cancel()
+        for diff in pending or []:
+            if not self._apply_diff(book, diff):
+                self._pending[book.symbol] = []
+                self._request_resync(book.symbol)
+                return
+
+    def _apply_diff(self, book: OrderBook, data: dict) -> bool:
+        first = data.get("firstUpdateId")
+        return book.apply_diff(data.get("bids", []), data.get("asks", []),
+                               int(data.get("lastUpdateId", 0)), self._ts(data),
+                               first_update_id=int(first) if first is not None else None)
+
+    def _request_resync(self, symbol: str) -> None:
+        if self.rest is None or symbol in self._resync_tasks:
+            return
+        self._resync_tasks[symbol] = asyncio.create_task(self._resync(symbol))
+
+    async def _resync(self, symbol: str):
+        book = self.books[symbol]
+        delay = self.resync_delay
+        while True:
+            try:
+                snap = await self.rest.get_depth(symbol, self.depth)
+                break
+            except Exception as exc:  # noqa: BLE001
+                log.warning("Order book resync for %s failed: %r, retry in %.1f s", symbol, exc, delay)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_resync_delay)
+            if symbol not in self._pending:
+                self._resync_tasks.pop(symbol, None)
+                return
+        self._resync_tasks.pop(symbol, None)
+        if symbol not in self._pending:
+            return  # уже восстановлен снимком из потока
+        self.resyncs += 1
+        pending = self._pending.get(symbol) or []
+        if "lastUpdateId" not in snap and pending:
+            snap = {**snap, "lastUpdateId": self._anchor(symbol, snap, pending)}
+        self._apply_snapshot(book, {"symbol": symbol, **snap})
+        if book.synced and symbol not in self._pending:
+            await self._publish(book)
+
+    def _anchor(self, symbol: str, snap: dict, pending: List[dict]) -> int:
+        """Номер для снимка без ``lastUpdateId``, сшивающий его с потоком.
+
+        Инкременты несут абсолютные размеры уровней, так что инкремент не
+        новее снимка перезаписал бы свежие уровни старыми — такие из буфера
+        отбрасываются. Без времени снимка их не отличить, и стакан берётся
+        из одного снимка, буфер целиком отбрасывается.
+        """
+        snap_ts = snap.get("T") or snap.get("timestamp")
+        newer = [d for d in pending if snap_ts is not None and self._ts(d) > int(snap_ts)]
+        self._pending[symbol] = newer
+        if newer:
+            return int(newer[0].get("firstUpdateId", newer[0].get("lastUpdateId", 1))) - 1
+        return int(pending[-1].get("lastUpdateId", 0))
+
+    async def _publish(self, book: OrderBook):
+        recv_ns = self.ws.last_recv_ns or now_ns()
+        record = book.to_record(self.publish_depth)
+        if record is None:
+            return
+        LATENCY.since("book.build", recv_ns)
+        await self.event_bus.publish(Event(
+            type="market.book",
+            timestamp=record.timestamp,
+            source="BingXOrderBookEngine",
+            data=record,
+            ingest_ns=recv_ns
+        ))
+
+    def _ts(self, data: dict) -> int:
+        return int(data.get("T") or data.get("timestamp") or self.clock.now_ms())
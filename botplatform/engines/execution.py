@@ -1,16 +1,162 @@
 from __future__ import annotations
 
+import asyncio
+import logging
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Any, AsyncIterator, Dict, List, Sequence
 
+from botplatform.core.clock import SYSTEM_CLOCK, Clock
+from botplatform.core.fills import TERMINAL_STATUSES
 from botplatform.core.models import OrderIntent, OrderUpdate
+from botplatform.exchanges.base import OrderRejected
+from botplatform.utils.latency import LATENCY, now_ns
+
+log = logging.getLogger("botplatform.execution")
 
 
 class BaseExecutionEngine(ABC):
     @abstractmethod
-    async def submit(self, intents: List[OrderIntent]) -> None:
+    async def submit(self, intents: List[OrderIntent]) -> Dict[str, OrderUpdate]:
         raise NotImplementedError
 
     @abstractmethod
     async def handle_update(self, update: OrderUpdate) -> None:
         raise NotImplementedError
+
+
+def rejected_update(intent: OrderIntent, reason: Any, clock: Clock = SYSTEM_CLOCK) -> OrderUpdate:
+    return OrderUpdate(
+        order_id="",
+        client_id=intent.client_id,
+        symbol=intent.symbol,
+        side=intent.side,
+        status="REJECTED",
+        filled_size=0.0,
+        remaining_size=intent.size,
+        avg_fill_price=None,
+        timestamp=clock.now_ms(),
+        raw={"error": repr(reason) if isinstance(reason, BaseException) else reason},
+    )
+
+
+def unknown_update(intent: OrderIntent, error: BaseException, clock: Clock = SYSTEM_CLOCK) -> OrderUpdate:
+    """Ордер мог дойти до биржи, но ответа нет: остаётся NEW до сверки по ``client_id``."""
+    return OrderUpdate(
+        order_id="",
+        client_id=intent.client_id,
+        symbol=intent.symbol,
+        side=intent.side,
+        status="NEW",
+        filled_size=0.0,
+        remaining_size=intent.size,
+        avg_fill_price=None,
+        timestamp=clock.now_ms(),
+        raw={"unknown": True, "error": repr(error)},
+    )
+
+
+def is_unknown(update: OrderUpdate) -> bool:
+    return bool(update.raw.get("unknown"))
+
+
+async def resolve_unknown(
+    exchange: Any,
+    update: OrderUpdate,
+    attempts: int = 20,
+    delay: float = 0.5,
+    max_delay: float = 30.0,
+    clock: Clock = SYSTEM_CLOCK,
+) -> AsyncIterator[OrderUpdate]:
+    """Следить за ордером с неизвестным состоянием через ``exchange.get_order``.
+
+    Отдаёт каждое новое состояние ордера (статус или объём исполнения
+    изменились), пока оно не станет финальным. Биржа не знает
+    ``client_id`` — ордер не принят, отдаётся REJECTED. Между запросами
+    (и после ошибок запроса) пауза удваивается от ``delay`` до
+    ``max_delay``; если за ``attempts`` запросов ордер так и не стал
+    финальным, слежение прекращается с ошибкой в логе.
+    """
+    get_order = getattr(exchange, "get_order", None)
+    if get_order is None:
+        log.warning("Exchange cannot look up orders, %s stays unknown", update.client_id)
+        return
+    last = (update.status, update.filled_size)
+    pause = delay
+    for attempt in range(attempts):
+        if attempt:
+            await asyncio.sleep(pause)
+            pause = min(pause * 2, max_delay)
+        try:
+            state = await get_order(update.symbol, update.client_id)
+        except Exception:  # noqa: BLE001
+            log.exception("Order lookup for %s failed (attempt %d/%d)", update.client_id, attempt + 1, attempts)
+            continue
+        if state is None:
+            yield OrderUpdate(
+                order_id="",
+                client_id=update.client_id,
+                symbol=update.symbol,
+                side=update.side,
+                status="REJECTED",
+                filled_size=0.0,
+                remaining_size=update.remaining_size,
+                avg_fill_price=None,
+                timestamp=clock.now_ms(),
+                raw={"error": update.raw.get("error"), "reconciled": "not found"},
+            )
+            return
+        if (state.status, state.filled_size) != last:
+            last = (state.status, state.filled_size)
+            yield state
+        if state.status in TERMINAL_STATUSES:
+            return
+    log.error("Order %s is not final after %d lookups", update.client_id, attempts)
+
+
+async def submit_orders(
+    exchange: Any,
+    intents: Sequence[OrderIntent],
+    max_in_flight: int = 8,
+    batch_size: int = 5,
+    clock: Clock = SYSTEM_CLOCK,
+) -> List[OrderUpdate]:
+    """Отправка интентов на биржу: пачками, если у биржи есть ``place_orders``, иначе поштучно.
+
+    Пачки (или отдельные ордера) уходят параллельно, но не более
+    ``max_in_flight`` одновременно. Результат выровнен с ``intents``:
+    ошибка запроса превращается в REJECTED-обновление для каждого его
+    интента, так что каждому ``client_id`` соответствует ровно один ответ.
+
+    REJECTED ставится только на явный отказ биржи (``OrderRejected``).
+    Таймаут или сетевая ошибка после отправки не означают, что ордер не
+    принят: такие интенты возвращаются как NEW с ``raw["unknown"]``
+    (``is_unknown``), их состояние уточняет ``resolve_unknown``.
+    """
+    if not intents:
+        return []
+    slots = asyncio.Semaphore(max_in_flight)
+    place_orders = getattr(exchange, "place_orders", None)
+
+    if place_orders is not None:
+        chunks = [list(intents[i:i + batch_size]) for i in range(0, len(intents), batch_size)]
+    else:
+        chunks = [[intent] for intent in intents]
+
+    async def send(chunk: List[OrderIntent]) -> List[OrderUpdate]:
+        async with slots:
+            t0 = now_ns()
+            try:
+                if place_orders is not None:
+                    return list(await place_orders(chunk))
+                return [await exchange.place_order(chunk[0])]
+            except OrderRejected as exc:
+                log.warning("Exchange rejected %s: %s", [i.client_id for i in chunk], exc.reason)
+                return [rejected_update(intent, exc.reason, clock) for intent in chunk]
+            except Exception as exc:  # noqa: BLE001
+                log.exception("Order submission failed, state of %s is unknown", [i.client_id for i in chunk])
+                return [unknown_update(intent, exc, clock) for intent in chunk]
+            finally:
+                LATENCY.record("exchange.roundtrip", now_ns() - t0)
+
+    results = await asyncio.gather(*(send(chunk) for chunk in chunks))
+    return [update for chunk_updates in results for update in chunk_updates]
@@ -1,26 +1,51 @@
 
 from __future__ import annotations
-from typing import List
+import asyncio
+from typing import Dict, List, Set
 from botplatform.core.models import OrderIntent, OrderUpdate
+from botplatform.core.clock import SYSTEM_CLOCK, Clock
 from botplatform.core.event_bus import EventBus
 from botplatform.core.events import Event
+from botplatform.engines.execution import is_unknown, resolve_unknown, submit_orders
 from botplatform.exchanges.bingx.adapter import BingXExchangeAdapter
 
 class BingXExecutionEngine:
-    def __init__(self, event_bus: EventBus, exchange: BingXExchangeAdapter):
+    """Исполнение через BingX: интенты группируются в batchOrders по ``batch_size``,
+    пачки отправляются параллельно, не более ``max_in_flight`` одновременно."""
+
+    def __init__(self, event_bus: EventBus, exchange: BingXExchangeAdapter,
+                 batch_size: int = 5, max_in_flight: int = 4, clock: Clock | None = None):
         self.event_bus = event_bus
         self.exchange = exchange
+        self.batch_size = batch_size
+        self.max_in_flight = max_in_flight
+        self.clock = clock or SYSTEM_CLOCK
+        self._reconciling: Set[asyncio.Task] = set()
 
-    async def submit(self, intents: List[OrderIntent]):
-        for intent in intents:
-            update = await self.exchange.place_order(intent)
+    async def submit(self, intents: List[OrderIntent]) -> Dict[str, OrderUpdate]:
+        updates = await submit_orders(self.exchange, intents,
+                                      max_in_flight=self.max_in_flight, batch_size=self.batch_size,
+                                      clock=self.clock)
+        for update in updates:
             await self._publish(update)
+            if is_unknown(update):
+                # Ответа нет — ордер мог быть принят; сверяем по clientOrderID в фоне.
+                task = asyncio.create_task(self._reconcile(update))
+                self._reconciling.add(task)
+                task.add_done_callback(self._reconciling.discard)
+        return {update.client_id: update for update in updates}
+
+    async def _reconcile(self, update: OrderUpdate):
+        async for state in resolve_unknown(self.exchange, update, clock=self.clock):
+            await self._publish(state)
 
     async def _publish(self, update: OrderUpdate):
+        # Единственное место, где исполнения попадают в позиции адаптера.
+        self.exchange.apply_update(update)
         event = Event(
             type="order.update",
             timestamp=update.timestamp,
             source="BingXExecutionEngine",
-            payload=update.dict()
+            data=update
         )
         await self.event_bus.publish(event)
@@ -1,23 +1,43 @@
 from __future__ import annotations
 
-from typing import List
+import asyncio
+from typing import Dict, List, Set
 
+from botplatform.core.clock import SYSTEM_CLOCK, Clock
 from botplatform.core.event_bus import EventBus
 from botplatform.core.events import Event
 from botplatform.core.models import OrderIntent, OrderUpdate
-from botplatform.engines.execution import BaseExecutionEngine
+from botplatform.engines.execution import BaseExecutionEngine, is_unknown, resolve_unknown, submit_orders
 from botplatform.exchanges.mock import MockExchange
 
 
 class LocalExecutionEngine(BaseExecutionEngine):
-    def __init__(self, event_bus: EventBus, exchange: MockExchange) -> None:
+    def __init__(
+        self,
+        event_bus: EventBus,
+        exchange: MockExchange,
+        max_in_flight: int = 8,
+        clock: Clock | None = None,
+    ) -> None:
         self.event_bus = event_bus
         self.exchange = exchange
+        self.max_in_flight = max_in_flight
+        self.clock = clock or SYSTEM_CLOCK
+        self._reconciling: Set[asyncio.Task] = set()
 
-    async def submit(self, intents: List[OrderIntent]) -> None:
-        for intent in intents:
-            update = await self.exchange.place_order(intent)
+    async def submit(self, intents: List[OrderIntent]) -> Dict[str, OrderUpdate]:
+        updates = await submit_orders(self.exchange, intents, max_in_flight=self.max_in_flight, clock=self.clock)
+        for update in updates:
             await self._publish(update)
+            if is_unknown(update):
+                task = asyncio.create_task(self._reconcile(update))
+                self._reconciling.add(task)
+                task.add_done_callback(self._reconciling.discard)
+        return {update.client_id: update for update in updates}
+
+    async def _reconcile(self, update: OrderUpdate) -> None:
+        async for state in resolve_unknown(self.exchange, update, clock=self.clock):
+            await self._publish(state)
 
     async def handle_update(self, update: OrderUpdate) -> None:
         await self._publish(update)
@@ -27,6 +47,6 @@ class LocalExecutionEngine(BaseExecutionEngine):
             type="order.update",
             timestamp=update.timestamp,
             source="LocalExecutionEngine",
-            payload=update.dict(),
+            data=update,
         )
         await self.event_bus.publish(event)
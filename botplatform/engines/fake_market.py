@@ -3,12 +3,13 @@ from __future__ import annotations
 import asyncio
 import math
 import random
-import time
+from array import array
 from typing import List
 
+from botplatform.core.clock import SYSTEM_CLOCK, Clock
 from botplatform.core.event_bus import EventBus
 from botplatform.core.events import Event
-from botplatform.core.models import MarketSnapshot, OrderBookLevel, Trade
+from botplatform.core.records import MarketRecord
 
 
 class FakeMarketEngine:
@@ -18,11 +19,13 @@ class FakeMarketEngine:
         symbols: List[str],
         interval_ms: int = 500,
         mode: str = "sine",
+        clock: Clock | None = None,
     ) -> None:
         self.event_bus = event_bus
         self.symbols = symbols
         self.interval_ms = interval_ms
         self.mode = mode
+        self.clock = clock or SYSTEM_CLOCK
         self._running: bool = False
         self._task: asyncio.Task | None = None
         self._t: float = 0.0
@@ -47,21 +50,23 @@ class FakeMarketEngine:
             await asyncio.sleep(self.interval_ms / 1000.0)
             for symbol in self.symbols:
                 price = self._generate_price()
-                ts = int(time.time() * 1000)
-                snapshot = MarketSnapshot(
+                ts = self.clock.now_ms()
+                snapshot = MarketRecord(
                     symbol=symbol,
                     price=price,
                     bid=price - 0.5,
                     ask=price + 0.5,
-                    bids=[OrderBookLevel(price=price - 0.5, size=1.0)],
-                    asks=[OrderBookLevel(price=price + 0.5, size=1.0)],
-                    trades=[Trade(price=price, size=0.1, side="BUY", timestamp=ts)],
                     timestamp=ts,
+                    bid_px=array("d", (price - 0.5,)),
+                    bid_sz=array("d", (1.0,)),
+                    ask_px=array("d", (price + 0.5,)),
+                    ask_sz=array("d", (1.0,)),
                 )
+                snapshot.add_trade(price, 0.1, "BUY", ts)
                 event = Event(
                     type="market.snapshot",
                     timestamp=ts,
                     source="FakeMarketEngine",
-                    payload=snapshot.dict(),
+                    data=snapshot,
                 )
                 await self.event_bus.publish(event)
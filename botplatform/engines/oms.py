@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import itertools
+import logging
+import os
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, Iterator, List, Optional, Tuple
+
+from botplatform.core.clock import SYSTEM_CLOCK, Clock
+from botplatform.core.event_bus import EventBus
+from botplatform.core.events import Event
+from botplatform.core.fills import TERMINAL_STATUSES
+from botplatform.core.models import OrderIntent, OrderUpdate
+
+log = logging.getLogger("botplatform.oms")
+
+# Допустимые переходы; повтор того же нефинального статуса — тоже переход
+# (новое частичное исполнение приходит как PARTIAL -> PARTIAL).
+TRANSITIONS: Dict[str, frozenset] = {
+    "NEW": frozenset({"NEW", "PARTIAL", "FILLED", "CANCELLED", "REJECTED"}),
+    "PARTIAL": frozenset({"PARTIAL", "FILLED", "CANCELLED"}),
+    "FILLED": frozenset(),
+    "CANCELLED": frozenset(),
+    "REJECTED": frozenset(),
+}
+
+
+# Общий для процесса счётчик: генераторы разных рантаймов (и генераторы,
+# созданные в одну миллисекунду или на SimulatedClock) не выдают одинаковых ids.
+_SEQ = itertools.count(1)
+
+
+class ClientIdGenerator:
+    """Уникальные ``client_id`` вида ``bp-<ms старта>-<pid>-<seq>`` (hex).
+
+    Внутри процесса ids различает общий счётчик ``_SEQ``, между процессами
+    (шарды супервизора) — pid, между перезапусками — время старта. Только
+    латиница, цифры и дефис, не длиннее ~30 символов, что подходит
+    под ограничения ``clientOrderID`` биржи.
+    """
+
+    def __init__(self, prefix: str = "bp", clock: Clock | None = None) -> None:
+        clock = clock or SYSTEM_CLOCK
+        self._base = f"{prefix}-{clock.now_ms():x}-{os.getpid():x}-"
+
+    def next(self) -> str:
+        return f"{self._base}{next(_SEQ):x}"
+
+
+@dataclass
+class OrderRecord:
+    client_id: str
+    symbol: str
+    side: str
+    type: str
+    size: float
+    price: Optional[float]
+    strategy: Optional[str]
+    status: str = "NEW"
+    order_id: str = ""
+    filled_size: float = 0.0
+    avg_fill_price: Optional[float] = None
+    created_ms: int = 0
+    updated_ms: int = 0
+
+    @property
+    def is_open(self) -> bool:
+        return self.status not in TERMINAL_STATUSES
+
+
+class OrderManager:
+    """Реестр ордеров: выдача ``client_id``, автомат статусов и индексы.
+
+    ``track(intent)`` заводит ордер в статусе NEW до отправки на биржу;
+    дальше статус меняют ``OrderUpdate`` из шины (``subscribe``) по
+    ``TRANSITIONS``. Недопустимый переход и устаревшее обновление (объём
+    исполнения меньше уже известного) пропускаются с предупреждением.
+    Обновление, для которого нет ``client_id``, ищется по ``order_id``
+    биржи; ордер, о котором OMS не знал (например, выставленный вручную),
+    заводится по первому обновлению.
+
+    Индексы по ``client_id``, ``order_id``, символу и стратегии
+    (``intent.context["strategy"]``) дают поиск за O(1). Ордер в финальном
+    статусе хранится ``retention_ms`` по часам ``clock`` и затем удаляется
+    из всех индексов, так что память ограничена числом открытых ордеров
+    и ордеров, закрытых за последние ``retention_ms``.
+    """
+
+    def __init__(self, clock: Clock | None = None, retention_ms: int = 3_600_000, prefix: str = "bp") -> None:
+        self.clock = clock or SYSTEM_CLOCK
+        self.retention_ms = retention_ms
+        self.ids = ClientIdGenerator(prefix, self.clock)
+        self._orders: Dict[str, OrderRecord] = {}
+        self._by_order_id: Dict[str, OrderRecord] = {}
+        # Вложенные dict как упорядоченные множества client_id.
+        self._by_symbol: Dict[str, Dict[str, OrderRecord]] = {}
+        self._by_strategy: Dict[str, Dict[str, OrderRecord]] = {}
+        self._closed: Deque[Tuple[int, str]] = deque()
+
+    def subscribe(self, event_bus: EventBus) -> None:
+        event_bus.subscribe("order.update", self._on_order_event)
+
+    async def _on_order_event(self, event: Event) -> None:
+        self.on_update(event.as_model(OrderUpdate))
+
+    def next_client_id(self) -> str:
+        return self.ids.next()
+
+    # --- запись ---
+
+    def track(self, intent: OrderIntent) -> OrderRecord:
+        now = self.clock.now_ms()
+        record = OrderRecord(
+            client_id=intent.client_id,
+            symbol=intent.symbol,
+            side=intent.side,
+            type=intent.type,
+            size=intent.size,
+            price=intent.price,
+            strategy=(intent.context or {}).get("strategy"),
+            created_ms=now,
+            updated_ms=now,
+        )
+        if intent.client_id in self._orders:
+            log.warning("Duplicate client_id %s, previous order is replaced", intent.client_id)
+            self._remove(intent.client_id)
+        self._index(record)
+        return record
+
+    def on_update(self, update: OrderUpdate) -> Optional[OrderRecord]:
+        self.evict()
+        record = self._orders.get(update.client_id) if update.client_id else None
+        if record is None and update.order_id:
+            record = self._by_order_id.get(update.order_id)
+        if record is None:
+            if not update.client_id:
+                log.debug("Update for unknown order %s ignored", update.order_id)
+                return None
+            record = self._adopt(update)
+
+        if update.status not in TRANSITIONS[record.status]:
+            if update.status != record.status:
+                log.warning(
+                    "Order %s: invalid transition %s -> %s ignored", record.client_id, record.status, update.status
+                )
+            return record
+        if update.filled_size < record.filled_size:
+            log.warning("Order %s: stale update (filled %s < %s) ignored",
+                        record.client_id, update.filled_size, record.filled_size)
+            return record
+
+        if update.order_id and update.order_id != record.order_id:
+            if record.order_id:
+                self._by_order_id.pop(record.order_id, None)
+            record.order_id = update.order_id
+            self._by_order_id[update.order_id] = record
+        record.status = update.status
+        record.filled_size = update.filled_size
+        if update.avg_fill_price is not None:
+            record.avg_fill_price = update.avg_fill_price
+        record.updated_ms = self.clock.now_ms()
+        if update.status in TERMINAL_STATUSES:
+            self._closed.append((record.updated_ms, record.client_id))
+        return record
+
+    def evict(self, now_ms: Optional[int] = None) -> int:
+        """Удалить ордера, закрытые раньше чем ``retention_ms`` назад."""
+        now = self.clock.now_ms() if now_ms is None else now_ms
+        closed = self._closed
+        evicted = 0
+        while closed and now - closed[0][0] >= self.retention_ms:
+            closed_ms, client_id = closed.popleft()
+            record = self._orders.get(client_id)
+            # client_id мог быть переиспользован track() уже после закрытия.
+            if record is not None and not record.is_open and record.updated_ms == closed_ms:
+                self._remove(client_id)
+                evicted += 1
+        return evicted
+
+    def _adopt(self, update: OrderUpdate) -> OrderRecord:
+        now = self.clock.now_ms()
+        record = OrderRecord(
+            client_id=update.client_id,
+            symbol=update.symbol,
+            side=update.side or "",
+            type="",
+            size=update.filled_size + update.remaining_size,
+            price=None,
+            strategy=None,
+            created_ms=now,
+            updated_ms=now,
+        )
+        self._index(record)
+        return record
+
+    def _index(self, record: OrderRecord) -> None:
+        self._orders[record.client_id] = record
+        if record.order_id:
+            self._by_order_id[record.order_id] = record
+        self._by_symbol.setdefault(record.symbol, {})[record.client_id] = record
+        if record.strategy is not None:
+            self._by_strategy.setdefault(record.strategy, {})[record.client_id] = record
+
+    def _remove(self, client_id: str) -> None:
+        record = self._orders.pop(client_id)
+        if record.order_id and self._by_order_id.get(record.order_id) is record:
+            del self._by_order_id[record.order_id]
+        for index, key in ((self._by_symbol, record.symbol), (self._by_strategy, record.strategy)):
+            bucket = index.get(key)
+            if bucket is not None:
+                bucket.pop(client_id, None)
+                if not bucket:
+                    del index[key]
+
+    # --- чтение ---
+
+    def __len__(self) -> int:
+        return len(self._orders)
+
+    def __iter__(self) -> Iterator[OrderRecord]:
+        return iter(self._orders.values())
+
+    def get(self, client_id: str) -> Optional[OrderRecord]:
+        return self._orders.get(client_id)
+
+    def by_order_id(self, order_id: str) -> Optional[OrderRecord]:
+        return self._by_order_id.get(order_id)
+
+    def for_symbol(self, symbol: str) -> List[OrderRecord]:
+        return list(self._by_symbol.get(symbol, {}).values())
+
+    def for_strategy(self, strategy: str) -> List[OrderRecord]:
+        return list(self._by_strategy.get(strategy, {}).values())
+
+    def open_orders(self, symbol: Optional[str] = None, strategy: Optional[str] = None) -> List[OrderRecord]:
+        if symbol is not None:
+            orders = self._by_symbol.get(symbol, {}).values()
+        elif strategy is not None:
+            orders = self._by_strategy.get(strategy, {}).values()
+        else:
+            orders = self._orders.values()
+        return [
+            o for o in orders
+            if o.is_open and (strategy is None or o.strategy == strategy)
+        ]
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+from array import array
+from typing import Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+
+from botplatform.core.records import MarketRecord
+
+Levels = Iterable[Sequence]  # [[price, size], ...], числа или строки
+
+
+class BookSide:
+    """Одна сторона стакана в отсортированных массивах, обновляемых на месте.
+
+    Цены хранятся как ключи по возрастанию; для бидов ключ — цена со знаком
+    минус, поэтому лучший уровень у обеих сторон всегда в позиции 0.
+    Размер 0 удаляет уровень.
+    """
+
+    def __init__(self, is_bid: bool, capacity: int = 256) -> None:
+        self.is_bid = is_bid
+        self._keys = np.empty(capacity, dtype=np.float64)
+        self._sizes = np.empty(capacity, dtype=np.float64)
+        self.n: int = 0
+
+    def __len__(self) -> int:
+        return self.n
+
+    def clear(self) -> None:
+        self.n = 0
+
+    def update(self, price: float, size: float) -> None:
+        key = -price if self.is_bid else price
+        n = self.n
+        keys, sizes = self._keys, self._sizes
+        i = int(np.searchsorted(keys[:n], key))
+        if i < n and keys[i] == key:
+            if size > 0.0:
+                sizes[i] = size
+            else:
+                keys[i:n - 1] = keys[i + 1:n]
+                sizes[i:n - 1] = sizes[i + 1:n]
+                self.n = n - 1
+            return
+        if size <= 0.0:
+            return
+        if n == len(keys):
+            self._grow()
+            keys, sizes = self._keys, self._sizes
+        keys[i + 1:n + 1] = keys[i:n]
+        sizes[i + 1:n + 1] = sizes[i:n]
+        keys[i] = key
+        sizes[i] = size
+        self.n = n + 1
+
+    def _grow(self) -> None:
+        cap = len(self._keys) * 2
+        keys = np.empty(cap, dtype=np.float64)
+        sizes = np.empty(cap, dtype=np.float64)
+        keys[:self.n] = self._keys[:self.n]
+        sizes[:self.n] = self._sizes[:self.n]
+        self._keys, self._sizes = keys, sizes
+
+    def best(self) -> Optional[float]:
+        if not self.n:
+            return None
+        key = float(self._keys[0])
+        return -key if self.is_bid else key
+
+    def top(self, depth: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Копии ``depth`` лучших уровней: (цены, размеры)."""
+        k = min(depth, self.n)
+        prices = -self._keys[:k] if self.is_bid else self._keys[:k].copy()
+        return prices, self._sizes[:k].copy()
+
+
+class OrderBook:
+    """Локальный L2-стакан символа с контролем последовательности обновлений.
+
+    ``apply_snapshot`` полностью заменяет стакан. ``apply_diff`` применяет
+    инкремент с номером ``update_id`` (и, если биржа его присылает, номером
+    первого обновления в пачке ``first_update_id``): устаревшие инкременты
+    пропускаются, а разрыв последовательности возвращает ``False`` и
+    помечает стакан несинхронизированным до следующего снимка.
+    """
+
+    def __init__(self, symbol: str) -> None:
+        self.symbol = symbol
+        self.bids = BookSide(is_bid=True)
+        self.asks = BookSide(is_bid=False)
+        self.last_update_id: int = -1
+        self.synced: bool = False
+        self.timestamp: int = 0
+
+    def apply_snapshot(self, bids: Levels, asks: Levels, update_id: int, timestamp: int = 0) -> None:
+        self.bids.clear()
+        self.asks.clear()
+        for price, size in bids:
+            self.bids.update(float(price), float(size))
+        for price, size in asks:
+            self.asks.update(float(price), float(size))
+        self.last_update_id = update_id
+        self.timestamp = timestamp
+        self.synced = True
+
+    def apply_diff(
+        self,
+        bids: Levels,
+        asks: Levels,
+        update_id: int,
+        timestamp: int = 0,
+        first_update_id: Optional[int] = None,
+    ) -> bool:
+        if not self.synced:
+            return False
+        if update_id <= self.last_update_id:
+            return True
+        first = update_id if first_update_id is None else first_update_id
+        if first > self.last_update_id + 1:
+            self.synced = False
+            return False
+        for price, size in bids:
+            self.bids.update(float(price), float(size))
+        for price, size in asks:
+            self.asks.update(float(price), float(size))
+        self.last_update_id = update_id
+        self.timestamp = timestamp
+        return True
+
+    def to_record(self, depth: int) -> Optional[MarketRecord]:
+        """Снимок ``depth`` лучших уровней; цена — середина спреда."""
+        bid = self.bids.best()
+        ask = self.asks.best()
+        if bid is None or ask is None:
+            return None
+        bid_px, bid_sz = self.bids.top(depth)
+        ask_px, ask_sz = self.asks.top(depth)
+        return MarketRecord(
+            symbol=self.symbol,
+            price=(bid + ask) / 2.0,
+            bid=bid,
+            ask=ask,
+            timestamp=self.timestamp,
+            bid_px=array("d", bid_px.tobytes()),
+            bid_sz=array("d", bid_sz.tobytes()),
+            ask_px=array("d", ask_px.tobytes()),
+            ask_sz=array("d", ask_sz.tobytes()),
+        )
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Dict, Tuple
+
+from botplatform.core.event_bus import EventBus
+from botplatform.core.events import Event
+from botplatform.core.fills import TERMINAL_STATUSES, fill_delta
+from botplatform.core.ledger import PositionLedger
+from botplatform.core.models import MarketSnapshot, OrderUpdate, PositionSnapshot
+
+log = logging.getLogger("botplatform.positions")
+
+
+class PositionTracker:
+    """Кэш позиций в памяти, обновляемый по исполнениям из ``order.update``.
+
+    ``get()`` отдаёт позицию за O(1) без обращения к бирже. Обновления
+    накопительные: из пары (``filled_size``, ``avg_fill_price``) выводится
+    приращение, поэтому частичные исполнения учитываются один раз.
+    Позиции ведёт ``PositionLedger``; цены из ``market.snapshot`` переоценивают
+    нереализованный PnL.
+
+    Раз в ``reconcile_interval`` секунд кэш целиком сверяется с биржей одним
+    запросом ``get_positions()``; расхождения (например, ручные сделки)
+    исправляются при следующей сверке. Снимок биржи уже содержит исполнения,
+    обновления о которых могли ещё стоять в очереди шины. Если биржа умеет
+    ``order_fills()`` (client_id -> учтённые в снимке ``filled_size`` и цена),
+    эти объёмы становятся водяными знаками ордеров: позже пришедшее
+    обновление меняет позицию только на исполнение сверх них, а исполнения,
+    пришедшие во время запроса и не вошедшие в снимок, доначисляются поверх
+    него. Без ``order_fills`` снимок считается содержащим всё, что пришло
+    до его получения.
+    """
+
+    def __init__(self, exchange: Any, reconcile_interval: float = 30.0) -> None:
+        self.exchange = exchange
+        self.reconcile_interval = reconcile_interval
+        self.ledger = PositionLedger()
+        # client_id -> (filled_size, avg_fill_price), учтённые в ledger по открытым ордерам.
+        self._fills: Dict[str, Tuple[float, float]] = {}
+        # То же, но вошедшее в снимок последней сверки (из ``order_fills`` биржи).
+        self._covered: Dict[str, Tuple[float, float]] = {}
+        # Обновления, пришедшие во время запроса снимка; None — сверка не идёт.
+        self._awaiting: Dict[str, OrderUpdate] | None = None
+        self._task: asyncio.Task | None = None
+
+    def subscribe(self, event_bus: EventBus) -> None:
+        event_bus.subscribe("order.update", self._on_order_event)
+        event_bus.subscribe("market.snapshot", self._on_market_event)
+
+    def get(self, symbol: str) -> PositionSnapshot:
+        return self.ledger.snapshot(symbol)
+
+    def all(self) -> Dict[str, PositionSnapshot]:
+        return self.ledger.snapshots()
+
+    async def _on_market_event(self, event: Event) -> None:
+        snapshot = event.data if event.data is not None else event.as_model(MarketSnapshot)
+        self.ledger.mark(snapshot.symbol, snapshot.price)
+
+    async def _on_order_event(self, event: Event) -> None:
+        self.apply_update(event.as_model(OrderUpdate))
+
+    def apply_update(self, update: OrderUpdate) -> None:
+        key = update.client_id
+        prev_filled, prev_avg = max(self._fills.get(key, (0.0, 0.0)), self._covered.get(key, (0.0, 0.0)))
+        size, price = fill_delta(update, prev_filled, prev_avg)
+        if size > 0.0 and update.side is not None:
+            self.ledger.apply_fill(update.symbol, update.side, size, price)
+            if self._awaiting is not None:
+                self._awaiting[key] = update
+        if update.status in TERMINAL_STATUSES:
+            self._fills.pop(key, None)
+        elif size > 0.0:
+            self._fills[key] = (update.filled_size, update.avg_fill_price or 0.0)
+
+    async def reconcile(self) -> None:
+        self._awaiting = {}
+        try:
+            positions = await self.exchange.get_positions(None)
+        finally:
+            awaiting, self._awaiting = self._awaiting, None
+        order_fills = getattr(self.exchange, "order_fills", None)
+        covered = order_fills() if order_fills is not None else None
+        self.ledger.replace(positions.values())
+        self._covered = covered or {}
+        if covered is None:
+            return
+        for key, update in awaiting.items():
+            size, price = fill_delta(update, *covered.get(key, (0.0, 0.0)))
+            if size > 0.0:
+                self.ledger.apply_fill(update.symbol, update.side, size, price)
+
+    async def start(self) -> None:
+        await self.reconcile()
+        if self.reconcile_interval > 0 and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    async def _loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.reconcile_interval)
+            try:
+                await self.reconcile()
+            except Exception as exc:  # noqa: BLE001
+                log.warning("Position reconcile failed: %r", exc)
@@ -8,4 +8,5 @@ from botplatform.core.models import MarketSnapshot, SignalSnapshot
 class BaseSignalsEngine(ABC):
     @abstractmethod
     async def on_market_snapshot(self, snapshot: MarketSnapshot) -> SignalSnapshot:
+        """Принимает ``MarketSnapshot`` или ``MarketRecord`` (одинаковые скалярные поля)."""
         raise NotImplementedError
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from botplatform.core.models import MarketSnapshot, SignalSnapshot
+from botplatform.core.records import trade_volume
+from botplatform.engines.signals import BaseSignalsEngine
+
+INDICATORS = ("ema", "vwap", "volatility", "zscore", "atr")
+
+
+class IndicatorSignalsEngine(BaseSignalsEngine):
+    """Инкрементальные индикаторы по всем символам: EMA, VWAP, волатильность, z-score, ATR.
+
+    Состояние хранится колонками NumPy, строка на символ. Каждый тик обновляет
+    индикаторы за O(1): скользящие окна ведутся через кольцевые буферы
+    со скользящими средним и суммой квадратов отклонений (Уэлфорд), без
+    пересчёта по всему окну. Чтобы ошибка округления не копилась, на каждом
+    обороте кольца среднее и сумма пересчитываются по окну точно (O(1)
+    в среднем). Значения одного индикатора по всем символам доступны разом
+    через ``values()``.
+
+    - ``volatility`` — выборочное стандартное отклонение лог-доходностей за ``window`` тиков;
+    - ``zscore`` — отклонение цены от скользящего среднего за ``window`` тиков в сигмах;
+    - ``atr`` — ATR по Уайлдеру, где «бар» — тик с high/low = max/min(price, ask/bid).
+    """
+
+    def __init__(
+        self,
+        ema_period: int = 20,
+        window: int = 50,
+        atr_period: int = 14,
+        capacity: int = 64,
+    ) -> None:
+        if window < 2:
+            raise ValueError("window must be >= 2")
+        self.ema_alpha = 2.0 / (ema_period + 1)
+        self.window = window
+        self.atr_period = atr_period
+        self._index: Dict[str, int] = {}
+        self._symbols: List[str] = []
+        self._capacity = capacity
+        f8, i8, w = np.float64, np.int64, window
+        self._count = np.zeros(capacity, dtype=i8)
+        self._last = np.zeros(capacity, dtype=f8)
+        self._cum_pv = np.zeros(capacity, dtype=f8)
+        self._cum_v = np.zeros(capacity, dtype=f8)
+        # Кольцо лог-доходностей (волатильность) и кольцо цен (z-score).
+        self._ret = np.zeros((capacity, w), dtype=f8)
+        self._ret_pos = np.zeros(capacity, dtype=i8)
+        self._ret_n = np.zeros(capacity, dtype=i8)
+        self._ret_mean = np.zeros(capacity, dtype=f8)
+        self._ret_m2 = np.zeros(capacity, dtype=f8)
+        self._px = np.zeros((capacity, w), dtype=f8)
+        self._px_pos = np.zeros(capacity, dtype=i8)
+        self._px_n = np.zeros(capacity, dtype=i8)
+        self._px_mean = np.zeros(capacity, dtype=f8)
+        self._px_m2 = np.zeros(capacity, dtype=f8)
+        self._out: Dict[str, np.ndarray] = {name: np.zeros(capacity, dtype=f8) for name in INDICATORS}
+
+    def _grow(self) -> None:
+        old, new = self._capacity, self._capacity * 2
+
+        def resized(arr: np.ndarray) -> np.ndarray:
+            out = np.zeros((new,) + arr.shape[1:], dtype=arr.dtype)
+            out[:old] = arr
+            return out
+
+        for name, value in list(vars(self).items()):
+            if isinstance(value, np.ndarray):
+                setattr(self, name, resized(value))
+        self._out = {name: resized(arr) for name, arr in self._out.items()}
+        self._capacity = new
+
+    def _slot(self, symbol: str) -> int:
+        idx = self._index.get(symbol)
+        if idx is None:
+            idx = len(self._symbols)
+            if idx >= self._capacity:
+                self._grow()
+            self._index[symbol] = idx
+            self._symbols.append(symbol)
+        return idx
+
+    @property
+    def symbols(self) -> List[str]:
+        return list(self._symbols)
+
+    def values(self, indicator: str) -> np.ndarray:
+        """Текущие значения индикатора по всем символам в порядке ``symbols`` (view)."""
+        return self._out[indicator][: len(self._symbols)]
+
+    def signal(self, symbol: str, timestamp: int) -> SignalSnapshot:
+        idx = self._index[symbol]
+        return SignalSnapshot(
+            symbol=symbol,
+            data={name: float(self._out[name][idx]) for name in INDICATORS},
+            timestamp=timestamp,
+        )
+
+    async def on_market_snapshot(self, snapshot: MarketSnapshot) -> SignalSnapshot:
+        idx = np.array([self._slot(snapshot.symbol)])
+        self._update(
+            idx,
+            np.array([snapshot.price]),
+            np.array([snapshot.bid]),
+            np.array([snapshot.ask]),
+            np.array([trade_volume(snapshot)]),
+        )
+        return self.signal(snapshot.symbol, snapshot.timestamp)
+
+    def update_batch(self, snapshots: Sequence[MarketSnapshot]) -> None:
+        """Векторное обновление по пачке тиков; повторы символа разбиваются на раунды по порядку."""
+        start = 0
+        while start < len(snapshots):
+            seen: set = set()
+            end = start
+            while end < len(snapshots) and snapshots[end].symbol not in seen:
+                seen.add(snapshots[end].symbol)
+                end += 1
+            chunk = snapshots[start:end]
+            self._update(
+                np.array([self._slot(s.symbol) for s in chunk]),
+                np.array([s.price for s in chunk], dtype=np.float64),
+                np.array([s.bid for s in chunk], dtype=np.float64),
+                np.array([s.ask for s in chunk], dtype=np.float64),
+                np.array([trade_volume(s) for s in chunk], dtype=np.float64),
+            )
+            start = end
+
+    @staticmethod
+    def _push(
+        ring: np.ndarray,
+        pos: np.ndarray,
+        n: np.ndarray,
+        means: np.ndarray,
+        m2s: np.ndarray,
+        idx: np.ndarray,
+        values: np.ndarray,
+    ) -> None:
+        w = ring.shape[1]
+        p = pos[idx]
+        count = n[idx]
+        full = count >= w
+        mean = means[idx]
+        # Окно полно — значение заменяет самое старое, иначе просто добавляется.
+        old = np.where(full, ring[idx, p], mean)
+        new_n = np.where(full, w, count + 1).astype(np.float64)
+        new_mean = mean + (values - old) / new_n
+        m2s[idx] += np.where(
+            full,
+            (values - old) * (values - new_mean + old - mean),
+            (values - mean) * (values - new_mean),
+        )
+        means[idx] = new_mean
+        ring[idx, p] = values
+        pos[idx] = (p + 1) % w
+        n[idx] = np.minimum(count + 1, w)
+
+        wrapped = idx[(pos[idx] == 0) & (n[idx] == w)]
+        if wrapped.size:
+            rows = ring[wrapped]
+            exact = rows.mean(axis=1)
+            means[wrapped] = exact
+            m2s[wrapped] = ((rows - exact[:, None]) ** 2).sum(axis=1)
+
+    @staticmethod
+    def _std(m2s: np.ndarray, n: np.ndarray) -> np.ndarray:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            var = m2s / (n.astype(np.float64) - 1.0)
+        return np.where(n > 1, np.sqrt(np.maximum(var, 0.0)), 0.0)
+
+    def _update(
+        self,
+        idx: np.ndarray,
+        price: np.ndarray,
+        bid: np.ndarray,
+        ask: np.ndarray,
+        volume: np.ndarray,
+    ) -> None:
+        out = self._out
+        first = self._count[idx] == 0
+        prev = np.where(first, price, self._last[idx])
+
+        ema = out["ema"][idx]
+        out["ema"][idx] = np.where(first, price, ema + self.ema_alpha * (price - ema))
+
+        self._cum_pv[idx] += price * volume
+        self._cum_v[idx] += volume
+        cum_v = self._cum_v[idx]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out["vwap"][idx] = np.where(cum_v > 0, self._cum_pv[idx] / cum_v, price)
+
+        has_prev = ~first & (prev > 0) & (price > 0)
+        ret_idx = idx[has_prev]
+        if ret_idx.size:
+            rets = np.log(price[has_prev] / prev[has_prev])
+            self._push(self._ret, self._ret_pos, self._ret_n, self._ret_mean, self._ret_m2, ret_idx, rets)
+            out["volatility"][ret_idx] = self._std(self._ret_m2[ret_idx], self._ret_n[ret_idx])
+
+        self._push(self._px, self._px_pos, self._px_n, self._px_mean, self._px_m2, idx, price)
+        std = self._std(self._px_m2[idx], self._px_n[idx])
+        mean = self._px_mean[idx]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out["zscore"][idx] = np.where(std > 0, (price - mean) / std, 0.0)
+
+        high = np.maximum(price, ask)
+        low = np.minimum(price, bid)
+        tr = np.maximum(high - low, np.maximum(np.abs(high - prev), np.abs(low - prev)))
+        atr = out["atr"][idx]
+        out["atr"][idx] = np.where(first, tr, atr + (tr - atr) / self.atr_period)
+
+        self._last[idx] = price
+        self._count[idx] += 1
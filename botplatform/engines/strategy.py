@@ -1,25 +1,122 @@
 from __future__ import annotations
 
-from typing import Dict, List
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from botplatform.core.context import StrategyContext
+from botplatform.core.fills import TERMINAL_STATUSES
 from botplatform.core.models import ActionIntent, OrderUpdate
+from botplatform.storage.storage import BaseStorage
 from botplatform.strategies.base import BaseStrategy
 
 
 class StrategyEngine:
+    """Маршрутизация тиков и обновлений ордеров по стратегиям.
+
+    Стратегия объявляет символы в ``BaseStrategy.symbols``; тик по символу
+    получают только подписанные на него стратегии (индекс symbol ->
+    стратегии) и стратегии без списка символов (``symbols is None`` — все
+    символы). Индекс хранит кортежи и пересобирается при регистрации,
+    поэтому стратегия может сниматься с учёта прямо во время ``on_tick``.
+    Каждому ``ActionIntent`` в ``context["strategy"]`` ставится имя
+    стратегии-автора.
+
+    Обновление ордера уходит стратегии, за которой ``bind_order`` закрепил
+    его ``client_id``; привязка снимается на финальном статусе. Об интенте,
+    по которому рантайм ордер не выставил, стратегии сообщает
+    ``release_intent``. Обновления без привязки (например, ордера из
+    прошлого запуска) получают стратегии символа ордера.
+    """
+
     def __init__(self) -> None:
         self._strategies: Dict[str, BaseStrategy] = {}
+        self._by_symbol: Dict[str, Tuple[BaseStrategy, ...]] = {}
+        self._any_symbol: Tuple[BaseStrategy, ...] = ()
+        self._orders: Dict[str, str] = {}
 
     def register_strategy(self, strategy: BaseStrategy) -> None:
+        if strategy.name in self._strategies:
+            self.unregister_strategy(strategy.name)
         self._strategies[strategy.name] = strategy
+        if strategy.symbols is None:
+            self._any_symbol += (strategy,)
+            return
+        for symbol in strategy.symbols:
+            self._by_symbol[symbol] = self._by_symbol.get(symbol, ()) + (strategy,)
+
+    def unregister_strategy(self, name: str) -> Optional[BaseStrategy]:
+        strategy = self._strategies.pop(name, None)
+        if strategy is None:
+            return None
+        if strategy.symbols is None:
+            self._any_symbol = tuple(s for s in self._any_symbol if s is not strategy)
+        else:
+            for symbol in strategy.symbols:
+                subscribers = tuple(s for s in self._by_symbol[symbol] if s is not strategy)
+                if subscribers:
+                    self._by_symbol[symbol] = subscribers
+                else:
+                    del self._by_symbol[symbol]
+        for client_id in [cid for cid, owner in self._orders.items() if owner == name]:
+            del self._orders[client_id]
+        return strategy
+
+    def get(self, name: str) -> Optional[BaseStrategy]:
+        return self._strategies.get(name)
+
+    def all(self) -> List[BaseStrategy]:
+        return list(self._strategies.values())
+
+    def strategies_for(self, symbol: str) -> Tuple[BaseStrategy, ...]:
+        subscribers = self._by_symbol.get(symbol, ())
+        if not self._any_symbol:
+            return subscribers
+        return subscribers + self._any_symbol
 
     def on_tick(self, ctx: StrategyContext) -> List[ActionIntent]:
         intents: List[ActionIntent] = []
-        for strategy in self._strategies.values():
-            intents.extend(strategy.on_tick(ctx))
+        for strategy in self.strategies_for(ctx.symbol):
+            for ai in strategy.on_tick(ctx):
+                if ai.context is None:
+                    ai.context = {}
+                ai.context.setdefault("strategy", strategy.name)
+                intents.append(ai)
         return intents
 
-    def on_order_update(self, update: OrderUpdate) -> None:
-        for strategy in self._strategies.values():
+    def bind_order(self, client_id: str, context: Optional[dict]) -> None:
+        """Закрепить ордер за стратегией из ``context["strategy"]``: его обновления получит только она."""
+        name = (context or {}).get("strategy")
+        strategy = self._strategies.get(name)
+        if strategy is None:
+            return
+        self._orders[client_id] = name
+        strategy.bind_order(client_id, context)
+
+    def release_intent(self, context: Optional[dict]) -> None:
+        """Интент стратегии из ``context["strategy"]`` не стал ордером."""
+        strategy = self._strategies.get((context or {}).get("strategy"))
+        if strategy is not None:
+            strategy.release_intent(context)
+
+    def on_order_update(self, update: OrderUpdate) -> List[str]:
+        """Передать обновление владельцу ордера; возвращает имена получивших стратегий."""
+        if update.status in TERMINAL_STATUSES:
+            owner = self._orders.pop(update.client_id, None)
+        else:
+            owner = self._orders.get(update.client_id)
+        if owner is not None:
+            self._strategies[owner].on_order_update(update)
+            return [owner]
+        strategies = self.strategies_for(update.symbol)
+        for strategy in strategies:
             strategy.on_order_update(update)
+        return [s.name for s in strategies]
+
+    def save_state(self, storage: BaseStorage, names: Iterable[str] | None = None) -> None:
+        for name in self._strategies if names is None else names:
+            storage.save_state(name, self._strategies[name].get_state())
+
+    def load_state(self, storage: BaseStorage) -> None:
+        for name, strategy in self._strategies.items():
+            state = storage.load_state(name)
+            if state is not None:
+                strategy.load_state(state)
@@ -1,8 +1,8 @@
 from __future__ import annotations
 
-import time
-from typing import List
+from typing import Any, Dict, List
 
+from botplatform.core.clock import SYSTEM_CLOCK, Clock
 from botplatform.core.context import StrategyContext
 from botplatform.core.event_bus import EventBus
 from botplatform.core.events import Event
@@ -13,10 +13,16 @@ from botplatform.core.models import (
     OrderUpdate,
     PositionSnapshot,
 )
+from botplatform.engines.signals import BaseSignalsEngine
 from botplatform.engines.strategy import StrategyEngine
 from botplatform.engines.execution_local import LocalExecutionEngine
+from botplatform.engines.oms import OrderManager
+from botplatform.engines.positions import PositionTracker
 from botplatform.exchanges.mock import MockExchange
+from botplatform.storage.history import MarketHistory
+from botplatform.storage.storage import BaseStorage
 from botplatform.strategies.hedge import HedgeStrategy
+from botplatform.utils.latency import LATENCY, now_ns
 
 
 class StrategyRuntime:
@@ -25,41 +31,78 @@ class StrategyRuntime:
         event_bus: EventBus,
         exchange: MockExchange,
         symbols: List[str],
+        history: MarketHistory | None = None,
+        signals: BaseSignalsEngine | None = None,
+        clock: Clock | None = None,
+        reconcile_interval: float = 30.0,
+        strategy_params: Dict[str, Any] | None = None,
+        storage: BaseStorage | None = None,
+        per_symbol: bool = False,
     ) -> None:
         self.event_bus = event_bus
         self.exchange = exchange
         self.symbols = symbols
+        self.history = history
+        self.signals = signals
+        self.clock = clock or SYSTEM_CLOCK
+        self.storage = storage
 
         self.strategy_engine = StrategyEngine()
-        if symbols:
-            hedge = HedgeStrategy(symbol=symbols[0])
+        # По умолчанию одна стратегия на первый символ; ``per_symbol`` —
+        # по стратегии на каждый символ (шарды супервизора, бэктест).
+        for symbol in symbols if per_symbol else symbols[:1]:
+            hedge = HedgeStrategy(symbol=symbol, **(strategy_params or {}))
             self.strategy_engine.register_strategy(hedge)
+        if storage is not None:
+            self.strategy_engine.load_state(storage)
 
-        self.execution = LocalExecutionEngine(event_bus=self.event_bus, exchange=self.exchange)
+        self.oms = OrderManager(clock=self.clock)
+        self.oms.subscribe(self.event_bus)
+        self.execution = LocalExecutionEngine(event_bus=self.event_bus, exchange=self.exchange, clock=self.clock)
+        self.positions = PositionTracker(exchange=self.exchange, reconcile_interval=reconcile_interval)
+        self.positions.subscribe(self.event_bus)
 
         self.event_bus.subscribe("market.snapshot", self._on_market_event)
         self.event_bus.subscribe("order.update", self._on_order_event)
 
+    async def start(self) -> None:
+        await self.positions.start()
+
+    async def stop(self) -> None:
+        await self.positions.stop()
+
     async def _on_market_event(self, event: Event) -> None:
-        snapshot = MarketSnapshot(**event.payload)
-        positions = await self.exchange.get_positions([snapshot.symbol])
-        position: PositionSnapshot | None = positions.get(snapshot.symbol)
+        # Запись из шины идёт в контекст как есть, без сборки pydantic-модели.
+        snapshot = event.data if event.data is not None else event.as_model(MarketSnapshot)
+        position: PositionSnapshot | None = self.positions.get(snapshot.symbol)
+        signals = await self.signals.on_market_snapshot(snapshot) if self.signals else None
 
         ctx = StrategyContext(
             symbol=snapshot.symbol,
             market=snapshot,
-            signals=None,
+            signals=signals,
             position=position,
+            history=self.history.get(snapshot.symbol) if self.history else None,
             timestamp=snapshot.timestamp,
         )
+        ingest_ns = event.ingest_ns
+        LATENCY.since("strategy.on_tick.start", ingest_ns)
         action_intents = self.strategy_engine.on_tick(ctx)
+        LATENCY.since("strategy.on_tick.end", ingest_ns)
+        t0 = now_ns()
         order_intents = await self._build_order_intents(snapshot.symbol, action_intents, position)
+        LATENCY.record("strategy.build_intents", now_ns() - t0)
         if order_intents:
+            LATENCY.since("execution.submit", ingest_ns)
             await self.execution.submit(order_intents)
+            LATENCY.since("exchange.ack", ingest_ns)
 
     async def _on_order_event(self, event: Event) -> None:
-        update = OrderUpdate(**event.payload)
-        self.strategy_engine.on_order_update(update)
+        update = event.as_model(OrderUpdate)
+        owners = self.strategy_engine.on_order_update(update)
+        if self.storage is not None and update.filled_size > 0:
+            # WAL-хранилище только ставит запись в очередь, диск пишется в фоне.
+            self.strategy_engine.save_state(self.storage, owners)
 
     async def _build_order_intents(
         self,
@@ -69,9 +112,10 @@ class StrategyRuntime:
     ) -> List[OrderIntent]:
         intents: List[OrderIntent] = []
         for ai in action_intents:
+            client_id = None
             if ai.action == "open" and ai.size and ai.side:
                 side = "BUY" if ai.side == "LONG" else "SELL"
-                client_id = f"{symbol}.{ai.side}.{int(time.time() * 1000)}"
+                client_id = self.oms.next_client_id()
                 intents.append(
                     OrderIntent(
                         symbol=symbol,
@@ -86,7 +130,7 @@ class StrategyRuntime:
                 )
             elif ai.action == "close" and ai.side and position and position.side == ai.side and position.size > 0:
                 side = "SELL" if ai.side == "LONG" else "BUY"
-                client_id = f"{symbol}.close.{int(time.time() * 1000)}"
+                client_id = self.oms.next_client_id()
                 intents.append(
                     OrderIntent(
                         symbol=symbol,
@@ -99,4 +143,9 @@ class StrategyRuntime:
                         context=ai.context or {},
                     )
                 )
+            if client_id is not None:
+                self.oms.track(intents[-1])
+                self.strategy_engine.bind_order(client_id, ai.context)
+            else:
+                self.strategy_engine.release_intent(ai.context)
         return intents
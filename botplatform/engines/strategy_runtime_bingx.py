@@ -1,56 +1,95 @@
 
 from __future__ import annotations
-import time
 from typing import List
+from botplatform.core.clock import SYSTEM_CLOCK, Clock
 from botplatform.core.context import StrategyContext
 from botplatform.core.models import ActionIntent, OrderIntent, OrderUpdate, MarketSnapshot
 from botplatform.engines.execution_bingx import BingXExecutionEngine
+from botplatform.engines.oms import OrderManager
+from botplatform.engines.positions import PositionTracker
 from botplatform.core.event_bus import EventBus
 from botplatform.core.events import Event
 from botplatform.strategies.hedge import HedgeStrategy
 from botplatform.exchanges.bingx.adapter import BingXExchangeAdapter
+from botplatform.engines.signals import BaseSignalsEngine
 from botplatform.engines.strategy import StrategyEngine
+from botplatform.storage.history import MarketHistory
+from botplatform.utils.latency import LATENCY, now_ns
+from botplatform.storage.storage import BaseStorage
 
 class BingXStrategyRuntime:
-    def __init__(self, event_bus: EventBus, exchange: BingXExchangeAdapter, symbols: List[str]):
+    def __init__(self, event_bus: EventBus, exchange: BingXExchangeAdapter, symbols: List[str],
+                 history: MarketHistory | None = None, signals: BaseSignalsEngine | None = None,
+                 clock: Clock | None = None, storage: BaseStorage | None = None):
         self.event_bus = event_bus
         self.exchange = exchange
         self.symbols = symbols
+        self.history = history
+        self.signals = signals
+        self.clock = clock or SYSTEM_CLOCK
+        self.storage = storage
 
         self.strategy_engine = StrategyEngine()
         self.strategy_engine.register_strategy(HedgeStrategy(symbols[0]))
+        if storage is not None:
+            self.strategy_engine.load_state(storage)
 
-        self.execution = BingXExecutionEngine(event_bus, exchange)
+        self.oms = OrderManager(clock=self.clock)
+        self.oms.subscribe(event_bus)
+        self.execution = BingXExecutionEngine(event_bus, exchange, clock=self.clock)
+        self.positions = PositionTracker(exchange)
+        self.positions.subscribe(event_bus)
 
         self.event_bus.subscribe("market.snapshot", self._on_market)
         self.event_bus.subscribe("order.update", self._on_order)
 
+    async def start(self):
+        await self.positions.start()
+
+    async def stop(self):
+        await self.positions.stop()
+
     async def _on_market(self, event: Event):
-        snap = MarketSnapshot(**event.payload)
-        positions = await self.exchange.get_positions([snap.symbol])
-        pos = positions.get(snap.symbol)
+        snap = event.data if event.data is not None else event.as_model(MarketSnapshot)
+        pos = self.positions.get(snap.symbol)
+        signals = await self.signals.on_market_snapshot(snap) if self.signals else None
 
         ctx = StrategyContext(
             symbol=snap.symbol,
             market=snap,
-            signals=None,
+            signals=signals,
             position=pos,
+            history=self.history.get(snap.symbol) if self.history else None,
             timestamp=snap.timestamp
         )
+        ingest_ns = event.ingest_ns
+        LATENCY.since("strategy.on_tick.start", ingest_ns)
         actions = self.strategy_engine.on_tick(ctx)
+        LATENCY.since("strategy.on_tick.end", ingest_ns)
+        t0 = now_ns()
         intents = await self._actions_to_orders(snap.symbol, actions, pos)
+        LATENCY.record("strategy.build_intents", now_ns() - t0)
         if intents:
+            LATENCY.since("execution.submit", ingest_ns)
             await self.execution.submit(intents)
+            LATENCY.since("exchange.ack", ingest_ns)
 
     async def _on_order(self, event: Event):
-        update = OrderUpdate(**event.payload)
-        self.strategy_engine.on_order_update(update)
+        update = event.as_model(OrderUpdate)
+        owners = self.strategy_engine.on_order_update(update)
+        if self.storage is not None and update.filled_size > 0:
+            self.strategy_engine.save_state(self.storage, owners)
 
     async def _actions_to_orders(self, symbol, actions, pos):
         out = []
         for a in actions:
             if a.action == "open" and a.side and a.size:
                 side = "BUY" if a.side == "LONG" else "SELL"
-                cid = f"{symbol}.{side}.{int(time.time()*1000)}"
-                out.append(OrderIntent(symbol, side, "MARKET", a.size, None, cid, "HedgeStrategy", {}))
+                cid = self.oms.next_client_id()
+                out.append(OrderIntent(symbol=symbol, side=side, type="MARKET", size=a.size, price=None,
+                                       client_id=cid, source="HedgeStrategy", context=a.context or {}))
+                self.oms.track(out[-1])
+                self.strategy_engine.bind_order(cid, a.context)
+            else:
+                self.strategy_engine.release_intent(a.context)
         return out
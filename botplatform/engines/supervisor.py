@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing as mp
+import os
+import queue
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from botplatform.core.event_bus import EventBus
+from botplatform.core.events import Event
+from botplatform.core.models import MarketSnapshot, OrderUpdate
+from botplatform.core.records import MarketRecord
+from botplatform.engines.signals_indicators import IndicatorSignalsEngine
+from botplatform.engines.strategy_runtime import StrategyRuntime
+from botplatform.exchanges.mock import MockExchange
+from botplatform.storage.history import MarketHistory
+
+log = logging.getLogger("botplatform.supervisor")
+
+ExchangeFactory = Callable[[Callable[[str], float]], Any]
+
+_POLL = 0.1  # период опроса межпроцессных очередей, с
+_EMPTY = object()
+
+
+def mock_exchange(price_provider: Callable[[str], float]) -> MockExchange:
+    return MockExchange(price_provider=price_provider)
+
+
+def partition_symbols(symbols: List[str], shards: int) -> Dict[str, int]:
+    """Символ -> номер шарда: по кругу по отсортированному списку, поровну и детерминированно."""
+    return {symbol: i % shards for i, symbol in enumerate(sorted(symbols))}
+
+
+def _poll(q: Any) -> Any:
+    try:
+        return q.get(timeout=_POLL)
+    except queue.Empty:
+        return _EMPTY
+
+
+def _shard_main(
+    shard_id: int,
+    symbols: List[str],
+    inbox: Any,
+    outbox: Any,
+    exchange_factory: ExchangeFactory,
+    metrics_interval: float,
+) -> None:
+    asyncio.run(_shard_loop(shard_id, symbols, inbox, outbox, exchange_factory, metrics_interval))
+
+
+async def _shard_loop(
+    shard_id: int,
+    symbols: List[str],
+    inbox: Any,
+    outbox: Any,
+    exchange_factory: ExchangeFactory,
+    metrics_interval: float,
+) -> None:
+    loop = asyncio.get_running_loop()
+    prices: Dict[str, float] = {}
+    bus = EventBus()
+    history = MarketHistory(capacity=4096)
+    history.subscribe(bus)
+    runtime = StrategyRuntime(
+        event_bus=bus,
+        exchange=exchange_factory(prices.__getitem__),
+        symbols=symbols,
+        history=history,
+        signals=IndicatorSignalsEngine(),
+        per_symbol=True,
+    )
+    stats = {"symbols": len(symbols), "ticks": 0, "orders": 0, "busy_seconds": 0.0}
+
+    async def forward_update(event: Event) -> None:
+        stats["orders"] += 1
+        outbox.put(("order", shard_id, event.as_model(OrderUpdate)))
+
+    def metrics() -> Dict[str, Any]:
+        return {**stats, **bus.queue_stats(), "pid": os.getpid()}
+
+    bus.subscribe("order.update", forward_update)
+    await bus.start()
+    await runtime.start()
+    last_report = time.monotonic()
+    try:
+        while True:
+            batch = await loop.run_in_executor(None, _poll, inbox)
+            if batch is None:
+                break
+            if batch is not _EMPTY:
+                t0 = time.perf_counter()
+                for record in batch:
+                    prices[record.symbol] = record.price
+                    await bus.publish(Event(
+                        type="market.snapshot",
+                        timestamp=record.timestamp,
+                        source=f"shard-{shard_id}",
+                        data=record,
+                    ))
+                await bus.join()
+                stats["ticks"] += len(batch)
+                stats["busy_seconds"] += time.perf_counter() - t0
+            now = time.monotonic()
+            if now - last_report >= metrics_interval:
+                outbox.put(("metrics", shard_id, metrics()))
+                last_report = now
+    finally:
+        await runtime.stop()
+        await bus.stop()
+        outbox.put(("metrics", shard_id, metrics()))
+        outbox.put(("stopped", shard_id, None))
+
+
+class ShardSupervisor:
+    """Разносит символы по процессам-шардам, в каждом — свой ``StrategyRuntime``.
+
+    Каждый шард — отдельный процесс со своими ``EventBus``, ``StrategyEngine``,
+    движком исполнения и биржей (``exchange_factory``), поэтому тяжёлые
+    стратегии не делят одно ядро под GIL. Супервизор подписан на
+    ``market.snapshot`` центральной шины и пересылает тики нужному шарду
+    пачками: всё, что пришло за одну итерацию event loop, уходит одним
+    сообщением. ``order.update`` из шардов публикуются обратно в
+    центральную шину, метрики шардов собираются в ``metrics``.
+
+    Процессы запускаются через ``spawn``: скрипт должен иметь защиту
+    ``if __name__ == "__main__"``, а ``exchange_factory`` — быть функцией
+    уровня модуля.
+    """
+
+    def __init__(
+        self,
+        event_bus: EventBus,
+        symbols: List[str],
+        shards: Optional[int] = None,
+        exchange_factory: ExchangeFactory = mock_exchange,
+        metrics_interval: float = 1.0,
+    ) -> None:
+        if not symbols:
+            raise ValueError("symbols must not be empty")
+        self.event_bus = event_bus
+        self.symbols = symbols
+        self.shards = max(1, min(shards or os.cpu_count() or 1, len(symbols)))
+        self.assignment = partition_symbols(symbols, self.shards)
+        self.exchange_factory = exchange_factory
+        self.metrics_interval = metrics_interval
+        self.metrics: Dict[int, Dict[str, Any]] = {}
+
+        self._ctx = mp.get_context("spawn")
+        self._inboxes = [self._ctx.Queue() for _ in range(self.shards)]
+        self._outbox = self._ctx.Queue()
+        self._processes: List[Any] = []
+        self._pending: List[List[MarketRecord]] = [[] for _ in range(self.shards)]
+        self._flush_scheduled = False
+        self._running = False
+        self._stopped: set = set()
+        self._reader: asyncio.Task | None = None
+
+    def shard_symbols(self, shard_id: int) -> List[str]:
+        return [s for s, i in self.assignment.items() if i == shard_id]
+
+    async def start(self) -> None:
+        for shard_id in range(self.shards):
+            process = self._ctx.Process(
+                target=_shard_main,
+                args=(
+                    shard_id,
+                    self.shard_symbols(shard_id),
+                    self._inboxes[shard_id],
+                    self._outbox,
+                    self.exchange_factory,
+                    self.metrics_interval,
+                ),
+                name=f"botplatform-shard-{shard_id}",
+                daemon=True,
+            )
+            process.start()
+            self._processes.append(process)
+        self._running = True
+        self.event_bus.subscribe("market.snapshot", self._on_market_event)
+        self._reader = asyncio.create_task(self._read_outbox())
+
+    async def stop(self, timeout: float = 5.0) -> None:
+        self._running = False
+        self._flush()
+        for inbox in self._inboxes:
+            inbox.put(None)
+        if self._reader is not None:
+            try:
+                await asyncio.wait_for(self._reader, timeout)
+            except asyncio.TimeoutError:
+                log.warning("Shards did not stop in %.1fs: %s", timeout,
+                            sorted(set(range(self.shards)) - self._stopped))
+                self._reader.cancel()
+            self._reader = None
+        loop = asyncio.get_running_loop()
+        for process in self._processes:
+            await loop.run_in_executor(None, process.join, timeout)
+            if process.is_alive():
+                process.terminate()
+        self._processes = []
+
+    async def _on_market_event(self, event: Event) -> None:
+        if not self._running:
+            return
+        data = event.data if event.data is not None else event.as_model(MarketSnapshot)
+        shard_id = self.assignment.get(data.symbol)
+        if shard_id is None:
+            return
+        record = data if isinstance(data, MarketRecord) else MarketRecord.from_model(data)
+        self._pending[shard_id].append(record)
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            asyncio.get_running_loop().call_soon(self._flush)
+
+    def _flush(self) -> None:
+        self._flush_scheduled = False
+        for shard_id, batch in enumerate(self._pending):
+            if batch:
+                self._inboxes[shard_id].put(batch)
+                self._pending[shard_id] = []
+
+    async def _read_outbox(self) -> None:
+        loop = asyncio.get_running_loop()
+        while len(self._stopped) < self.shards:
+            msg = await loop.run_in_executor(None, _poll, self._outbox)
+            if msg is _EMPTY:
+                if not any(p.is_alive() for p in self._processes):
+                    log.warning("All shard processes exited")
+                    return
+                continue
+            kind, shard_id, body = msg
+            if kind == "order":
+                await self.event_bus.publish(Event(
+                    type="order.update",
+                    timestamp=body.timestamp,
+                    source=f"shard-{shard_id}",
+                    data=body,
+                ))
+            elif kind == "metrics":
+                self.metrics[shard_id] = body
+            elif kind == "stopped":
+                self._stopped.add(shard_id)
+
+    def totals(self) -> Dict[str, Any]:
+        """Сумма числовых метрик по всем шардам."""
+        total: Dict[str, Any] = {}
+        for m in self.metrics.values():
+            for k, v in m.items():
+                if k != "pid" and isinstance(v, (int, float)):
+                    total[k] = total.get(k, 0) + v
+        return total
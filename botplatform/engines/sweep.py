@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+from botplatform.engines.backtest import run_backtest
+from botplatform.engines.replay import merge_ticks
+from botplatform.storage.tickstore import TickStore
+
+
+def param_grid(grid: Mapping[str, Sequence[Any]]) -> List[Dict[str, Any]]:
+    """Все комбинации значений: ``{"a": [1, 2], "b": [3]}`` -> ``[{"a": 1, "b": 3}, {"a": 2, "b": 3}]``."""
+    keys = list(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*(grid[k] for k in keys))]
+
+
+def _run_one(job: Dict[str, Any]) -> Dict[str, Any]:
+    # Выполняется в процессе пула: каждый воркер сам открывает файлы
+    # тиков через mmap, так что данные делятся через page cache ОС, а не
+    # копируются в процессы.
+    ticks = merge_ticks(TickStore(job["root"]), job["symbols"], job["start_ms"], job["end_ms"])
+    report = asyncio.run(run_backtest(job["symbols"], ticks, strategy_params=job["params"]))
+    return {
+        **job["params"],
+        "ticks": report.ticks,
+        "realized_pnl": report.realized_pnl,
+        "unrealized_pnl": report.unrealized_pnl,
+        "pnl": report.realized_pnl + report.unrealized_pnl,
+        "long_pnl": report.leg_pnl(".long"),
+        "short_pnl": report.leg_pnl(".short"),
+        "ticks_per_sec": report.ticks_per_sec,
+        "latency_p50_us": report.latency_us(50),
+        "latency_p99_us": report.latency_us(99),
+        "latency_max_us": report.latency_us(100),
+    }
+
+
+def run_sweep(
+    root: str,
+    symbols: List[str],
+    grid: Mapping[str, Sequence[Any]],
+    start_ms: Optional[int] = None,
+    end_ms: Optional[int] = None,
+    processes: Optional[int] = None,
+    sort_by: str = "pnl",
+) -> List[Dict[str, Any]]:
+    """Перебор параметров ``HedgeStrategy`` по сетке ``grid`` на пуле процессов.
+
+    Каждая комбинация — отдельный изолированный бэктест ``StrategyRuntime``
+    с ``MockExchange`` по тикам из ``TickStore`` в ``root``. Результат —
+    таблица (список строк): параметры, PnL и задержки обработки тика,
+    отсортированная по убыванию колонки ``sort_by``. По умолчанию
+    занимает все ядра.
+
+    ``pnl`` — итог по позициям на бирже. У ``HedgeStrategy`` длинная и
+    короткая ноги на одном символе взаимно гасятся, и ``pnl`` почти всегда
+    ноль; результат хеджа — в ``long_pnl`` и ``short_pnl``, сортируйте по ним.
+    """
+    jobs = [
+        {"root": str(root), "symbols": symbols, "start_ms": start_ms, "end_ms": end_ms, "params": params}
+        for params in param_grid(grid)
+    ]
+    if not jobs:
+        return []
+    workers = min(processes or os.cpu_count() or 1, len(jobs))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        rows = list(pool.map(_run_one, jobs))
+    rows.sort(key=lambda row: row[sort_by], reverse=True)
+    return rows
+
+
+def format_table(rows: List[Dict[str, Any]]) -> str:
+    """Таблица результатов в виде выровненного текста."""
+    if not rows:
+        return ""
+    columns = list(rows[0])
+    cells = [[f"{row[c]:.6g}" if isinstance(row[c], float) else str(row[c]) for c in columns] for row in rows]
+    widths = [max(len(c), *(len(r[i]) for r in cells)) for i, c in enumerate(columns)]
+    lines = ["  ".join(c.rjust(w) for c, w in zip(columns, widths))]
+    lines += ["  ".join(v.rjust(w) for v, w in zip(r, widths)) for r in cells]
+    return "\n".join(lines)
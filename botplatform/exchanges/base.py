@@ -1,10 +1,22 @@
 from __future__ import annotations
 
-from typing import Protocol, List, Callable, Awaitable, Dict
+from typing import Any, Protocol, List, Callable, Awaitable, Dict, Optional
 
 from botplatform.core.models import MarketSnapshot, PositionSnapshot, OrderIntent, OrderUpdate
 
 
+class OrderRejected(Exception):
+    """Биржа ответила отказом: ордер точно не принят.
+
+    Любая другая ошибка (таймаут, обрыв соединения, 5xx) не говорит, принят
+    ли ордер, и не должна превращаться в REJECTED.
+    """
+
+    def __init__(self, reason: Any) -> None:
+        super().__init__(reason)
+        self.reason = reason
+
+
 class Exchange(Protocol):
     async def get_market_snapshot(self, symbol: str) -> MarketSnapshot:
         ...
@@ -17,3 +29,7 @@ class Exchange(Protocol):
 
     async def cancel_order(self, order_id: str, symbol: str) -> OrderUpdate:
         ...
+
+    async def get_order(self, symbol: str, client_id: str) -> Optional[OrderUpdate]:
+        """Текущее состояние ордера по ``client_id``; None — биржа такого ордера не знает."""
+        ...
@@ -1,7 +1,7 @@
 """BingX exchange integration for BotPlatform.
 
 Содержит:
-- BingXRest: низкоуровневый REST клиент
+- BingXRest: асинхронный REST клиент с пулом соединений
 - BingXWebSocket: простая обёртка над WS
 - BingXExchangeAdapter: адаптер под интерфейс Exchange
 """
@@ -1,87 +1,169 @@
 
 from __future__ import annotations
-from typing import Dict, List
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+import aiohttp
+
+from botplatform.core.fills import ORDER_HISTORY, fill_delta
+from botplatform.core.ledger import PositionLedger
 from botplatform.core.models import MarketSnapshot, OrderIntent, OrderUpdate, PositionSnapshot
+from botplatform.engines.execution import rejected_update
+from botplatform.exchanges.base import OrderRejected
 from botplatform.exchanges.bingx.rest import BingXRest
 
+# Код ответа BingX «ордер не существует».
+ORDER_NOT_FOUND = 80016
+
+STATUSES = {
+    "NEW": "NEW",
+    "PENDING": "NEW",
+    "PARTIALLY_FILLED": "PARTIAL",
+    "FILLED": "FILLED",
+    "CANCELED": "CANCELLED",
+    "CANCELLED": "CANCELLED",
+    "EXPIRED": "CANCELLED",
+    "FAILED": "REJECTED",
+    "REJECTED": "REJECTED",
+}
+
+
+@asynccontextmanager
+async def _refusals() -> AsyncIterator[None]:
+    """HTTP 4xx — биржа разобрала запрос и отказала; 5xx и сетевые ошибки пробрасываются как есть."""
+    try:
+        yield
+    except aiohttp.ClientResponseError as exc:
+        if 400 <= exc.status < 500:
+            raise OrderRejected({"http": exc.status, "msg": exc.message}) from exc
+        raise
+
+
 class BingXExchangeAdapter:
+    """Ордера и позиции BingX.
+
+    ``place_order``/``place_orders``/``get_order`` только запрашивают биржу и
+    ledger не трогают. Исполнения попадают в ledger через ``apply_update``,
+    которому исполнение передаёт каждое опубликованное обновление; объём
+    считается приращением к уже учтённому по ордеру, так что повторные и
+    накопительные обновления (PARTIAL, затем FILLED) не удваивают позицию.
+    Учтённые объёмы последних ``ORDER_HISTORY`` ордеров отдаёт ``order_fills``.
+    """
+
     def __init__(self, rest: BingXRest):
         self.rest = rest
-        self.positions: Dict[str, PositionSnapshot] = {}
+        self.ledger = PositionLedger()
+        # client_id -> (учтённый filled_size, его avg_fill_price).
+        self._fills: Dict[str, Tuple[float, float]] = {}
 
     async def get_market_snapshot(self, symbol: str) -> MarketSnapshot:
-        price = self.rest.get_price(symbol)
+        price = await self.rest.get_price(symbol)
         return MarketSnapshot(
             symbol=symbol,
             price=price,
             bid=price-0.5,
             ask=price+0.5,
-            bids=[], asks=[], trades=[], timestamp=0
+            bids=[], asks=[], trades=[], timestamp=self.rest.clock.now_ms()
         )
 
-    async def get_positions(self, symbols: List[str] | None = None):
-        if symbols is None:
-            return dict(self.positions)
-        return {s: self.positions.get(s, PositionSnapshot(symbol=s)) for s in symbols}
+    async def get_positions(self, symbols: List[str] | None = None) -> Dict[str, PositionSnapshot]:
+        return self.ledger.snapshots(symbols)
 
     async def place_order(self, intent: OrderIntent) -> OrderUpdate:
-        side = intent.side
-        symbol = intent.symbol
-        qty = intent.size
-        price = intent.price
-        resp = self.rest.place_order(symbol, side, qty, price)
-
+        async with _refusals():
+            resp = await self.rest.place_order(intent.symbol, intent.side, intent.size, intent.price,
+                                               order_type=intent.type, client_order_id=intent.client_id)
+        if resp.get("code"):
+            raise OrderRejected({"code": resp.get("code"), "msg": resp.get("msg")})
         order_id = resp.get("data", {}).get("orderId", "unknown")
-        avg_price = price or self.rest.get_price(symbol)
-
-        pos = self.positions.get(symbol) or PositionSnapshot(symbol=symbol)
-        if pos.side is None or pos.size == 0:
-            pos.side = "LONG" if side == "BUY" else "SHORT"
-            pos.size = qty
-            pos.entry_price = avg_price
-        else:
-            # simplified PnL logic
-            if pos.side == "LONG":
-                if side == "BUY":
-                    new_size = pos.size + qty
-                    pos.entry_price = (pos.entry_price*pos.size + avg_price*qty)/new_size
-                    pos.size = new_size
-                else:
-                    if qty >= pos.size:
-                        pos.realized_pnl += (avg_price - pos.entry_price)*pos.size
-                        pos.size = 0
-                        pos.side = None
-                    else:
-                        pos.realized_pnl += (avg_price - pos.entry_price)*qty
-                        pos.size -= qty
-            elif pos.side == "SHORT":
-                if side == "SELL":
-                    new_size = pos.size + qty
-                    pos.entry_price = (pos.entry_price*pos.size + avg_price*qty)/new_size
-                    pos.size = new_size
-                else:
-                    if qty >= pos.size:
-                        pos.realized_pnl += (pos.entry_price - avg_price)*pos.size
-                        pos.size = 0
-                        pos.side = None
-                    else:
-                        pos.realized_pnl += (pos.entry_price - avg_price)*qty
-                        pos.size -= qty
-
-        self.positions[symbol] = pos
+        avg_price = intent.price or await self.rest.get_price(intent.symbol)
+        return self._filled(intent, order_id, avg_price, resp)
+
+    async def place_orders(self, intents: List[OrderIntent]) -> List[OrderUpdate]:
+        """Пачка ордеров через batchOrders; ответ сопоставляется интентам по clientOrderID.
 
+        Ордера, которых нет среди принятых биржей, возвращаются как REJECTED
+        с ответом биржи в ``raw`` — так частично отклонённая пачка не теряет
+        ни одного ``client_id``.
+        """
+        orders = [
+            self.rest.order_params(i.symbol, i.side, i.size, i.price, i.type, i.client_id)
+            for i in intents
+        ]
+        async with _refusals():
+            resp = await self.rest.place_batch_orders(orders)
+        accepted = {
+            o.get("clientOrderID") or o.get("clientOrderId"): o
+            for o in (resp.get("data") or {}).get("orders") or []
+        }
+
+        market_symbols = {i.symbol for i in intents if not i.price and i.client_id in accepted}
+        prices = dict(zip(market_symbols, await asyncio.gather(*(self.rest.get_price(s) for s in market_symbols))))
+
+        updates: List[OrderUpdate] = []
+        for intent in intents:
+            order = accepted.get(intent.client_id)
+            if order is None:
+                updates.append(rejected_update(intent, {"code": resp.get("code"), "msg": resp.get("msg"), "batch": True},
+                                               self.rest.clock))
+                continue
+            avg_price = intent.price or prices[intent.symbol]
+            updates.append(self._filled(intent, str(order.get("orderId", "unknown")), avg_price, order))
+        return updates
+
+    async def get_order(self, symbol: str, client_id: str) -> Optional[OrderUpdate]:
+        resp = await self.rest.get_order(symbol, client_id)
+        if resp.get("code") == ORDER_NOT_FOUND:
+            return None
+        if resp.get("code"):
+            raise RuntimeError(f"order lookup failed: {resp.get('code')} {resp.get('msg')}")
+        data = resp.get("data") or {}
+        order = data.get("order") or data
+        filled = float(order.get("executedQty") or 0.0)
+        size = float(order.get("origQty") or filled)
+        avg_price = float(order.get("avgPrice") or 0.0) or None
+        return OrderUpdate(
+            order_id=str(order.get("orderId", "")),
+            client_id=client_id,
+            symbol=symbol,
+            side=order.get("side"),
+            status=STATUSES.get(order.get("status"), "NEW"),
+            filled_size=filled,
+            remaining_size=max(size - filled, 0.0),
+            avg_fill_price=avg_price,
+            timestamp=self.rest.clock.now_ms(),
+            raw=order,
+        )
+
+    def _filled(self, intent: OrderIntent, order_id: str, avg_price: float, raw: dict) -> OrderUpdate:
         return OrderUpdate(
             order_id=order_id,
             client_id=intent.client_id,
-            symbol=symbol,
+            symbol=intent.symbol,
+            side=intent.side,
             status="FILLED",
-            filled_size=qty,
+            filled_size=intent.size,
             remaining_size=0.0,
             avg_fill_price=avg_price,
-            timestamp=0,
-            raw=resp
+            timestamp=self.rest.clock.now_ms(),
+            raw=raw
         )
 
+    def apply_update(self, update: OrderUpdate) -> None:
+        """Учесть в ledger исполнение из обновления — только сверх уже учтённого по ордеру."""
+        prev_filled, prev_avg = self._fills.get(update.client_id, (0.0, 0.0))
+        size, price = fill_delta(update, prev_filled, prev_avg)
+        if size > 0.0 and update.side is not None:
+            self.ledger.apply_fill(update.symbol, update.side, size, price)
+            self._fills[update.client_id] = (update.filled_size, update.avg_fill_price or 0.0)
+            if len(self._fills) > ORDER_HISTORY:
+                del self._fills[next(iter(self._fills))]
+
+    def order_fills(self) -> Dict[str, Tuple[float, float]]:
+        """client_id -> (filled_size, avg_fill_price), уже вошедшие в ``get_positions``."""
+        return dict(self._fills)
+
     async def cancel_order(self, order_id: str, symbol: str):
         return OrderUpdate(
             order_id=order_id,
@@ -91,6 +173,6 @@ class BingXExchangeAdapter:
             filled_size=0.0,
             remaining_size=0.0,
             avg_fill_price=None,
-            timestamp=0,
+            timestamp=self.rest.clock.now_ms(),
             raw={"cancel": True}
         )
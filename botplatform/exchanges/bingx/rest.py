@@ -1,13 +1,41 @@
 
 from __future__ import annotations
-import time, hmac, hashlib, requests
-from typing import Dict, Any
+import asyncio, json, hmac, hashlib
+from typing import Dict, Any, List, Optional
+
+import aiohttp
+
+from botplatform.core.clock import SYSTEM_CLOCK, Clock
 
 class BingXRest:
-    def __init__(self, api_key: str, api_secret: str, base_url: str):
+    """Асинхронный REST-клиент BingX.
+
+    Все запросы идут через одну aiohttp-сессию с пулом keep-alive соединений,
+    число одновременных запросов ограничено ``max_in_flight``. ``timeout`` —
+    таймаут по умолчанию, отдельный запрос может передать свой.
+    Сессия создаётся лениво внутри работающего event loop; ``close()``
+    нужно вызвать при остановке.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        api_secret: str,
+        base_url: str,
+        timeout: float = 10.0,
+        max_in_flight: int = 16,
+        keepalive_timeout: float = 30.0,
+        clock: Clock | None = None,
+    ):
         self.key = api_key
         self.secret = api_secret.encode()
         self.url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.max_in_flight = max_in_flight
+        self.keepalive_timeout = keepalive_timeout
+        self.clock = clock or SYSTEM_CLOCK
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._slots = asyncio.Semaphore(max_in_flight)
 
     def _sign(self, params: Dict[str, Any]) -> str:
         qs = "&".join(f"{k}={v}" for k, v in sorted(params.items()))
@@ -16,24 +44,52 @@ class BingXRest:
     def _headers(self):
         return {"X-BX-APIKEY": self.key, "Content-Type": "application/x-www-form-urlencoded"}
 
-    def _request(self, method, path, params, signed):
-        params = params or {}
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.max_in_flight, keepalive_timeout=self.keepalive_timeout)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers=self._headers(),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self._session
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def _request(self, method, path, params, signed, timeout: Optional[float] = None):
+        params = dict(params or {})
         if signed:
-            params["timestamp"] = int(time.time() * 1000)
+            params["timestamp"] = self.clock.now_ms()
             params["signature"] = self._sign(params)
+        kwargs: Dict[str, Any] = {}
+        if timeout is not None:
+            kwargs["timeout"] = aiohttp.ClientTimeout(total=timeout)
         if method == "GET":
-            r = requests.get(self.url + path, headers=self._headers(), params=params)
+            kwargs["params"] = params
         else:
-            r = requests.post(self.url + path, headers=self._headers(), data=params)
-        r.raise_for_status()
-        return r.json()
+            kwargs["data"] = params
+        session = self._get_session()
+        async with self._slots:
+            async with session.request(method, self.url + path, **kwargs) as r:
+                r.raise_for_status()
+                return await r.json(content_type=None)
 
-    def get_price(self, symbol: str) -> float:
-        data = self._request("GET", "/openApi/swap/v2/quote/price", {"symbol": symbol}, signed=False)
+    async def get_price(self, symbol: str, timeout: Optional[float] = None) -> float:
+        data = await self._request("GET", "/openApi/swap/v2/quote/price", {"symbol": symbol}, signed=False, timeout=timeout)
         price = data.get("data", {}).get("price") or data.get("price")
         return float(price)
 
-    def place_order(self, symbol: str, side: str, qty: float, price=None, order_type="MARKET"):
+    async def get_depth(self, symbol: str, limit: int = 100, timeout: Optional[float] = None) -> Dict[str, Any]:
+        data = await self._request("GET", "/openApi/swap/v2/quote/depth", {"symbol": symbol, "limit": limit},
+                                   signed=False, timeout=timeout)
+        return data.get("data") or data
+
+    @staticmethod
+    def order_params(symbol: str, side: str, qty: float, price=None, order_type="MARKET",
+                     client_order_id: Optional[str] = None) -> Dict[str, Any]:
         params = {
             "symbol": symbol,
             "side": side,
@@ -42,4 +98,20 @@ class BingXRest:
         }
         if price and order_type == "LIMIT":
             params["price"] = price
-        return self._request("POST", "/openApi/swap/v2/trade/order", params, signed=True)
+        if client_order_id:
+            params["clientOrderID"] = client_order_id
+        return params
+
+    async def place_order(self, symbol: str, side: str, qty: float, price=None, order_type="MARKET",
+                          client_order_id: Optional[str] = None, timeout: Optional[float] = None):
+        params = self.order_params(symbol, side, qty, price, order_type, client_order_id)
+        return await self._request("POST", "/openApi/swap/v2/trade/order", params, signed=True, timeout=timeout)
+
+    async def get_order(self, symbol: str, client_order_id: str, timeout: Optional[float] = None):
+        params = {"symbol": symbol, "clientOrderID": client_order_id}
+        return await self._request("GET", "/openApi/swap/v2/trade/order", params, signed=True, timeout=timeout)
+
+    async def place_batch_orders(self, orders: List[Dict[str, Any]], timeout: Optional[float] = None):
+        """Несколько ордеров одним запросом; ``orders`` — словари из ``order_params``."""
+        params = {"batchOrders": json.dumps(orders, separators=(",", ":"))}
+        return await self._request("POST", "/openApi/swap/v2/trade/batchOrders", params, signed=True, timeout=timeout)
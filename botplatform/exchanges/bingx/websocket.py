@@ -1,25 +1,138 @@
 
 from __future__ import annotations
-import asyncio, json, websockets
-from typing import Awaitable, Callable
+import asyncio, json, logging, random, time, zlib, websockets
+from dataclasses import dataclass, fields
+from typing import Any, Awaitable, Callable, Dict, Optional, Union
+
+from botplatform.utils import jsonfast
+
+Decoder = Callable[[Union[str, bytes]], Any]
+
+log = logging.getLogger("botplatform.bingx.ws")
+
+_PING = object()
+
+
+def default_decoder() -> Decoder:
+    return jsonfast.loads
+
+
+@dataclass
+class WSStats:
+    messages: int = 0
+    bytes: int = 0
+    decode_time_ns: int = 0
+    dropped: int = 0
+    handler_errors: int = 0
+    pings: int = 0
+    reconnects: int = 0
+
+    def merge(self, other: "WSStats") -> None:
+        for f in fields(self):
+            setattr(self, f.name, getattr(self, f.name) + getattr(other, f.name))
+
+    def as_dict(self) -> Dict[str, int]:
+        return {f.name: getattr(self, f.name) for f in fields(self)}
+
 
 class BingXWebSocket:
-    def __init__(self, ws_url: str, subscribe_payload: dict):
+    """WS-подключение к BingX с переподключением и подсчётом метрик.
+
+    - после разрыва соединение восстанавливается с экспоненциальной задержкой
+      (``reconnect_delay`` … ``max_reconnect_delay``, с джиттером), подписка
+      отправляется заново;
+    - протокольные ping/pong ведёт библиотека ``websockets``, прикладной
+      ``Ping`` от BingX получает ``Pong``;
+    - бинарные кадры распаковываются из gzip, JSON декодируется ``decoder``
+      (по умолчанию orjson, если установлен);
+    - ``stats`` — счётчики текущего соединения, ``totals`` — с момента запуска.
+      Кадры, которые не удалось распаковать или декодировать, считаются
+      в ``dropped``, ошибки обработчика — в ``handler_errors``.
+    """
+
+    def __init__(self, ws_url: str, subscribe_payload: dict,
+                 decoder: Optional[Decoder] = None,
+                 reconnect_delay: float = 0.5,
+                 max_reconnect_delay: float = 30.0,
+                 ping_interval: Optional[float] = 20.0,
+                 ping_timeout: Optional[float] = 20.0):
         self.ws_url = ws_url
         self.payload = subscribe_payload
+        self.decoder = decoder or default_decoder()
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.ping_interval = ping_interval
+        self.ping_timeout = ping_timeout
+        self.stats = WSStats()
+        self.totals = WSStats()
+        # Момент приёма текущего кадра (perf_counter_ns): обработчик берёт его
+        # как начало отсчёта задержки тика.
+        self.last_recv_ns: Optional[int] = None
         self._running = False
+        self._ws = None
 
     async def run(self, handler: Callable[[dict], Awaitable[None]]):
         self._running = True
-        async with websockets.connect(self.ws_url) as ws:
-            await ws.send(json.dumps(self.payload))
-            while self._running:
-                msg = await ws.recv()
-                try:
-                    data = json.loads(msg)
-                    await handler(data)
-                except:
-                    continue
+        delay = self.reconnect_delay
+        while self._running:
+            try:
+                async with websockets.connect(self.ws_url, ping_interval=self.ping_interval,
+                                              ping_timeout=self.ping_timeout, max_size=None) as ws:
+                    self._ws = ws
+                    await ws.send(json.dumps(self.payload))
+                    delay = self.reconnect_delay
+                    while self._running:
+                        frame = await ws.recv()
+                        await self._on_frame(ws, frame, handler)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:  # noqa: BLE001
+                if self._running:
+                    log.warning("BingX WS %s disconnected: %r; reconnecting in %.1fs", self.ws_url, exc, delay)
+            finally:
+                self._ws = None
+                self.totals.merge(self.stats)
+                self.stats = WSStats()
+            if not self._running:
+                break
+            await asyncio.sleep(delay * (1.0 + 0.2 * random.random()))
+            delay = min(delay * 2.0, self.max_reconnect_delay)
+            self.totals.reconnects += 1
+
+    async def _on_frame(self, ws, frame: Union[str, bytes], handler: Callable[[dict], Awaitable[None]]):
+        stats = self.stats
+        stats.messages += 1
+        stats.bytes += len(frame)
+        t0 = self.last_recv_ns = time.perf_counter_ns()
+        try:
+            if isinstance(frame, bytes) and frame[:2] == b"\x1f\x8b":
+                frame = zlib.decompress(frame, 16 + zlib.MAX_WBITS)
+            data = _PING if frame in ("Ping", b"Ping") else self.decoder(frame)
+        except Exception as exc:  # noqa: BLE001
+            stats.dropped += 1
+            log.debug("BingX WS dropped undecodable frame: %r", exc)
+            return
+        finally:
+            stats.decode_time_ns += time.perf_counter_ns() - t0
+
+        if data is _PING:
+            stats.pings += 1
+            await ws.send("Pong")
+            return
+        if isinstance(data, dict) and "ping" in data:
+            stats.pings += 1
+            await ws.send(json.dumps({"pong": data["ping"]}))
+            return
+        try:
+            await handler(data)
+        except Exception:  # noqa: BLE001
+            stats.handler_errors += 1
+            log.exception("BingX WS handler failed")
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        return {"connection": self.stats.as_dict(), "total": self.totals.as_dict()}
 
     async def stop(self):
         self._running = False
+        if self._ws is not None:
+            await self._ws.close()
@@ -19,9 +19,35 @@ class LegState(BaseModel):
 
 
 class BaseLeg(ABC):
+    state: LegState
+
     def __init__(self, name: str) -> None:
         self.name = name
 
+    def apply_fill(self, side: str, size: float, price: float) -> None:
+        """Исполнение ``size`` по ``price``: по направлению ноги набирает позицию, против — закрывает."""
+        state = self.state
+        opening = "BUY" if state.side == "LONG" else "SELL"
+        if side == opening:
+            total = state.size + size
+            state.entry_price = (state.entry_price * state.size + price * size) / total
+            state.size = total
+            return
+        closed = min(size, state.size)
+        sign = 1.0 if state.side == "LONG" else -1.0
+        state.realized_pnl += sign * (price - state.entry_price) * closed
+        state.size -= closed
+        if state.size <= 0.0:
+            state.size = 0.0
+            state.entry_price = 0.0
+            state.unrealized_pnl = 0.0
+
+    def mark(self, price: float) -> None:
+        """Переоценить открытую позицию ноги по ``price``."""
+        state = self.state
+        sign = 1.0 if state.side == "LONG" else -1.0
+        state.unrealized_pnl = sign * (price - state.entry_price) * state.size if state.size > 0.0 else 0.0
+
     @abstractmethod
     def on_tick(self, ctx: StrategyContext) -> List[ActionIntent]:
         raise NotImplementedError
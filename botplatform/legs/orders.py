@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+from botplatform.core.context import StrategyContext
+from botplatform.core.fills import TERMINAL_STATUSES, fill_delta
+from botplatform.core.models import ActionIntent, OrderUpdate
+from botplatform.legs.base import BaseLeg
+
+log = logging.getLogger("botplatform.legs.orders")
+
+
+@dataclass
+class PendingOrder:
+    leg: str
+    client_id: str
+    created_ms: int
+    filled: float = 0.0
+    avg_price: float = 0.0
+
+
+class LegOrderManager:
+    """Ордера ног в полёте.
+
+    Пока у ноги есть неподтверждённый интент или ордер без финального
+    статуса, её ``on_tick`` не вызывается — повторных интентов на каждом
+    тике нет. Исполнения из ``OrderUpdate`` (``filled_size`` и
+    ``avg_fill_price`` там накопительные) пересчитываются в приращения и
+    передаются в ``BaseLeg.apply_fill``.
+
+    Интент становится ордером, когда рантайм выдал ему ``client_id``
+    (``bind``); если рантайм ордер не выставил, он снимает резерв
+    (``release``). Если не случилось ни того ни другого или ответ биржи
+    потерян, через ``timeout_ms`` по времени тиков нога снова может
+    торговать; поздние исполнения такого ордера всё равно будут учтены.
+    """
+
+    def __init__(self, legs: Iterable[BaseLeg], timeout_ms: int = 30_000) -> None:
+        self.legs: Dict[str, BaseLeg] = {leg.name: leg for leg in legs}
+        self.timeout_ms = timeout_ms
+        # нога -> [время тика, сколько интентов ещё ждут client_id]
+        self._reserved: Dict[str, List[int]] = {}
+        self._orders: Dict[str, PendingOrder] = {}
+        self._open: Dict[str, Dict[str, PendingOrder]] = {name: {} for name in self.legs}
+
+    def in_flight(self, leg: str, now_ms: int) -> bool:
+        reserved = self._reserved.get(leg)
+        if reserved is not None:
+            if now_ms - reserved[0] < self.timeout_ms:
+                return True
+            log.warning("Intent of leg %s was not sent within %d ms", leg, self.timeout_ms)
+            del self._reserved[leg]
+        orders = self._open[leg]
+        return bool(orders) and any(now_ms - o.created_ms < self.timeout_ms for o in orders.values())
+
+    def pending(self, leg: Optional[str] = None) -> List[PendingOrder]:
+        if leg is None:
+            return list(self._orders.values())
+        return list(self._open[leg].values())
+
+    def on_tick(self, ctx: StrategyContext) -> List[ActionIntent]:
+        intents: List[ActionIntent] = []
+        for name, leg in self.legs.items():
+            if self.in_flight(name, ctx.timestamp):
+                continue
+            leg_intents = leg.on_tick(ctx)
+            if not leg_intents:
+                continue
+            for ai in leg_intents:
+                if ai.context is None:
+                    ai.context = {}
+                ai.context.setdefault("leg", name)
+            self._reserved[name] = [ctx.timestamp, len(leg_intents)]
+            intents.extend(leg_intents)
+        return intents
+
+    def bind(self, client_id: str, context: Optional[dict]) -> None:
+        name = (context or {}).get("leg")
+        reserved = self._unreserve(name)
+        if reserved is None:
+            return
+        order = PendingOrder(leg=name, client_id=client_id, created_ms=reserved)
+        self._orders[client_id] = order
+        self._open[name][client_id] = order
+
+    def release(self, context: Optional[dict]) -> None:
+        """Интент ноги не стал ордером: снять резерв, не дожидаясь ``timeout_ms``."""
+        self._unreserve((context or {}).get("leg"))
+
+    def _unreserve(self, name: Optional[str]) -> Optional[int]:
+        """Списать один интент из резерва ноги; время тика резерва или None."""
+        reserved = self._reserved.get(name) if name in self.legs else None
+        if reserved is None:
+            return None
+        reserved[1] -= 1
+        if reserved[1] <= 0:
+            del self._reserved[name]
+        return reserved[0]
+
+    def on_order_update(self, update: OrderUpdate) -> bool:
+        """Учесть обновление; False — ордер не принадлежит ни одной ноге."""
+        order = self._orders.get(update.client_id)
+        if order is None:
+            return False
+        leg = self.legs[order.leg]
+        size, price = fill_delta(update, order.filled, order.avg_price)
+        if size > 0.0 and update.side is not None:
+            leg.apply_fill(update.side, size, price)
+            order.filled = update.filled_size
+            order.avg_price = update.avg_fill_price or 0.0
+        leg.on_order_update(update)
+        if update.status in TERMINAL_STATUSES:
+            del self._orders[update.client_id]
+            del self._open[order.leg][update.client_id]
+        return True
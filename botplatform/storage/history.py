@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+from typing import Dict, NamedTuple, Optional
+
+import numpy as np
+
+from botplatform.core.event_bus import EventBus
+from botplatform.core.events import Event
+from botplatform.core.models import MarketSnapshot
+from botplatform.core.records import trade_volume
+
+
+class TickWindow(NamedTuple):
+    timestamp: np.ndarray
+    price: np.ndarray
+    bid: np.ndarray
+    ask: np.ndarray
+    volume: np.ndarray
+
+
+class TickRingBuffer:
+    """Кольцевой буфер тиков одного символа фиксированной ёмкости.
+
+    Память выделяется один раз. Каждое значение пишется дважды — в ячейки
+    ``i`` и ``i + capacity``, — поэтому последние ``n <= capacity`` тиков всегда
+    лежат непрерывно и ``window(n)`` возвращает view без копирования.
+    View только для чтения и отражает буфер «вживую»: после новых тиков
+    его содержимое сдвигается, для долгого хранения нужен ``.copy()``.
+    """
+
+    def __init__(self, symbol: str, capacity: int) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1")
+        self.symbol = symbol
+        self.capacity = capacity
+        self._ts = np.zeros(2 * capacity, dtype=np.int64)
+        # Строки: price, bid, ask, volume.
+        self._values = np.zeros((4, 2 * capacity), dtype=np.float64)
+        self._head: int = 0
+        self._count: int = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, timestamp: int, price: float, bid: float, ask: float, volume: float) -> None:
+        i = self._head
+        j = i + self.capacity
+        self._ts[i] = self._ts[j] = timestamp
+        values = self._values
+        values[0, i] = values[0, j] = price
+        values[1, i] = values[1, j] = bid
+        values[2, i] = values[2, j] = ask
+        values[3, i] = values[3, j] = volume
+        self._head = (i + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+
+    def window(self, n: Optional[int] = None) -> TickWindow:
+        """Последние ``n`` тиков (по умолчанию все накопленные), от старых к новым."""
+        n = self._count if n is None else min(n, self._count)
+        end = self._head + self.capacity
+        start = end - n
+        ts = self._ts[start:end]
+        rows = self._values[:, start:end]
+        views = (ts, rows[0], rows[1], rows[2], rows[3])
+        for v in views:
+            v.flags.writeable = False
+        return TickWindow(*views)
+
+    def last(self) -> Optional[float]:
+        if not self._count:
+            return None
+        return float(self._values[0, self._head + self.capacity - 1])
+
+
+class MarketHistory:
+    """Общее хранилище истории тиков по символам, наполняется событиями ``market.snapshot``.
+
+    Подписывать на шину нужно до рантаймов стратегий, чтобы к моменту
+    вызова стратегии текущий тик уже был в буфере.
+    """
+
+    def __init__(self, capacity: int = 4096) -> None:
+        self.capacity = capacity
+        self._buffers: Dict[str, TickRingBuffer] = {}
+
+    def subscribe(self, event_bus: EventBus) -> None:
+        event_bus.subscribe("market.snapshot", self._on_market_event)
+
+    def buffer(self, symbol: str) -> TickRingBuffer:
+        buf = self._buffers.get(symbol)
+        if buf is None:
+            buf = self._buffers[symbol] = TickRingBuffer(symbol, self.capacity)
+        return buf
+
+    def get(self, symbol: str) -> Optional[TickRingBuffer]:
+        return self._buffers.get(symbol)
+
+    def append(self, snapshot: MarketSnapshot) -> None:
+        """Принимает ``MarketSnapshot`` или ``MarketRecord`` (одинаковые скалярные поля)."""
+        self.buffer(snapshot.symbol).append(
+            snapshot.timestamp, snapshot.price, snapshot.bid, snapshot.ask, trade_volume(snapshot)
+        )
+
+    async def _on_market_event(self, event: Event) -> None:
+        snapshot = event.data if event.data is not None else event.as_model(MarketSnapshot)
+        self.append(snapshot)
@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import asyncio
+import gzip
+import logging
+import struct
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import BinaryIO, Deque, Dict, Iterator, List, Optional, Tuple
+
+from botplatform.core.event_bus import EventBus
+from botplatform.core.events import Event
+from botplatform.utils import jsonfast
+
+log = logging.getLogger("botplatform.storage.journal")
+
+# Кадр журнала: version:uint8, length:uint32, затем JSON ``[recv_ns, wire]``,
+# где ``wire`` — ``Event.to_wire()``: ``data`` уходит в ``payload``, и при
+# воспроизведении подписчики получают модель через ``Event.as_model``.
+# Кадры другой версии читатель пропускает по длине.
+FRAME_VERSION = 1
+FRAME_HEADER = struct.Struct("<BI")
+Frame = Tuple[int, Dict]
+
+
+class JournalRecorder:
+    """Запись всех событий шины в бинарный журнал с ротацией и сжатием.
+
+    ``attach(bus)`` ставит хук публикации: в event loop событие только
+    кладётся в очередь вместе с моментом получения (``monotonic_ns``; у
+    каждого процесса своя точка отсчёта, поэтому каждый запуск пишет
+    в новые сегменты).
+    Сериализация, сжатие и запись идут в фоновом потоке пачками раз в
+    ``flush_interval`` секунд. Файлы — ``events-000001.jnl[.gz]``; новый
+    сегмент начинается, когда в текущий записано ``rotate_bytes`` байт
+    (до сжатия).
+
+    ``recorded`` — события, действительно записанные в файл; события, которые
+    не удалось сериализовать или записать, считаются в ``lost`` и попадают
+    в лог.
+    """
+
+    def __init__(
+        self,
+        path: Path | str,
+        rotate_bytes: int = 256 << 20,
+        compress: bool = True,
+        flush_interval: float = 0.05,
+    ) -> None:
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.rotate_bytes = rotate_bytes
+        self.compress = compress
+        self.flush_interval = flush_interval
+        self.recorded = 0
+        self.lost = 0
+        self.bytes_written = 0
+        self._queue: Deque[Tuple[int, Event]] = deque()
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._segment = max((segment_index(p) for p in segments(self.path)), default=0)
+        self._file: Optional[BinaryIO] = None
+        self._segment_bytes = 0
+        self._thread = threading.Thread(target=self._run, name="journal-writer", daemon=True)
+        self._thread.start()
+
+    def attach(self, event_bus: EventBus) -> None:
+        event_bus.add_publish_hook(self.record)
+
+    def record(self, event: Event) -> None:
+        self._queue.append((time.monotonic_ns(), event))
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._wakeup.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            closed = self._closed
+            self._write_pending()
+            if closed:
+                if self._file is not None:
+                    self._file.close()
+                    self._file = None
+                return
+
+    def _write_pending(self) -> None:
+        q = self._queue
+        encode = jsonfast.dumps
+        chunks: List[bytes] = []
+        size = 0
+        n = 0
+        skipped = 0
+        error: Optional[Exception] = None
+        try:
+            while q:
+                recv_ns, e = q.popleft()
+                try:
+                    body = encode([recv_ns, e.to_wire()])
+                except Exception as exc:  # noqa: BLE001
+                    skipped += 1
+                    error = exc
+                    continue
+                chunks.append(FRAME_HEADER.pack(FRAME_VERSION, len(body)))
+                chunks.append(body)
+                size += FRAME_HEADER.size + len(body)
+                n += 1
+                if self._segment_bytes + size >= self.rotate_bytes:
+                    self._write(chunks, size)
+                    self.recorded += n
+                    chunks, size, n = [], 0, 0
+                    self._rotate()
+            if chunks:
+                self._write(chunks, size)
+                self.recorded += n
+                n = 0
+        except Exception as exc:  # noqa: BLE001
+            log.error("Journal write failed, %d events lost: %r", n, exc)
+            self.lost += n
+        if skipped:
+            log.error("Journal could not serialize %d events, last error: %r", skipped, error)
+            self.lost += skipped
+
+    def _write(self, chunks: List[bytes], size: int) -> None:
+        if self._file is None:
+            self._rotate()
+        self._file.write(b"".join(chunks))
+        self._file.flush()
+        self._segment_bytes += size
+        self.bytes_written += size
+
+    def _rotate(self) -> None:
+        if self._file is not None:
+            self._file.close()
+        self._segment += 1
+        name = f"events-{self._segment:06d}.jnl" + (".gz" if self.compress else "")
+        path = self.path / name
+        self._file = gzip.open(path, "wb", compresslevel=1) if self.compress else open(path, "wb")
+        self._segment_bytes = 0
+
+
+def segment_index(path: Path) -> int:
+    return int(path.name.split("-")[1].split(".")[0])
+
+
+def segments(path: Path | str) -> List[Path]:
+    return sorted(Path(path).glob("events-*.jnl*"), key=segment_index)
+
+
+def read_frames(path: Path | str) -> Iterator[Frame]:
+    """Кадры всех сегментов журнала по порядку; оборванный хвост сегмента пропускается."""
+    for segment in segments(path):
+        yield from read_segment(segment)
+
+
+def read_segment(segment: Path) -> Iterator[Frame]:
+    decode = jsonfast.loads
+    opener = gzip.open if segment.suffix == ".gz" else open
+    skipped = 0
+    with opener(segment, "rb") as f:
+        try:
+            while True:
+                header = f.read(FRAME_HEADER.size)
+                if len(header) < FRAME_HEADER.size:
+                    break
+                version, length = FRAME_HEADER.unpack(header)
+                body = f.read(length)
+                if len(body) < length:
+                    break
+                if version != FRAME_VERSION:
+                    skipped += 1
+                    continue
+                recv_ns, wire = decode(body)
+                yield recv_ns, wire
+        except (EOFError, gzip.BadGzipFile, ValueError):
+            log.warning("Journal segment %s is truncated", segment.name)
+    if skipped:
+        log.warning("Journal segment %s: %d frames of unknown version skipped", segment.name, skipped)
+
+
+class JournalReplayer:
+    """Воспроизведение журнала в шину.
+
+    ``speed=1.0`` — с исходными интервалами между событиями, ``2.0`` — вдвое
+    быстрее, ``None`` (или 0) — без пауз, насколько позволяет CPU; в этом
+    режиме после каждых ``batch_size`` событий ждём ``join()`` шины, чтобы
+    очереди не росли без предела.
+    Интервалы берутся по моменту получения события шиной при записи.
+    Моменты разных запусков несравнимы, поэтому отсчёт пауз начинается
+    заново с каждого сегмента: теряется только интервал на стыке.
+    """
+
+    def __init__(self, path: Path | str) -> None:
+        self.path = Path(path)
+
+    def events(self) -> Iterator[Tuple[int, Event]]:
+        for recv_ns, wire in read_frames(self.path):
+            yield recv_ns, Event(**wire)
+
+    async def replay(self, event_bus: EventBus, speed: Optional[float] = 1.0, batch_size: int = 1024) -> int:
+        loop = asyncio.get_running_loop()
+        count = 0
+        for segment in segments(self.path):
+            start_ns: Optional[int] = None
+            start_at = 0.0
+            for recv_ns, wire in read_segment(segment):
+                if speed:
+                    if start_ns is None:
+                        start_ns, start_at = recv_ns, loop.time()
+                    delay = start_at + (recv_ns - start_ns) / 1e9 / speed - loop.time()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                await event_bus.publish(Event(**wire))
+                count += 1
+                if not speed and count % batch_size == 0:
+                    await event_bus.join()
+        return count
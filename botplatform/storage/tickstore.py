@@ -0,0 +1,277 @@
+from __future__ import annotations
+
+import mmap
+import struct
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from botplatform.core.event_bus import EventBus
+from botplatform.core.events import Event
+from botplatform.core.models import MarketSnapshot
+from botplatform.core.records import trade_volume
+from botplatform.storage.history import TickWindow
+
+# Формат файла тиков (little-endian, все поля выровнены по 8 байт):
+#   заголовок файла:  magic[8], version:int64
+#   блоки подряд:     first_ts:int64, last_ts:int64, count:int64,
+#                     timestamp:int64[count], price/bid/ask/volume:float64[count] (по колонке)
+# Рядом лежит ``.idx`` — разреженный индекс: по записи на блок
+# (first_ts, last_ts, offset, count). Индекс восстанавливается сканированием
+# заголовков блоков, если он отстал от данных или потерян.
+MAGIC = b"BPTICKS\x00"
+VERSION = 1
+FILE_HEADER = struct.Struct("<8sq")
+BLOCK_HEADER = struct.Struct("<qqq")
+ROW_BYTES = 8 * 5
+INDEX_DTYPE = np.dtype([("first_ts", "<i8"), ("last_ts", "<i8"), ("offset", "<i8"), ("count", "<i8")])
+
+
+def day_of(ts_ms: int) -> str:
+    return datetime.fromtimestamp(ts_ms / 1000.0, tz=timezone.utc).strftime("%Y%m%d")
+
+
+def _index_path(path: Path) -> Path:
+    return path.with_suffix(".idx")
+
+
+def _read_index(path: Path) -> Tuple[np.ndarray, int, bool]:
+    """Индекс блоков файла: (индекс, конец последнего целого блока, был ли индекс неполным)."""
+    size = path.stat().st_size
+    with open(path, "rb") as f:
+        magic, _ = FILE_HEADER.unpack(f.read(FILE_HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a tick file")
+
+        idx_path = _index_path(path)
+        index = np.fromfile(idx_path, dtype=INDEX_DTYPE) if idx_path.exists() else np.empty(0, INDEX_DTYPE)
+        ends = index["offset"] + BLOCK_HEADER.size + index["count"] * ROW_BYTES
+        starts = np.concatenate(([FILE_HEADER.size], ends[:-1]))
+        bad = np.flatnonzero((index["offset"] != starts) | (ends > size) | (index["count"] <= 0))
+        valid = int(bad[0]) if len(bad) else len(index)
+        stale = valid < len(index)
+        index = index[:valid]
+        end = int(ends[valid - 1]) if valid else FILE_HEADER.size
+
+        extra: List[Tuple[int, int, int, int]] = []
+        f.seek(end)
+        while True:
+            raw = f.read(BLOCK_HEADER.size)
+            if len(raw) < BLOCK_HEADER.size:
+                break
+            first_ts, last_ts, count = BLOCK_HEADER.unpack(raw)
+            block_end = end + BLOCK_HEADER.size + count * ROW_BYTES
+            if count <= 0 or block_end > size:
+                break
+            extra.append((first_ts, last_ts, end, count))
+            end = block_end
+            f.seek(end)
+    if extra:
+        index = np.concatenate((index, np.array(extra, dtype=INDEX_DTYPE)))
+    return index, end, stale or bool(extra)
+
+
+class TickFileWriter:
+    """Дозапись тиков одного символа за день в колоночный файл.
+
+    Тики копятся в блок на ``block_size`` строк и пишутся одним ``write``
+    вместе с записью индекса. Метки времени должны не убывать — на этом
+    держится бинарный поиск по индексу. При открытии существующего файла
+    недописанный хвост (обрыв посреди блока) отрезается.
+    """
+
+    def __init__(self, path: Path | str, block_size: int = 4096) -> None:
+        self.path = Path(path)
+        self.block_size = block_size
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._ts = np.empty(block_size, dtype=np.int64)
+        # Строки: price, bid, ask, volume.
+        self._values = np.empty((4, block_size), dtype=np.float64)
+        self._n = 0
+        self._last_ts: Optional[int] = None
+
+        idx_path = _index_path(self.path)
+        if not self.path.exists() or self.path.stat().st_size == 0:
+            with open(self.path, "wb") as f:
+                f.write(FILE_HEADER.pack(MAGIC, VERSION))
+            idx_path.write_bytes(b"")
+        else:
+            index, end, stale = _read_index(self.path)
+            if end < self.path.stat().st_size:
+                with open(self.path, "r+b") as f:
+                    f.truncate(end)
+            if stale:
+                index.tofile(idx_path)
+            if len(index):
+                self._last_ts = int(index["last_ts"][-1])
+        self._data = open(self.path, "ab")
+        self._index = open(idx_path, "ab")
+
+    def __enter__(self) -> "TickFileWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def append(self, timestamp: int, price: float, bid: float, ask: float, volume: float) -> None:
+        if self._last_ts is not None and timestamp < self._last_ts:
+            raise ValueError(f"timestamp {timestamp} is older than last written {self._last_ts}")
+        i = self._n
+        self._ts[i] = timestamp
+        values = self._values
+        values[0, i] = price
+        values[1, i] = bid
+        values[2, i] = ask
+        values[3, i] = volume
+        self._last_ts = timestamp
+        self._n = i + 1
+        if self._n == self.block_size:
+            self.flush()
+
+    def flush(self) -> None:
+        n = self._n
+        if not n:
+            return
+        offset = self._data.tell()
+        first_ts, last_ts = int(self._ts[0]), int(self._ts[n - 1])
+        self._data.write(
+            BLOCK_HEADER.pack(first_ts, last_ts, n) + self._ts[:n].tobytes() + self._values[:, :n].tobytes()
+        )
+        self._data.flush()
+        self._index.write(np.array([(first_ts, last_ts, offset, n)], dtype=INDEX_DTYPE).tobytes())
+        self._index.flush()
+        self._n = 0
+
+    def close(self) -> None:
+        if self._data.closed:
+            return
+        self.flush()
+        self._data.close()
+        self._index.close()
+
+
+class TickFile:
+    """Чтение файла тиков через ``mmap`` без загрузки в память.
+
+    ``read(start_ms, end_ms)`` находит блоки бинарным поиском по индексу и
+    отдаёт полуинтервал ``[start_ms, end_ms)`` кусками по блокам — это
+    ``TickWindow`` из read-only view прямо в отображённый файл. View живы,
+    пока на них есть ссылки, даже после ``close()``.
+    """
+
+    def __init__(self, path: Path | str) -> None:
+        self.path = Path(path)
+        self.index, self._end, _ = _read_index(self.path)
+        with open(self.path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __enter__(self) -> "TickFile":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return int(self.index["count"].sum())
+
+    @property
+    def start_ms(self) -> Optional[int]:
+        return int(self.index["first_ts"][0]) if len(self.index) else None
+
+    @property
+    def end_ms(self) -> Optional[int]:
+        return int(self.index["last_ts"][-1]) if len(self.index) else None
+
+    def block(self, i: int) -> TickWindow:
+        offset = int(self.index["offset"][i]) + BLOCK_HEADER.size
+        n = int(self.index["count"][i])
+        ts = np.frombuffer(self._mm, dtype=np.int64, count=n, offset=offset)
+        rows = np.frombuffer(self._mm, dtype=np.float64, count=4 * n, offset=offset + 8 * n).reshape(4, n)
+        return TickWindow(ts, rows[0], rows[1], rows[2], rows[3])
+
+    def read(self, start_ms: Optional[int] = None, end_ms: Optional[int] = None) -> Iterator[TickWindow]:
+        index = self.index
+        first = int(np.searchsorted(index["last_ts"], start_ms, "left")) if start_ms is not None else 0
+        last = int(np.searchsorted(index["first_ts"], end_ms, "left")) if end_ms is not None else len(index)
+        for i in range(first, last):
+            w = self.block(i)
+            lo = int(np.searchsorted(w.timestamp, start_ms, "left")) if start_ms is not None and i == first else 0
+            hi = int(np.searchsorted(w.timestamp, end_ms, "left")) if end_ms is not None and i == last - 1 else len(w.timestamp)
+            if lo < hi:
+                yield TickWindow(*(col[lo:hi] for col in w))
+
+    def close(self) -> None:
+        try:
+            self._mm.close()
+        except BufferError:
+            pass  # есть живые view: отображение освободится вместе с ними
+
+
+class TickStore:
+    """Каталог файлов тиков: ``<root>/<symbol>/<YYYYMMDD>.ticks`` (день по UTC).
+
+    ``subscribe(bus)`` пишет все ``market.snapshot`` в файлы, ``read`` отдаёт
+    диапазон времени по символу, проходя дневные файлы по порядку.
+    """
+
+    SUFFIX = ".ticks"
+
+    def __init__(self, root: Path | str, block_size: int = 4096) -> None:
+        self.root = Path(root)
+        self.block_size = block_size
+        self._writers: Dict[Tuple[str, str], TickFileWriter] = {}
+
+    def path(self, symbol: str, day: str) -> Path:
+        return self.root / symbol / f"{day}{self.SUFFIX}"
+
+    def days(self, symbol: str) -> List[str]:
+        folder = self.root / symbol
+        if not folder.is_dir():
+            return []
+        return sorted(p.stem for p in folder.glob(f"*{self.SUFFIX}"))
+
+    def writer(self, symbol: str, day: str) -> TickFileWriter:
+        key = (symbol, day)
+        w = self._writers.get(key)
+        if w is None:
+            # Новый день: предыдущие файлы символа больше не пополняются.
+            for old in [k for k in self._writers if k[0] == symbol]:
+                self._writers.pop(old).close()
+            w = self._writers[key] = TickFileWriter(self.path(symbol, day), self.block_size)
+        return w
+
+    def append(self, snapshot: MarketSnapshot) -> None:
+        """Принимает ``MarketSnapshot`` или ``MarketRecord``."""
+        self.writer(snapshot.symbol, day_of(snapshot.timestamp)).append(
+            snapshot.timestamp, snapshot.price, snapshot.bid, snapshot.ask, trade_volume(snapshot)
+        )
+
+    def subscribe(self, event_bus: EventBus) -> None:
+        event_bus.subscribe("market.snapshot", self._on_market_event)
+
+    async def _on_market_event(self, event: Event) -> None:
+        snapshot = event.data if event.data is not None else event.as_model(MarketSnapshot)
+        self.append(snapshot)
+
+    def flush(self) -> None:
+        for w in self._writers.values():
+            w.flush()
+
+    def close(self) -> None:
+        for w in self._writers.values():
+            w.close()
+        self._writers.clear()
+
+    def read(self, symbol: str, start_ms: Optional[int] = None, end_ms: Optional[int] = None) -> Iterator[TickWindow]:
+        first_day = day_of(start_ms) if start_ms is not None else None
+        last_day = day_of(end_ms - 1) if end_ms is not None else None
+        for day in self.days(symbol):
+            if (first_day and day < first_day) or (last_day and day > last_day):
+                continue
+            tick_file = TickFile(self.path(symbol, day))
+            try:
+                yield from tick_file.read(start_ms, end_ms)
+            finally:
+                tick_file.close()
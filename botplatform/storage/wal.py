@@ -0,0 +1,264 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import struct
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
+
+from botplatform.storage.storage import BaseStorage
+
+log = logging.getLogger("botplatform.storage.wal")
+
+# Запись журнала: length:uint32, crc32:uint32, затем JSON {"q": seq, "k": key, "s": state}.
+RECORD_HEADER = struct.Struct("<II")
+
+
+class WALStorage(BaseStorage):
+    """Хранилище состояний на журнале предзаписи (WAL) со снапшотами.
+
+    ``save_state`` только обновляет словарь в памяти и ставит запись в
+    очередь — event loop не ждёт диска. Фоновый поток забирает всё
+    накопленное разом, пишет одним ``write`` и делает один ``fsync`` на
+    пачку (group commit); ``commit_delay`` — сколько подождать, чтобы пачка
+    набралась. ``flush()`` блокирует до записи всего поставленного.
+
+    Если ``write`` или ``fsync`` упали, журнал обрезается до конца последней
+    подтверждённой пачки, а пачка возвращается в очередь и пишется снова с
+    паузой от ``retry_delay`` до ``max_retry_delay`` секунд. Пока запись не
+    удалась, ``flush()`` поднимает последнюю ошибку записи.
+
+    Когда журнал превышает ``compact_bytes``, состояние целиком пишется в
+    ``snapshot.json`` (через временный файл и атомарный rename), а журнал
+    начинается заново. Каждая запись несёт номер ``seq``; снапшот хранит
+    последний учтённый номер, поэтому записи старого журнала, пережившие
+    сбой во время компакции, при восстановлении пропускаются.
+
+    При открытии читаются снапшот и хвост журнала; оборванная или битая
+    последняя запись отрезается.
+    """
+
+    LOG_NAME = "wal.log"
+    SNAPSHOT_NAME = "snapshot.json"
+
+    def __init__(
+        self,
+        path: Path | str,
+        commit_delay: float = 0.002,
+        compact_bytes: int = 4 << 20,
+        retry_delay: float = 0.05,
+        max_retry_delay: float = 5.0,
+    ) -> None:
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.commit_delay = commit_delay
+        self.compact_bytes = compact_bytes
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self._data: Dict[str, Dict[str, Any]] = {}
+        self._seq = 0
+        self._pending: List[bytes] = []
+        self._written_seq = 0
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._durable = threading.Condition(self._lock)
+        self._closed = False
+        self._error: Optional[OSError] = None
+        self.commits = 0
+        self.compactions = 0
+        self.write_errors = 0
+
+        self._recover()
+        self._log: Optional[BinaryIO] = open(self.path / self.LOG_NAME, "ab")
+        # Конец последней записанной с fsync пачки: до него журнал цел.
+        self._good = self._log.tell()
+        self._writer = threading.Thread(target=self._run, name="wal-writer", daemon=True)
+        self._writer.start()
+
+    # --- BaseStorage ---
+
+    def save_state(self, key: str, state: Dict[str, Any]) -> None:
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("WALStorage is closed")
+            self._seq += 1
+            self._data[key] = state
+            payload = json.dumps({"q": self._seq, "k": key, "s": state}, separators=(",", ":")).encode()
+            self._pending.append(RECORD_HEADER.pack(len(payload), zlib.crc32(payload)) + payload)
+            self._wakeup.notify()
+
+    def load_state(self, key: str) -> Dict[str, Any] | None:
+        return self._data.get(key)
+
+    def keys(self) -> List[str]:
+        return list(self._data)
+
+    # --- запись ---
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Дождаться fsync всех поставленных записей; при сбое записи — поднять ``OSError``."""
+        with self._lock:
+            target = self._seq
+            self._durable.wait_for(
+                lambda: self._written_seq >= target or self._error is not None or self._closed, timeout
+            )
+            if self._written_seq >= target:
+                return True
+            if self._error is not None:
+                raise self._error
+            return False
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._wakeup.notify()
+        self._writer.join()
+        if self._log is not None:
+            self._log.close()
+
+    def _run(self) -> None:
+        delay = self.retry_delay
+        while True:
+            with self._lock:
+                self._wakeup.wait_for(lambda: self._pending or self._closed)
+                if not self._pending and self._closed:
+                    self._durable.notify_all()
+                    return
+            if self.commit_delay > 0 and not self._closed:
+                # Даём пачке набраться: несколько save_state подряд — один fsync.
+                time.sleep(self.commit_delay)
+            with self._lock:
+                batch, self._pending = self._pending, []
+                seq = self._seq
+            try:
+                self._write(b"".join(batch))
+            except OSError as exc:
+                if not self._failed(batch, exc, delay):
+                    return
+                delay = min(delay * 2, self.max_retry_delay)
+                continue
+            delay = self.retry_delay
+            with self._lock:
+                self._written_seq = seq
+                self._error = None
+                self._durable.notify_all()
+            if self._good >= self.compact_bytes:
+                try:
+                    self._compact()
+                except OSError as exc:
+                    # Пачка уже на диске; компакция повторится после следующей.
+                    log.error("WAL compaction failed: %r", exc)
+                    self._discard_log()
+                    self._good = self._log_size()
+
+    def _write(self, data: bytes) -> None:
+        if self._log is None:
+            # После сбоя: отрезать то, что могло дописаться, и открыть заново.
+            os.truncate(self.path / self.LOG_NAME, self._good)
+            self._log = open(self.path / self.LOG_NAME, "ab")
+        self._log.write(data)
+        self._log.flush()
+        os.fsync(self._log.fileno())
+        self._good = self._log.tell()
+        self.commits += 1
+
+    def _failed(self, batch: List[bytes], exc: OSError, delay: float) -> bool:
+        """Вернуть пачку в очередь после сбоя; False — хранилище закрыто и писать дальше некуда."""
+        log.error("WAL write of %d records failed: %r", len(batch), exc)
+        self.write_errors += 1
+        self._discard_log()
+        with self._lock:
+            self._error = exc
+            self._pending = batch + self._pending
+            self._durable.notify_all()
+            if self._closed:
+                log.error("WAL closed with %d unwritten records", len(self._pending))
+                return False
+            self._wakeup.wait_for(lambda: self._closed, delay)
+        return True
+
+    def _discard_log(self) -> None:
+        if self._log is None:
+            return
+        try:
+            self._log.close()
+        except OSError:
+            pass
+        self._log = None
+
+    def _log_size(self) -> int:
+        try:
+            return (self.path / self.LOG_NAME).stat().st_size
+        except OSError:
+            return 0
+
+    def _compact(self) -> None:
+        with self._lock:
+            data = dict(self._data)
+            seq = self._seq
+        tmp = self.path / (self.SNAPSHOT_NAME + ".tmp")
+        with open(tmp, "wb") as f:
+            f.write(json.dumps({"seq": seq, "data": data}, separators=(",", ":")).encode())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path / self.SNAPSHOT_NAME)
+        self._discard_log()
+        self._log = open(self.path / self.LOG_NAME, "wb")
+        self._good = 0
+        self._fsync_dir()
+        self.compactions += 1
+
+    def _fsync_dir(self) -> None:
+        try:
+            fd = os.open(self.path, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    # --- восстановление ---
+
+    def _recover(self) -> None:
+        snapshot_seq = 0
+        snapshot = self.path / self.SNAPSHOT_NAME
+        if snapshot.exists():
+            body = json.loads(snapshot.read_bytes())
+            snapshot_seq = int(body["seq"])
+            self._data = body["data"]
+        log_path = self.path / self.LOG_NAME
+        records, valid_end = self._read_log(log_path)
+        for seq, key, state in records:
+            if seq > snapshot_seq:
+                self._data[key] = state
+        self._seq = max([snapshot_seq] + [r[0] for r in records])
+        self._written_seq = self._seq
+        if log_path.exists() and valid_end < log_path.stat().st_size:
+            log.warning("Truncating torn WAL tail at %d bytes", valid_end)
+            with open(log_path, "r+b") as f:
+                f.truncate(valid_end)
+
+    @staticmethod
+    def _read_log(path: Path) -> Tuple[List[Tuple[int, str, Dict[str, Any]]], int]:
+        if not path.exists():
+            return [], 0
+        raw = path.read_bytes()
+        records: List[Tuple[int, str, Dict[str, Any]]] = []
+        pos = 0
+        while pos + RECORD_HEADER.size <= len(raw):
+            length, crc = RECORD_HEADER.unpack_from(raw, pos)
+            start = pos + RECORD_HEADER.size
+            payload = raw[start:start + length]
+            if len(payload) < length or zlib.crc32(payload) != crc:
+                break
+            rec = json.loads(payload)
+            records.append((int(rec["q"]), rec["k"], rec["s"]))
+            pos = start + length
+        return records, pos
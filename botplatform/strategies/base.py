@@ -1,22 +1,37 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Iterable, List, Optional, Tuple
 
 from botplatform.core.context import StrategyContext
 from botplatform.core.models import ActionIntent, OrderUpdate
+from botplatform.legs.base import BaseLeg
 
 
 class BaseStrategy(ABC):
     name: str
+    # Символы, тики которых нужны стратегии; None — все символы.
+    symbols: Optional[Tuple[str, ...]]
 
-    def __init__(self, name: str) -> None:
+    def __init__(self, name: str, symbols: Iterable[str] | None = None) -> None:
         self.name = name
+        self.symbols = tuple(symbols) if symbols is not None else None
 
     @abstractmethod
     def on_tick(self, ctx: StrategyContext) -> List[ActionIntent]:
         raise NotImplementedError
 
+    def legs(self) -> List[BaseLeg]:
+        return []
+
+    def bind_order(self, client_id: str, context: Optional[dict]) -> None:
+        """Рантайм выдал ``client_id`` интенту с этим ``context``."""
+        return
+
+    def release_intent(self, context: Optional[dict]) -> None:
+        """Рантайм не выставил ордер по интенту с этим ``context``."""
+        return
+
     def on_order_update(self, update: OrderUpdate) -> None:
         return
 
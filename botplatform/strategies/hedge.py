@@ -1,26 +1,49 @@
 from __future__ import annotations
 
-from typing import List
+from typing import List, Optional
 
 from botplatform.core.context import StrategyContext
 from botplatform.core.models import ActionIntent, OrderUpdate
 from botplatform.strategies.base import BaseStrategy
+from botplatform.legs.base import BaseLeg, LegState
 from botplatform.legs.long_leg import LongLeg
+from botplatform.legs.orders import LegOrderManager
 from botplatform.legs.short_leg import ShortLeg
 
 
 class HedgeStrategy(BaseStrategy):
     def __init__(self, symbol: str, base_size: float = 0.001) -> None:
-        super().__init__(name=f"hedge-{symbol}")
+        super().__init__(name=f"hedge-{symbol}", symbols=(symbol,))
         self.symbol = symbol
         self.long_leg = LongLeg(name=f"{self.name}.long", base_size=base_size)
         self.short_leg = ShortLeg(name=f"{self.name}.short", base_size=base_size)
+        self.orders = LegOrderManager(self.legs())
+
+    def legs(self) -> List[BaseLeg]:
+        return [self.long_leg, self.short_leg]
 
     def on_tick(self, ctx: StrategyContext) -> List[ActionIntent]:
-        intents: List[ActionIntent] = []
-        intents.extend(self.long_leg.on_tick(ctx))
-        intents.extend(self.short_leg.on_tick(ctx))
-        return intents
+        if ctx.symbol != self.symbol:
+            return []
+        return self.orders.on_tick(ctx)
+
+    def bind_order(self, client_id: str, context: Optional[dict]) -> None:
+        self.orders.bind(client_id, context)
+
+    def release_intent(self, context: Optional[dict]) -> None:
+        self.orders.release(context)
 
     def on_order_update(self, update: OrderUpdate) -> None:
-        return
+        self.orders.on_order_update(update)
+
+    def get_state(self) -> dict:
+        return {
+            "long": self.long_leg.get_state().dict(),
+            "short": self.short_leg.get_state().dict(),
+        }
+
+    def load_state(self, state: dict) -> None:
+        if "long" in state:
+            self.long_leg.load_state(LegState(**state["long"]))
+        if "short" in state:
+            self.short_leg.load_state(LegState(**state["short"]))
@@ -0,0 +1,21 @@
+"""JSON через orjson, если он установлен, иначе через stdlib ``json``.
+
+``dumps`` отдаёт компактный JSON в bytes, ``loads`` принимает str или bytes.
+"""
+from __future__ import annotations
+
+import json
+from typing import Any
+
+try:  # optional: orjson заметно быстрее stdlib json
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+def _dumps(obj: Any) -> bytes:
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+
+dumps = orjson.dumps if orjson is not None else _dumps
+loads = orjson.loads if orjson is not None else json.loads
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import time
+from typing import Dict, List, Optional
+
+now_ns = time.perf_counter_ns
+
+
+class LatencyHistogram:
+    """Гистограмма задержек в наносекундах в стиле HDR.
+
+    Значения до ``2**precision`` хранятся точно, дальше каждая октава делится
+    на ``2**(precision-1)`` корзин, так что относительная погрешность не
+    больше ``2**-(precision-1)`` (≈1.6% при ``precision=7``) во всём
+    диапазоне int64. Запись — O(1) без аллокаций.
+    """
+
+    __slots__ = ("precision", "_m", "_half", "_counts", "count", "total", "min", "max")
+
+    def __init__(self, precision: int = 7) -> None:
+        self.precision = precision
+        self._m = 1 << precision
+        self._half = self._m >> 1
+        self._counts: List[int] = [0] * (self._m + (64 - precision) * self._half)
+        self.count = 0
+        self.total = 0
+        self.min: Optional[int] = None
+        self.max: Optional[int] = None
+
+    def _index(self, value: int) -> int:
+        if value < self._m:
+            return value
+        shift = value.bit_length() - self.precision
+        return self._m + (shift - 1) * self._half + ((value >> shift) - self._half)
+
+    def _upper(self, idx: int) -> int:
+        """Верхняя граница значений корзины ``idx``."""
+        if idx < self._m:
+            return idx
+        shift, top = divmod(idx - self._m, self._half)
+        shift += 1
+        return ((top + self._half + 1) << shift) - 1
+
+    def record(self, value: int) -> None:
+        if value < 0:
+            value = 0
+        self._counts[self._index(value)] += 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def percentile(self, q: float) -> int:
+        """Значение ``q``-го перцентиля (0..100), нс; оценка сверху в пределах точности."""
+        if not self.count:
+            return 0
+        rank = max(1, int(q / 100.0 * self.count + 0.5))
+        seen = 0
+        for idx, c in enumerate(self._counts):
+            if c:
+                seen += c
+                if seen >= rank:
+                    return min(self._upper(idx), self.max)
+        return self.max or 0
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        if other.precision != self.precision:
+            raise ValueError("histogram precision mismatch")
+        for i, c in enumerate(other._counts):
+            if c:
+                self._counts[i] += c
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        if other.max is not None and (self.max is None or other.max > self.max):
+            self.max = other.max
+
+    def reset(self) -> None:
+        self._counts = [0] * len(self._counts)
+        self.count = 0
+        self.total = 0
+        self.min = self.max = None
+
+    def summary(self) -> Dict[str, float]:
+        """Сводка в микросекундах."""
+        if not self.count:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "min": self.min / 1000.0,
+            "mean": self.total / self.count / 1000.0,
+            "p50": self.percentile(50) / 1000.0,
+            "p90": self.percentile(90) / 1000.0,
+            "p99": self.percentile(99) / 1000.0,
+            "p999": self.percentile(99.9) / 1000.0,
+            "max": self.max / 1000.0,
+        }
+
+
+class LatencyRecorder:
+    """Набор гистограмм по стадиям конвейера.
+
+    Стадии тракта «тик → ордер» пишутся двумя способами:
+    ``since(stage, origin_ns)`` — сколько прошло от получения тика
+    (``Event.ingest_ns``) до стадии, ``record(stage, ns)`` — длительность
+    самой стадии. Все метки — ``time.perf_counter_ns()``.
+    ``enabled = False`` отключает запись.
+    """
+
+    def __init__(self, precision: int = 7) -> None:
+        self.precision = precision
+        self.enabled = True
+        self._stages: Dict[str, LatencyHistogram] = {}
+
+    def stage(self, name: str) -> LatencyHistogram:
+        hist = self._stages.get(name)
+        if hist is None:
+            hist = self._stages[name] = LatencyHistogram(self.precision)
+        return hist
+
+    def record(self, name: str, ns: int) -> None:
+        if self.enabled:
+            self.stage(name).record(ns)
+
+    def since(self, name: str, origin_ns: Optional[int]) -> None:
+        if self.enabled and origin_ns is not None:
+            self.stage(name).record(now_ns() - origin_ns)
+
+    def stages(self) -> List[str]:
+        return list(self._stages)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        return {name: hist.summary() for name, hist in self._stages.items()}
+
+    def reset(self) -> None:
+        for hist in self._stages.values():
+            hist.reset()
+
+    def format_table(self) -> str:
+        """Сводка по стадиям в виде текстовой таблицы (мкс)."""
+        columns = ("count", "mean", "p50", "p90", "p99", "p999", "max")
+        width = max([len("stage")] + [len(n) for n in self._stages])
+        lines = ["stage".ljust(width) + "".join(c.rjust(11) for c in columns)]
+        for name, hist in self._stages.items():
+            s = hist.summary()
+            cells = [f"{s.get(c, 0):.0f}" if c == "count" else f"{s.get(c, 0.0):.1f}" for c in columns]
+            lines.append(name.ljust(width) + "".join(v.rjust(11) for v in cells))
+        return "\n".join(lines)
+
+
+# Общий реестр задержек процесса, по аналогии с логгерами.
+LATENCY = LatencyRecorder()
@@ -4,8 +4,11 @@ import asyncio
 
 from botplatform.core.event_bus import EventBus
 from botplatform.engines.fake_market import FakeMarketEngine
+from botplatform.engines.signals_indicators import IndicatorSignalsEngine
 from botplatform.engines.strategy_runtime import StrategyRuntime
 from botplatform.exchanges.mock import MockExchange
+from botplatform.storage.history import MarketHistory
+from botplatform.utils.latency import LATENCY
 from botplatform.utils.logging import configure_logging
 
 
@@ -16,10 +19,19 @@ async def app() -> None:
     event_bus = EventBus()
     exchange = MockExchange()
     market = FakeMarketEngine(event_bus=event_bus, symbols=symbols, interval_ms=500, mode="sine")
-    runtime = StrategyRuntime(event_bus=event_bus, exchange=exchange, symbols=symbols)
+    history = MarketHistory(capacity=4096)
+    history.subscribe(event_bus)
+    runtime = StrategyRuntime(
+        event_bus=event_bus,
+        exchange=exchange,
+        symbols=symbols,
+        history=history,
+        signals=IndicatorSignalsEngine(),
+    )
 
     logger.info("Starting BotPlatform demo runtime...")
     await event_bus.start()
+    await runtime.start()
     await market.start()
 
     try:
@@ -27,7 +39,9 @@ async def app() -> None:
     finally:
         logger.info("Stopping...")
         await market.stop()
+        await runtime.stop()
         await event_bus.stop()
+        logger.info("Latency by stage, us:\n%s", LATENCY.format_table())
         logger.info("Demo finished.")
 
 
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import asyncio
+
+from botplatform.engines.backtest import random_walk_ticks, run_backtest
+from botplatform.utils.logging import configure_logging
+
+
+async def app() -> None:
+    logger = configure_logging("botplatform.backtest")
+    symbols = ["BTCUSDT"]
+    ticks = random_walk_ticks(symbols, n_ticks=20_000, seed=42)
+
+    logger.info("Running backtest...")
+    report = await run_backtest(symbols, ticks)
+    logger.info(
+        "Backtest done: %d ticks in %.2fs (%.0f ticks/s), realized PnL %.4f",
+        report.ticks,
+        report.wall_seconds,
+        report.ticks_per_sec,
+        report.realized_pnl,
+    )
+    for symbol, pos in report.positions.items():
+        logger.info("%s: %s %.4f @ %.4f", symbol, pos.side, pos.size, pos.entry_price)
+
+
+if __name__ == "__main__":
+    asyncio.run(app())
@@ -8,6 +8,7 @@ from botplatform.engines.bingx_market import BingXMarketEngine
 from botplatform.engines.strategy_runtime_bingx import BingXStrategyRuntime
 from botplatform.exchanges.bingx.rest import BingXRest
 from botplatform.exchanges.bingx.adapter import BingXExchangeAdapter
+from botplatform.utils.latency import LATENCY
 
 import config_bingx_example as cfg
 
@@ -24,13 +25,17 @@ async def app():
     runtime = BingXStrategyRuntime(bus, exchange, symbols)
 
     await bus.start()
+    await runtime.start()
     task = asyncio.create_task(market.start())
 
     await asyncio.sleep(15)
 
     await market.stop()
+    await runtime.stop()
     await bus.stop()
+    await rest.close()
     task.cancel()
+    log.info("Latency by stage, us:\n%s", LATENCY.format_table())
 
 if __name__ == "__main__":
     asyncio.run(app())
@@ -0,0 +1,30 @@
+"""Фабрики моделей для тестов: ``from tests.factories import intent, update``."""
+from __future__ import annotations
+
+from typing import Optional
+
+from botplatform.core.context import StrategyContext
+from botplatform.core.models import MarketSnapshot, OrderIntent, OrderUpdate
+
+
+def intent(client_id: str, strategy: str = "test", symbol: str = "BTCUSDT") -> OrderIntent:
+    """Рыночная покупка 1.0 от стратегии ``strategy``."""
+    return OrderIntent(
+        symbol=symbol, side="BUY", type="MARKET", size=1.0,
+        client_id=client_id, source="test", context={"strategy": strategy},
+    )
+
+
+def update(client_id: str, status: str, filled: float = 0.0, avg: Optional[float] = None,
+           order_id: str = "o1", symbol: str = "BTCUSDT", side: str = "BUY", ts: int = 0) -> OrderUpdate:
+    """Состояние ордера размером 1.0 с накопленным исполнением ``filled``."""
+    return OrderUpdate(
+        order_id=order_id, client_id=client_id, symbol=symbol, side=side, status=status,
+        filled_size=filled, remaining_size=1.0 - filled, avg_fill_price=avg, timestamp=ts, raw={},
+    )
+
+
+def ctx(ts: int, symbol: str = "BTCUSDT", price: float = 100.0) -> StrategyContext:
+    market = MarketSnapshot(symbol=symbol, price=price, bid=price - 0.5, ask=price + 0.5,
+                            bids=[], asks=[], trades=[], timestamp=ts)
+    return StrategyContext(symbol=symbol, market=market, timestamp=ts)
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import asyncio
+from typing import List, Tuple
+
+from botplatform.core.clock import SimulatedClock
+from botplatform.core.event_bus import EventBus
+from botplatform.core.events import Event
+from botplatform.core.models import OrderUpdate
+from botplatform.engines.backtest import BacktestEngine, random_walk_ticks, run_backtest
+from botplatform.engines.signals_indicators import IndicatorSignalsEngine
+from botplatform.engines.strategy_runtime import StrategyRuntime
+from botplatform.exchanges.mock import MockExchange
+from botplatform.storage.history import MarketHistory
+
+SYMBOLS = ["BTCUSDT", "ETHUSDT"]
+
+
+def fills(seed: int) -> List[Tuple]:
+    """Исполнения прогона без ``client_id``: он уникален для процесса, а не для прогона."""
+
+    async def run() -> List[Tuple]:
+        clock = SimulatedClock()
+        bus = EventBus()
+        engine = BacktestEngine(bus, clock, random_walk_ticks(SYMBOLS, 1_000, seed=seed, volatility=0.01))
+        exchange = MockExchange(price_provider=engine.price, clock=clock)
+        history = MarketHistory()
+        history.subscribe(bus)
+        runtime = StrategyRuntime(
+            event_bus=bus,
+            exchange=exchange,
+            symbols=SYMBOLS,
+            history=history,
+            signals=IndicatorSignalsEngine(),
+            clock=clock,
+            reconcile_interval=0.0,
+            per_symbol=True,
+        )
+        seen: List[Tuple] = []
+
+        async def on_update(event: Event) -> None:
+            u = event.as_model(OrderUpdate)
+            seen.append((u.timestamp, u.symbol, u.side, u.status, u.filled_size, u.avg_fill_price))
+
+        bus.subscribe("order.update", on_update)
+        await bus.start()
+        await runtime.start()
+        try:
+            await engine.run()
+        finally:
+            await runtime.stop()
+            await bus.stop()
+        return seen
+
+    return asyncio.run(run())
+
+
+def test_same_seed_gives_same_fills() -> None:
+    first = fills(seed=3)
+    assert first
+    assert fills(seed=3) == first
+    assert fills(seed=4) != first
+
+
+def test_same_seed_gives_same_report() -> None:
+    def report(seed: int):
+        r = asyncio.run(run_backtest(SYMBOLS, random_walk_ticks(SYMBOLS, 500, seed=seed)))
+        return r.ticks, r.start_ms, r.end_ms, r.positions
+
+    assert report(5) == report(5)
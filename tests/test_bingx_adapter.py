@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import asyncio
+from typing import List
+
+from botplatform.core.clock import SimulatedClock
+from botplatform.exchanges.bingx.adapter import BingXExchangeAdapter
+
+
+class OrderRest:
+    """Заглушка ``BingXRest``: ``get_order`` отдаёт заданные состояния ордера по очереди."""
+
+    def __init__(self, *orders: dict) -> None:
+        self.clock = SimulatedClock(1_000)
+        self.orders: List[dict] = list(orders)
+
+    async def get_order(self, symbol: str, client_id: str) -> dict:
+        order = self.orders.pop(0) if len(self.orders) > 1 else self.orders[0]
+        return {"code": 0, "data": {"order": {"orderId": 7, "side": "BUY", "origQty": "1.0", **order}}}
+
+
+def position_size(adapter: BingXExchangeAdapter) -> float:
+    positions = asyncio.run(adapter.get_positions(["BTCUSDT"]))
+    return positions["BTCUSDT"].size if "BTCUSDT" in positions else 0.0
+
+
+def test_get_order_does_not_touch_the_ledger() -> None:
+    adapter = BingXExchangeAdapter(OrderRest({"status": "FILLED", "executedQty": "1.0", "avgPrice": "100"}))
+    for _ in range(3):
+        assert asyncio.run(adapter.get_order("BTCUSDT", "a")).status == "FILLED"
+    assert position_size(adapter) == 0.0
+
+
+def test_cumulative_updates_are_applied_once() -> None:
+    adapter = BingXExchangeAdapter(OrderRest(
+        {"status": "PARTIALLY_FILLED", "executedQty": "0.4", "avgPrice": "100"},
+        {"status": "PARTIALLY_FILLED", "executedQty": "0.4", "avgPrice": "100"},
+        {"status": "FILLED", "executedQty": "1.0", "avgPrice": "106"},
+    ))
+    for _ in range(3):
+        adapter.apply_update(asyncio.run(adapter.get_order("BTCUSDT", "a")))
+
+    positions = asyncio.run(adapter.get_positions(["BTCUSDT"]))
+    assert abs(positions["BTCUSDT"].size - 1.0) < 1e-12
+    assert abs(positions["BTCUSDT"].entry_price - 106.0) < 1e-9
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import asyncio
+
+from botplatform.core.event_bus import EventBus
+from botplatform.engines.bingx_orderbook import BingXOrderBookEngine
+
+
+class FlakyDepth:
+    def __init__(self, failures: int, snapshot: dict) -> None:
+        self.failures = failures
+        self.snapshot = snapshot
+        self.calls = 0
+
+    async def get_depth(self, symbol: str, limit: int = 100) -> dict:
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise ConnectionError("depth endpoint down")
+        return self.snapshot
+
+
+def msg(action: str, update_id: int, first: int | None = None, bid: float = 100.0) -> dict:
+    data = {"symbol": "BTC-USDT", "action": action, "lastUpdateId": update_id,
+            "bids": [[bid, 1.0]], "asks": [[bid + 1, 1.0]], "T": update_id}
+    if first is not None:
+        data["firstUpdateId"] = first
+    return {"data": data}
+
+
+def engine(rest: FlakyDepth, **kwargs) -> BingXOrderBookEngine:
+    return BingXOrderBookEngine(EventBus(), "ws://unused", ["BTC-USDT"], rest=rest,
+                                resync_delay=0.001, max_resync_delay=0.004, **kwargs)
+
+
+def test_failed_resync_is_retried_until_the_book_recovers() -> None:
+    async def run() -> None:
+        rest = FlakyDepth(failures=3, snapshot={"bids": [[99.0, 2.0]], "asks": [[101.0, 2.0]], "lastUpdateId": 5})
+        e = engine(rest)
+        await e._on_msg(msg("all", 1))
+        await e._on_msg(msg("update", 6, first=6))  # разрыв: ждали 2
+        await e._on_msg(msg("update", 7, first=7))
+        await asyncio.wait_for(e._resync_tasks["BTC-USDT"], 1.0)
+        book = e.books["BTC-USDT"]
+        assert rest.calls == 4
+        assert book.synced and book.last_update_id == 7
+        assert "BTC-USDT" not in e._pending
+
+    asyncio.run(run())
+
+
+def test_pending_buffer_is_capped() -> None:
+    async def run() -> None:
+        rest = FlakyDepth(failures=10**9, snapshot={})
+        e = engine(rest, max_pending=3)
+        await e._on_msg(msg("all", 1))
+        for i in range(10, 30):
+            await e._on_msg(msg("update", i, first=i))
+        assert len(e._pending["BTC-USDT"]) <= 3
+        assert e.overflows > 0
+        await e._on_msg(msg("all", 100))
+        assert e.books["BTC-USDT"].synced
+        assert "BTC-USDT" not in e._pending and not e._resync_tasks
+
+    asyncio.run(run())
+
+
+def levels(e: BingXOrderBookEngine) -> dict:
+    prices, sizes = e.books["BTC-USDT"].bids.top(10)
+    return dict(zip(prices.tolist(), sizes.tolist()))
+
+
+def test_resync_without_update_id_drops_diffs_older_than_snapshot() -> None:
+    async def run() -> None:
+        rest = FlakyDepth(failures=0, snapshot={"bids": [[100.0, 3.0]], "asks": [[101.0, 3.0]], "T": 6})
+        e = engine(rest)
+        await e._on_msg(msg("all", 1))
+        await e._on_msg(msg("update", 6, first=6))  # разрыв; уже учтён в снимке
+        await e._on_msg(msg("update", 7, first=7, bid=98.0))
+        await asyncio.wait_for(e._resync_tasks["BTC-USDT"], 1.0)
+        book = e.books["BTC-USDT"]
+        assert book.synced and book.last_update_id == 7
+        assert levels(e) == {100.0: 3.0, 98.0: 1.0}
+
+    asyncio.run(run())
+
+
+def test_resync_without_update_id_or_time_uses_snapshot_only() -> None:
+    async def run() -> None:
+        rest = FlakyDepth(failures=0, snapshot={"bids": [[100.0, 3.0]], "asks": [[101.0, 3.0]]})
+        e = engine(rest)
+        await e._on_msg(msg("all", 1))
+        await e._on_msg(msg("update", 6, first=6))
+        await e._on_msg(msg("update", 7, first=7, bid=98.0))
+        await asyncio.wait_for(e._resync_tasks["BTC-USDT"], 1.0)
+        assert levels(e) == {100.0: 3.0}
+
+        # Следующий инкремент из потока ложится на снимок без разрыва.
+        await e._on_msg(msg("update", 8, first=8, bid=97.0))
+        assert e.books["BTC-USDT"].last_update_id == 8
+        assert levels(e) == {100.0: 3.0, 97.0: 1.0}
+
+    asyncio.run(run())
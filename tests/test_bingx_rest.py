@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import hmac
+import json
+
+import aiohttp
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from botplatform.core.clock import SimulatedClock
+from botplatform.exchanges.bingx.rest import BingXRest
+
+SECRET = "secret"
+
+
+class StandIn:
+    """Локальная замена API BingX: отвечает как биржа и запоминает запросы."""
+
+    def __init__(self) -> None:
+        self.requests: list = []
+        self.peers: set = set()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.delay = 0.0
+        app = web.Application()
+        app.router.add_get("/openApi/swap/v2/quote/price", self.price)
+        app.router.add_post("/openApi/swap/v2/trade/order", self.order)
+        app.router.add_post("/openApi/swap/v2/trade/batchOrders", self.batch)
+        app.router.add_get("/fail", self.fail)
+        self.server = TestServer(app)
+
+    async def _track(self, request: web.Request, params: dict) -> None:
+        self.requests.append((request.path, request.headers.get("X-BX-APIKEY"), params))
+        self.peers.add(request.transport.get_extra_info("peername"))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+
+    async def price(self, request: web.Request) -> web.Response:
+        await self._track(request, dict(request.query))
+        return web.json_response({"code": 0, "data": {"symbol": request.query["symbol"], "price": "65000.5"}})
+
+    async def order(self, request: web.Request) -> web.Response:
+        params = dict(await request.post())
+        await self._track(request, params)
+        signature = params.pop("signature")
+        qs = "&".join(f"{k}={v}" for k, v in sorted(params.items()))
+        expected = hmac.new(SECRET.encode(), qs.encode(), hashlib.sha256).hexdigest()
+        if signature != expected:
+            return web.json_response({"code": 100001, "msg": "signature verification failed"})
+        return web.json_response({"code": 0, "data": {"order": {"orderId": 1, "clientOrderID": params.get("clientOrderID")}}})
+
+    async def batch(self, request: web.Request) -> web.Response:
+        params = dict(await request.post())
+        await self._track(request, params)
+        orders = json.loads(params["batchOrders"])
+        return web.json_response({"code": 0, "data": {"orders": [
+            {"orderId": i, "clientOrderID": o["clientOrderID"]} for i, o in enumerate(orders)
+        ]}})
+
+    async def fail(self, request: web.Request) -> web.Response:
+        return web.Response(status=500)
+
+
+def run(scenario) -> None:
+    async def main() -> None:
+        stand_in = StandIn()
+        await stand_in.server.start_server()
+        rest = BingXRest("key", SECRET, str(stand_in.server.make_url("/")), max_in_flight=4,
+                         clock=SimulatedClock(1_700_000_000_000))
+        try:
+            await scenario(stand_in, rest)
+        finally:
+            await rest.close()
+            await stand_in.server.close()
+
+    asyncio.run(main())
+
+
+def test_public_get_and_signed_post() -> None:
+    async def scenario(stand_in: StandIn, rest: BingXRest) -> None:
+        assert await rest.get_price("BTC-USDT") == 65000.5
+        reply = await rest.place_order("BTC-USDT", "BUY", 0.01, client_order_id="bp-1")
+        assert reply["code"] == 0
+        assert reply["data"]["order"]["clientOrderID"] == "bp-1"
+        path, api_key, params = stand_in.requests[-1]
+        assert path == "/openApi/swap/v2/trade/order"
+        assert api_key == "key"
+        assert params["timestamp"] == "1700000000000"
+        assert params["quantity"] == "0.01"
+
+    run(scenario)
+
+
+def test_batch_orders_are_sent_as_json() -> None:
+    async def scenario(stand_in: StandIn, rest: BingXRest) -> None:
+        orders = [rest.order_params("BTC-USDT", "BUY", 1, client_order_id=f"c{i}") for i in range(3)]
+        reply = await rest.place_batch_orders(orders)
+        assert [o["clientOrderID"] for o in reply["data"]["orders"]] == ["c0", "c1", "c2"]
+
+    run(scenario)
+
+
+def test_connections_are_reused_and_concurrency_is_capped() -> None:
+    async def scenario(stand_in: StandIn, rest: BingXRest) -> None:
+        stand_in.delay = 0.02
+        await asyncio.gather(*(rest.get_price("BTC-USDT") for _ in range(20)))
+        assert stand_in.max_in_flight == 4
+        assert len(stand_in.peers) <= 4
+        stand_in.delay = 0.0
+        for _ in range(5):
+            await rest.get_price("BTC-USDT")
+        assert len(stand_in.peers) <= 4
+
+    run(scenario)
+
+
+def test_timeout_and_http_errors_raise() -> None:
+    async def scenario(stand_in: StandIn, rest: BingXRest) -> None:
+        stand_in.delay = 0.5
+        with pytest.raises(asyncio.TimeoutError):
+            await rest.get_price("BTC-USDT", timeout=0.05)
+        with pytest.raises(aiohttp.ClientResponseError):
+            await rest._request("GET", "/fail", None, signed=False)
+
+    run(scenario)
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import asyncio
+import gzip
+import json
+from typing import List, Union
+
+import pytest
+
+from botplatform.exchanges.bingx import websocket as ws_module
+from botplatform.exchanges.bingx.websocket import BingXWebSocket
+
+Frame = Union[str, bytes]
+
+
+class FakeConnection:
+    """Одно соединение: отдаёт ``frames`` по порядку, затем рвётся (или ждёт ``close``)."""
+
+    def __init__(self, frames: List[Frame], hold: bool) -> None:
+        self.frames = list(frames)
+        self.hold = hold
+        self.sent: List[str] = []
+        self.closed = asyncio.Event()
+
+    async def __aenter__(self) -> "FakeConnection":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self.closed.set()
+
+    async def send(self, message: str) -> None:
+        self.sent.append(message)
+
+    async def recv(self) -> Frame:
+        if self.frames:
+            return self.frames.pop(0)
+        if self.hold:
+            await self.closed.wait()
+        raise ConnectionError("connection lost")
+
+    async def close(self) -> None:
+        self.closed.set()
+
+
+class FakeServer:
+    """Подменяет ``websockets.connect``: каждое подключение получает следующий сценарий кадров."""
+
+    def __init__(self, monkeypatch: pytest.MonkeyPatch, *scripts: List[Frame]) -> None:
+        self.scripts = list(scripts)
+        self.connections: List[FakeConnection] = []
+        monkeypatch.setattr(ws_module.websockets, "connect", self.connect)
+
+    def connect(self, url: str, **kwargs) -> FakeConnection:
+        frames = self.scripts.pop(0)
+        conn = FakeConnection(frames, hold=not self.scripts)
+        self.connections.append(conn)
+        return conn
+
+
+SUBSCRIBE = {"op": "subscribe", "args": ["swap/depth:BTC-USDT"]}
+
+
+def run_client(*, expect: int) -> tuple:
+    """Читает поток, пока обработчик не получит ``expect`` сообщений."""
+    client = BingXWebSocket("ws://fake", SUBSCRIBE, reconnect_delay=0.001, max_reconnect_delay=0.001)
+    received: list = []
+
+    async def handler(msg: dict) -> None:
+        received.append(msg)
+        if len(received) == expect:
+            await client.stop()
+
+    async def run() -> None:
+        await asyncio.wait_for(client.run(handler), 2.0)
+
+    asyncio.run(run())
+    return client, received
+
+
+def test_reconnects_and_resubscribes(monkeypatch: pytest.MonkeyPatch) -> None:
+    server = FakeServer(monkeypatch, ['{"n": 1}'], ['{"n": 2}'])
+    client, received = run_client(expect=2)
+    assert received == [{"n": 1}, {"n": 2}]
+    assert [c.sent for c in server.connections] == [[json.dumps(SUBSCRIBE)]] * 2
+    assert client.totals.reconnects == 1
+    assert client.totals.messages == 2
+
+
+def test_gzip_frames_are_decoded(monkeypatch: pytest.MonkeyPatch) -> None:
+    FakeServer(monkeypatch, [gzip.compress(b'{"data": {"symbol": "BTC-USDT"}}')])
+    _, received = run_client(expect=1)
+    assert received == [{"data": {"symbol": "BTC-USDT"}}]
+
+
+def test_ping_gets_pong(monkeypatch: pytest.MonkeyPatch) -> None:
+    server = FakeServer(monkeypatch, ["Ping", gzip.compress(b"Ping"), '{"ping": "abc"}', '{"n": 1}'])
+    client, received = run_client(expect=1)
+    assert received == [{"n": 1}]
+    assert server.connections[0].sent[1:] == ["Pong", "Pong", json.dumps({"pong": "abc"})]
+    assert client.totals.pings == 3
+
+
+def test_undecodable_frames_are_counted_as_dropped(monkeypatch: pytest.MonkeyPatch) -> None:
+    FakeServer(monkeypatch, ["not json", b"\x1f\x8bnot gzip", '{"n": 1}'])
+    client, received = run_client(expect=1)
+    assert received == [{"n": 1}]
+    assert client.totals.dropped == 2
+    assert client.totals.messages == 3
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import asyncio
+import random
+from typing import Dict, List
+
+from botplatform.core.event_bus import EventBus
+from botplatform.core.events import Event
+
+SHARDS = 4
+
+
+def tick(symbol: str, i: int) -> Event:
+    return Event(type="market.snapshot", timestamp=i, source="test", payload={"symbol": symbol})
+
+
+def symbols_on_different_shards() -> List[str]:
+    """Два символа, которые по ключу (тип, символ) попадают в разные воркеры."""
+    first = "S0"
+    shard = hash(("market.snapshot", first)) % SHARDS
+    for i in range(1, 1000):
+        other = f"S{i}"
+        if hash(("market.snapshot", other)) % SHARDS != shard:
+            return [first, other]
+    raise AssertionError("no symbol on another shard")
+
+
+def test_same_key_in_order_across_shards() -> None:
+    async def run() -> Dict[str, List[int]]:
+        bus = EventBus(shards=SHARDS)
+        seen: Dict[str, List[int]] = {}
+        rng = random.Random(1)
+
+        async def on_tick(event: Event) -> None:
+            # Разные задержки перемешивают порядок между ключами, но не внутри ключа.
+            await asyncio.sleep(rng.random() * 1e-3)
+            seen.setdefault(event.payload["symbol"], []).append(event.timestamp)
+
+        bus.subscribe("market.snapshot", on_tick)
+        await bus.start()
+        for i in range(50):
+            for s in range(8):
+                await bus.publish(tick(f"S{s}", i))
+        await bus.join()
+        await bus.stop()
+        return seen
+
+    seen = asyncio.run(run())
+    assert len(seen) == 8
+    assert all(timestamps == list(range(50)) for timestamps in seen.values())
+
+
+def test_slow_key_does_not_block_other_shards() -> None:
+    slow, fast = symbols_on_different_shards()
+
+    async def run() -> None:
+        bus = EventBus(shards=SHARDS)
+        release = asyncio.Event()
+        fast_done = asyncio.Event()
+        handled: List[str] = []
+
+        async def on_tick(event: Event) -> None:
+            symbol = event.payload["symbol"]
+            if symbol == slow:
+                await release.wait()
+            handled.append(symbol)
+            if symbol == fast and event.timestamp == 2:
+                fast_done.set()
+
+        bus.subscribe("market.snapshot", on_tick)
+        await bus.start()
+        await bus.publish(tick(slow, 0))
+        for i in range(3):
+            await bus.publish(tick(fast, i))
+        await asyncio.wait_for(fast_done.wait(), 1.0)
+        assert handled == [fast] * 3
+        release.set()
+        await bus.join()
+        await bus.stop()
+        assert handled == [fast] * 3 + [slow]
+
+    asyncio.run(run())
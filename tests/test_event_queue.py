@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import asyncio
+
+from botplatform.core.event_queue import EventQueue
+from botplatform.core.events import Event
+from botplatform.core.records import MarketRecord
+
+
+def snapshot(symbol: str, i: int) -> Event:
+    return Event(type="market.snapshot", timestamp=i, source="test", payload={"symbol": symbol})
+
+
+def record(symbol: str, i: int) -> Event:
+    """Типизированное событие: символ только в ``data``, ``payload`` пуст."""
+    data = MarketRecord(symbol=symbol, price=100.0, bid=99.5, ask=100.5, timestamp=i)
+    return Event(type="market.snapshot", timestamp=i, source="test", data=data)
+
+
+def order(i: int) -> Event:
+    return Event(type="order.update", timestamp=i, source="test")
+
+
+async def drain(queue: EventQueue) -> list:
+    out = []
+    while not queue.empty():
+        out.append(await queue.get())
+    return out
+
+
+def test_drop_oldest_keeps_newest_and_bounds_storage() -> None:
+    async def run() -> None:
+        q = EventQueue(maxsize=10, overflow="drop_oldest", lanes=("all",))
+        await q.put(order(-1))
+        for i in range(10_000):
+            await q.put(snapshot("BTC", i))
+        assert q.qsize() == 11
+        assert q.lane_stats()["all"]["depth"] == 11
+        assert q.dropped == 9_990
+        events = await drain(q)
+        assert events[0].type == "order.update"
+        assert [e.timestamp for e in events[1:]] == list(range(9_990, 10_000))
+
+    asyncio.run(run())
+
+
+def test_non_droppable_events_are_never_dropped() -> None:
+    async def run() -> None:
+        q = EventQueue(maxsize=2, overflow="drop_oldest")
+        for i in range(100):
+            await q.put(order(i))
+            await q.put(snapshot("BTC", i))
+        events = await drain(q)
+        assert [e.timestamp for e in events if e.type == "order.update"] == list(range(100))
+        assert len([e for e in events if e.type == "market.snapshot"]) == 2
+
+    asyncio.run(run())
+
+
+def test_conflate_keeps_latest_per_symbol_in_place() -> None:
+    async def run() -> None:
+        q = EventQueue(maxsize=100, overflow="conflate")
+        for i in range(5):
+            await q.put(snapshot("BTC", i))
+            await q.put(snapshot("ETH", 100 + i))
+        events = await drain(q)
+        assert [(e.payload["symbol"], e.timestamp) for e in events] == [("BTC", 4), ("ETH", 104)]
+        assert q.conflated == 8
+
+    asyncio.run(run())
+
+
+def test_conflate_uses_symbol_of_typed_events() -> None:
+    async def run() -> None:
+        q = EventQueue(maxsize=100, overflow="conflate")
+        for i in range(5):
+            await q.put(record("BTC", i))
+            await q.put(record("ETH", 100 + i))
+            await q.put(snapshot("SOL", 200 + i))
+        events = await drain(q)
+        assert [e.timestamp for e in events] == [4, 104, 204]
+        assert events[0].data.symbol == "BTC" and events[1].data.symbol == "ETH"
+        assert q.conflated == 12
+
+    asyncio.run(run())
+
+
+def test_block_waits_for_consumer() -> None:
+    async def run() -> None:
+        q = EventQueue(maxsize=1, overflow="block")
+        await q.put(snapshot("BTC", 0))
+        producer = asyncio.create_task(q.put(snapshot("BTC", 1)))
+        await asyncio.sleep(0.01)
+        assert not producer.done()
+        assert (await q.get()).timestamp == 0
+        await asyncio.wait_for(producer, 1.0)
+        assert (await q.get()).timestamp == 1
+
+    asyncio.run(run())
+
+
+def test_orders_overtake_market_data() -> None:
+    async def run() -> None:
+        q = EventQueue()
+        for i in range(3):
+            await q.put(snapshot("BTC", i))
+        await q.put(order(99))
+        assert (await q.get()).type == "order.update"
+
+    asyncio.run(run())
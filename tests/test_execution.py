@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import asyncio
+from typing import List, Optional, Tuple
+
+from botplatform.core.clock import SimulatedClock
+from botplatform.core.event_bus import EventBus
+from botplatform.core.models import OrderIntent, OrderUpdate
+from botplatform.engines.execution import is_unknown, resolve_unknown, submit_orders, unknown_update
+from botplatform.engines.execution_local import LocalExecutionEngine
+from botplatform.exchanges.base import OrderRejected
+from botplatform.exchanges.mock import MockExchange
+from tests.factories import intent, update
+
+
+class FlakyExchange(MockExchange):
+    """Первый place_order падает с ``error``, а биржа при этом ордер приняла (или нет)."""
+
+    def __init__(self, error: Exception, accepted: bool) -> None:
+        super().__init__(clock=SimulatedClock(1_000))
+        self.error = error
+        self.accepted = accepted
+        self.lookups = 0
+
+    async def place_order(self, order: OrderIntent) -> OrderUpdate:
+        if self.accepted:
+            await super().place_order(order)
+        raise self.error
+
+    async def get_order(self, symbol: str, client_id: str) -> Optional[OrderUpdate]:
+        self.lookups += 1
+        if self.lookups == 1:
+            raise ConnectionError("still down")
+        return await super().get_order(symbol, client_id)
+
+
+def test_exchange_refusal_becomes_rejected() -> None:
+    exchange = FlakyExchange(OrderRejected({"code": 101204, "msg": "insufficient margin"}), accepted=False)
+    [update] = asyncio.run(submit_orders(exchange, [intent("a")]))
+    assert update.status == "REJECTED"
+    assert not is_unknown(update)
+
+
+def test_timeout_is_unknown_not_rejected() -> None:
+    exchange = FlakyExchange(asyncio.TimeoutError(), accepted=True)
+    [update] = asyncio.run(submit_orders(exchange, [intent("a")]))
+    assert update.status == "NEW"
+    assert is_unknown(update)
+
+
+def states(exchange, update: OrderUpdate, **kwargs) -> List[OrderUpdate]:
+    async def run() -> List[OrderUpdate]:
+        return [state async for state in resolve_unknown(exchange, update, delay=0.0, **kwargs)]
+
+    return asyncio.run(run())
+
+
+def test_unknown_order_is_reconciled_by_client_id() -> None:
+    accepted = FlakyExchange(asyncio.TimeoutError(), accepted=True)
+    [update] = asyncio.run(submit_orders(accepted, [intent("a")]))
+    assert [s.status for s in states(accepted, update)] == ["FILLED"]
+    assert accepted.lookups == 2
+
+    lost = FlakyExchange(ConnectionResetError(), accepted=False)
+    [update] = asyncio.run(submit_orders(lost, [intent("b")]))
+    assert [s.status for s in states(lost, update)] == ["REJECTED"]
+
+
+class FillingExchange(MockExchange):
+    """Ордер исполняется постепенно: поиск по client_id видит его статусы по очереди."""
+
+    def __init__(self, *statuses: Tuple[str, float]) -> None:
+        super().__init__(clock=SimulatedClock(1_000))
+        self.statuses = list(statuses)
+        self.lookups = 0
+
+    async def get_order(self, symbol: str, client_id: str) -> Optional[OrderUpdate]:
+        status, filled = self.statuses[min(self.lookups, len(self.statuses) - 1)]
+        self.lookups += 1
+        return update(client_id, status, filled, avg=100.0 if filled else None, symbol=symbol,
+                      ts=self.clock.now_ms())
+
+
+def test_partial_order_is_polled_until_final() -> None:
+    update = unknown_update(intent("a"), asyncio.TimeoutError())
+    exchange = FillingExchange(("PARTIAL", 0.3), ("PARTIAL", 0.3), ("PARTIAL", 0.6), ("FILLED", 1.0))
+    assert [(s.status, s.filled_size) for s in states(exchange, update)] == [
+        ("PARTIAL", 0.3), ("PARTIAL", 0.6), ("FILLED", 1.0),
+    ]
+    assert exchange.lookups == 4
+
+
+def test_polling_stops_when_retry_budget_runs_out() -> None:
+    update = unknown_update(intent("a"), asyncio.TimeoutError())
+    exchange = FillingExchange(("PARTIAL", 0.3))
+    assert [s.status for s in states(exchange, update, attempts=3)] == ["PARTIAL"]
+    assert exchange.lookups == 3
+
+
+def test_execution_engine_publishes_reconciled_state() -> None:
+    async def run() -> List[str]:
+        bus = EventBus()
+        seen: List[str] = []
+
+        async def on_update(event) -> None:
+            seen.append(event.data.status)
+
+        bus.subscribe("order.update", on_update)
+        await bus.start()
+        exchange = FlakyExchange(asyncio.TimeoutError(), accepted=True)
+        engine = LocalExecutionEngine(bus, exchange, clock=exchange.clock)
+        await engine.submit([intent("a")])
+        await asyncio.wait_for(asyncio.gather(*engine._reconciling), 5.0)
+        await bus.join()
+        await bus.stop()
+        return seen
+
+    assert asyncio.run(run()) == ["NEW", "FILLED"]
+
+
+def test_execution_engine_publishes_every_polled_change() -> None:
+    class SilentExchange(FillingExchange):
+        async def place_order(self, order: OrderIntent) -> OrderUpdate:
+            raise asyncio.TimeoutError()
+
+    async def run() -> List[str]:
+        bus = EventBus()
+        seen: List[str] = []
+
+        async def on_update(event) -> None:
+            seen.append(event.data.status)
+
+        bus.subscribe("order.update", on_update)
+        await bus.start()
+        exchange = SilentExchange(("PARTIAL", 0.5), ("FILLED", 1.0))
+        engine = LocalExecutionEngine(bus, exchange, clock=exchange.clock)
+        await engine.submit([intent("a")])
+        await asyncio.wait_for(asyncio.gather(*engine._reconciling), 5.0)
+        await bus.join()
+        await bus.stop()
+        return seen
+
+    assert asyncio.run(run()) == ["NEW", "PARTIAL", "FILLED"]
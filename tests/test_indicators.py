@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import math
+
+import numpy as np
+
+from botplatform.core.models import MarketSnapshot
+from botplatform.engines.signals_indicators import IndicatorSignalsEngine
+
+
+def test_window_statistics_match_exact_computation_at_btc_prices() -> None:
+    engine = IndicatorSignalsEngine(window=50)
+    rng = np.random.default_rng(0)
+    prices = (60_000.0 + np.cumsum(rng.normal(0.0, 0.01, 5_000))).tolist()
+    for i, p in enumerate(prices):
+        engine.update_batch([MarketSnapshot(symbol="BTCUSDT", price=p, bid=p - 0.5, ask=p + 0.5, timestamp=i)])
+
+    signal = engine.signal("BTCUSDT", len(prices))
+    window = np.array(prices[-50:])
+    returns = np.diff(np.log(prices[-51:]))
+    assert math.isclose(signal.data["zscore"], (window[-1] - window.mean()) / window.std(ddof=1), rel_tol=1e-6)
+    assert math.isclose(signal.data["volatility"], returns.std(ddof=1), rel_tol=1e-6)
+
+
+def test_constant_price_has_zero_volatility_and_zscore() -> None:
+    engine = IndicatorSignalsEngine(window=10)
+    for i in range(100):
+        engine.update_batch([MarketSnapshot(symbol="X", price=65_432.1, bid=65_432.0, ask=65_432.2, timestamp=i)])
+    signal = engine.signal("X", 100)
+    assert signal.data["volatility"] == 0.0
+    assert signal.data["zscore"] == 0.0
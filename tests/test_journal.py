@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import time
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from botplatform.core.event_bus import EventBus
+from botplatform.core.events import Event
+from botplatform.core.models import MarketSnapshot, OrderUpdate
+from botplatform.engines.backtest import random_walk_ticks
+from botplatform.storage.journal import FRAME_HEADER, JournalRecorder, JournalReplayer, segments
+
+
+def sample_events() -> List[Event]:
+    events = [
+        Event(type="market.snapshot", timestamp=t.timestamp, source="test", data=t)
+        for t in random_walk_ticks(["BTCUSDT"], 50, seed=1)
+    ]
+    update = OrderUpdate(
+        order_id="1", client_id="c1", symbol="BTCUSDT", side="BUY", status="FILLED",
+        filled_size=1.0, remaining_size=0.0, avg_fill_price=100.0, timestamp=1, raw={"x": 1},
+    )
+    events.append(Event(type="order.update", timestamp=1, source="test", data=update))
+    return events
+
+
+def record(path: Path, events: List[Event], **kwargs) -> JournalRecorder:
+    recorder = JournalRecorder(path, **kwargs)
+    for event in events:
+        recorder.record(event)
+    recorder.close()
+    return recorder
+
+
+def test_events_roundtrip_through_wire_format(tmp_path: Path) -> None:
+    events = sample_events()
+    recorder = record(tmp_path, events, rotate_bytes=4096)
+    assert recorder.recorded == len(events) and recorder.lost == 0
+    assert len(segments(tmp_path)) > 1
+
+    replayed = [e for _, e in JournalReplayer(tmp_path).events()]
+    assert [e.type for e in replayed] == [e.type for e in events]
+    assert replayed[0].as_model(MarketSnapshot) == events[0].data.to_model()
+    assert replayed[-1].as_model(OrderUpdate) == events[-1].data
+
+
+def test_unserializable_events_are_counted_as_lost(tmp_path: Path) -> None:
+    bad = Event(type="custom", timestamp=0, source="test", payload={"obj": object()})
+    recorder = record(tmp_path, [bad] + sample_events()[:3], compress=False)
+    assert recorder.recorded == 3
+    assert recorder.lost == 1
+    assert len(list(JournalReplayer(tmp_path).events())) == 3
+
+
+def test_unknown_frame_version_and_torn_tail_are_skipped(tmp_path: Path) -> None:
+    record(tmp_path, sample_events()[:2], compress=False)
+    (segment,) = segments(tmp_path)
+    with open(segment, "ab") as f:
+        f.write(FRAME_HEADER.pack(99, 3) + b"xyz")
+        f.write(FRAME_HEADER.pack(1, 100) + b"[1,")
+    assert len(list(JournalReplayer(tmp_path).events())) == 2
+
+
+def test_replay_publishes_to_bus(tmp_path: Path) -> None:
+    events = sample_events()
+    record(tmp_path, events)
+
+    async def run() -> List[Event]:
+        bus = EventBus()
+        seen: List[Event] = []
+
+        async def on_event(event: Event) -> None:
+            seen.append(event)
+
+        bus.subscribe("market.snapshot", on_event)
+        await bus.start()
+        count = await JournalReplayer(tmp_path).replay(bus, speed=None)
+        await bus.join()
+        await bus.stop()
+        assert count == len(events)
+        return seen
+
+    assert len(asyncio.run(run())) == len(events) - 1
+
+
+def test_replay_paces_each_run_on_its_own_clock(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Второй запуск с меньшей (другой процесс) и с далёкой точкой отсчёта monotonic_ns."""
+    events = sample_events()[:5]
+    for base in (10**12, 1_000, 10**12 + 3600 * 10**9):
+        ticks = itertools.count(base, 10_000_000)  # 10 мс между событиями
+        monkeypatch.setattr(time, "monotonic_ns", lambda: next(ticks))
+        record(tmp_path, events)
+    monkeypatch.undo()
+    assert len(segments(tmp_path)) == 3
+
+    async def run() -> float:
+        bus = EventBus()
+        await bus.start()
+        loop = asyncio.get_running_loop()
+        t0 = loop.time()
+        count = await JournalReplayer(tmp_path).replay(bus, speed=1.0)
+        elapsed = loop.time() - t0
+        await bus.stop()
+        assert count == 3 * len(events)
+        return elapsed
+
+    # 3 сегмента по 4 интервала в 10 мс; стыки запусков не ждём.
+    assert 0.1 <= asyncio.run(run()) < 1.0
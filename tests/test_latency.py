@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from botplatform.utils.latency import LatencyHistogram, LatencyRecorder
+
+
+def within(value: int, exact: int, precision: int = 7) -> bool:
+    """Оценка сверху в пределах относительной погрешности гистограммы."""
+    return exact <= value <= exact * (1 + 2.0 ** -(precision - 1))
+
+
+def test_small_values_are_exact() -> None:
+    hist = LatencyHistogram()
+    for v in range(1, 101):
+        hist.record(v)
+    assert [hist.percentile(q) for q in (1, 50, 90, 99, 100)] == [1, 50, 90, 99, 100]
+    assert (hist.min, hist.max, hist.count, hist.total) == (1, 100, 100, 5050)
+
+
+def test_large_values_within_relative_error() -> None:
+    hist = LatencyHistogram()
+    samples = [1_000 * i for i in range(1, 10_001)]  # 1 мкс … 10 мс
+    for v in samples:
+        hist.record(v)
+    for q in (50, 90, 99, 99.9):
+        exact = samples[int(q / 100 * len(samples) + 0.5) - 1]
+        assert within(hist.percentile(q), exact), q
+    assert hist.percentile(100) == 10_000_000
+
+
+def test_percentile_never_exceeds_max_and_negative_is_zero() -> None:
+    hist = LatencyHistogram()
+    hist.record(-5)
+    hist.record(123_456_789)
+    assert hist.percentile(50) == 0
+    assert hist.percentile(99) == 123_456_789
+    assert LatencyHistogram().percentile(50) == 0
+
+
+def test_merge_equals_recording_everything_in_one() -> None:
+    a, b, both = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+    for v in range(0, 2_000_000, 997):
+        (a if v % 2 else b).record(v)
+        both.record(v)
+    a.merge(b)
+    assert a.summary() == both.summary()
+
+
+def test_recorder_skips_when_disabled() -> None:
+    rec = LatencyRecorder()
+    rec.record("stage", 1_000)
+    rec.enabled = False
+    rec.record("stage", 2_000)
+    rec.since("other", 0)
+    assert rec.stages() == ["stage"]
+    assert rec.summary()["stage"]["count"] == 1
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import random
+from typing import List, Tuple
+
+from botplatform.core.ledger import PositionLedger
+
+Fill = Tuple[str, str, float, float]
+
+# Открытие, доливка, частичное закрытие, переворот через ноль, закрытие в ноль и снова переворот.
+FLIPS: List[Fill] = [
+    ("BTCUSDT", "BUY", 1.0, 100.0),
+    ("BTCUSDT", "BUY", 1.0, 110.0),
+    ("BTCUSDT", "SELL", 0.5, 120.0),
+    ("BTCUSDT", "SELL", 3.5, 90.0),
+    ("BTCUSDT", "BUY", 2.0, 80.0),
+    ("BTCUSDT", "SELL", 1.0, 85.0),
+    ("BTCUSDT", "BUY", 2.5, 95.0),
+]
+
+
+def random_fills(n: int, seed: int) -> List[Fill]:
+    rng = random.Random(seed)
+    return [
+        (rng.choice(["BTCUSDT", "ETHUSDT", "SOLUSDT"]), rng.choice(["BUY", "SELL"]),
+         rng.choice([0.5, 1.0, 2.0, 3.0]), round(rng.uniform(90.0, 110.0), 2))
+        for _ in range(n)
+    ]
+
+
+def one_by_one(fills: List[Fill]) -> PositionLedger:
+    ledger = PositionLedger(capacity=2)
+    for symbol, side, size, price in fills:
+        ledger.apply_fill(symbol, side, size, price)
+    return ledger
+
+
+def batched(fills: List[Fill]) -> PositionLedger:
+    ledger = PositionLedger(capacity=2)
+    ledger.apply_fills(*zip(*fills))
+    return ledger
+
+
+def test_flips_through_zero() -> None:
+    pos = one_by_one(FLIPS).snapshot("BTCUSDT")
+    # 2 @ 105 -> 1.5 @ 105 (+7.5) -> -2 @ 90 (-22.5) -> 0 (+20) -> -1 @ 85 -> 1.5 @ 95 (-10)
+    assert (pos.side, pos.size, pos.entry_price) == ("LONG", 1.5, 95.0)
+    assert abs(pos.realized_pnl - (7.5 - 22.5 + 20.0 - 10.0)) < 1e-9
+
+
+def test_batch_matches_fill_by_fill() -> None:
+    for fills in (FLIPS, random_fills(500, seed=1), random_fills(500, seed=2)):
+        expected, actual = one_by_one(fills), batched(fills)
+        assert actual.symbols == expected.symbols
+        for symbol in expected.symbols:
+            a, e = actual.snapshot(symbol), expected.snapshot(symbol)
+            assert (a.side, a.size, a.entry_price) == (e.side, e.size, e.entry_price)
+            assert abs(a.realized_pnl - e.realized_pnl) < 1e-9
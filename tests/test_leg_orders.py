@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from typing import List
+
+from botplatform.core.context import StrategyContext
+from botplatform.core.models import ActionIntent, OrderUpdate
+from botplatform.legs.base import BaseLeg, LegState
+from botplatform.legs.orders import LegOrderManager
+from tests.factories import ctx, update
+
+
+class CloseLeg(BaseLeg):
+    """Нога, которая на каждом тике просит закрыть позицию."""
+
+    def __init__(self) -> None:
+        super().__init__("close")
+        self.state = LegState(side="LONG")
+        self.ticks = 0
+
+    def on_tick(self, ctx: StrategyContext) -> List[ActionIntent]:
+        self.ticks += 1
+        return [ActionIntent(action="close", side="LONG")]
+
+    def on_order_update(self, update: OrderUpdate) -> None:
+        return
+
+    def get_state(self) -> LegState:
+        return self.state
+
+    def load_state(self, state: LegState) -> None:
+        self.state = state
+
+
+def test_unsent_intent_blocks_leg_until_timeout() -> None:
+    leg = CloseLeg()
+    manager = LegOrderManager([leg], timeout_ms=30_000)
+    manager.on_tick(ctx(0))
+    manager.on_tick(ctx(1_000))
+    assert leg.ticks == 1
+    manager.on_tick(ctx(30_000))
+    assert leg.ticks == 2
+
+
+def test_released_intent_frees_leg_on_next_tick() -> None:
+    leg = CloseLeg()
+    manager = LegOrderManager([leg], timeout_ms=30_000)
+    (intent,) = manager.on_tick(ctx(0))
+    manager.release(intent.context)
+    manager.on_tick(ctx(1_000))
+    assert leg.ticks == 2
+    assert manager.pending() == []
+
+
+def test_bound_intent_waits_for_final_status() -> None:
+    leg = CloseLeg()
+    manager = LegOrderManager([leg], timeout_ms=30_000)
+    (intent,) = manager.on_tick(ctx(0))
+    manager.bind("c1", intent.context)
+    manager.on_tick(ctx(1_000))
+    assert leg.ticks == 1
+    assert manager.on_order_update(update("c1", "CANCELLED", side="SELL", ts=1_000))
+    manager.on_tick(ctx(2_000))
+    assert leg.ticks == 2
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import asyncio
+from typing import List
+
+from botplatform.core.event_bus import EventBus
+from botplatform.core.events import Event
+from botplatform.core.records import MarketRecord
+from botplatform.engines.bingx_market import BingXMarketEngine
+from botplatform.engines.fake_market import FakeMarketEngine
+
+
+def test_fake_market_publishes_records() -> None:
+    async def run() -> List[Event]:
+        bus = EventBus()
+        seen: List[Event] = []
+
+        async def on_tick(event: Event) -> None:
+            seen.append(event)
+
+        bus.subscribe("market.snapshot", on_tick)
+        await bus.start()
+        market = FakeMarketEngine(bus, ["BTCUSDT", "ETHUSDT"], interval_ms=1)
+        await market.start()
+        while len(seen) < 2:
+            await asyncio.sleep(0.005)
+        await market.stop()
+        await bus.stop()
+        return seen
+
+    events = asyncio.run(run())
+    assert all(isinstance(e.data, MarketRecord) for e in events)
+    assert events[0].data.depth == 1 and list(events[0].data.trade_sz) == [0.1]
+
+
+def test_bingx_market_builds_records() -> None:
+    engine = BingXMarketEngine(EventBus(), "ws://localhost", ["BTC-USDT"])
+    msg = {"data": {"symbol": "BTC-USDT", "lastPrice": "100.5", "bidPrice": "100", "askPrice": "101", "timestamp": 7}}
+    record = engine._to_snapshot(msg)
+    assert isinstance(record, MarketRecord)
+    assert (record.symbol, record.price, record.bid, record.ask, record.timestamp) == ("BTC-USDT", 100.5, 100.0, 101.0, 7)
+    assert record.to_model().bids[0].price == 100.0
+    assert engine._to_snapshot({"data": {}}) is None
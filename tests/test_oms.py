@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from botplatform.core.clock import SimulatedClock
+from botplatform.engines.oms import ClientIdGenerator, OrderManager
+from tests.factories import intent, update
+
+
+def test_client_ids_are_unique_across_generators_on_a_frozen_clock() -> None:
+    clock = SimulatedClock(0)
+    a, b = ClientIdGenerator(clock=clock), ClientIdGenerator(clock=clock)
+    ids = [g.next() for _ in range(100) for g in (a, b)]
+    assert len(set(ids)) == len(ids)
+    assert all(len(i) <= 36 and i.replace("-", "").isalnum() for i in ids)
+
+
+def test_order_lifecycle() -> None:
+    oms = OrderManager(clock=SimulatedClock(0))
+    oms.track(intent("c1"))
+    assert oms.get("c1").status == "NEW"
+
+    oms.on_update(update("c1", "NEW"))
+    oms.on_update(update("c1", "PARTIAL", 0.3, avg=100.0))
+    oms.on_update(update("c1", "PARTIAL", 0.6, avg=100.5))
+    record = oms.on_update(update("c1", "FILLED", 1.0, avg=101.0))
+    assert (record.status, record.filled_size, record.avg_fill_price) == ("FILLED", 1.0, 101.0)
+    assert oms.by_order_id("o1") is record
+    assert oms.open_orders() == []
+
+
+def test_invalid_transitions_and_stale_updates_are_ignored() -> None:
+    oms = OrderManager(clock=SimulatedClock(0))
+    oms.track(intent("c1"))
+    oms.on_update(update("c1", "PARTIAL", 0.5))
+    oms.on_update(update("c1", "NEW"))
+    assert oms.get("c1").status == "PARTIAL"
+    oms.on_update(update("c1", "PARTIAL", 0.2))
+    assert oms.get("c1").filled_size == 0.5
+    oms.on_update(update("c1", "REJECTED"))
+    assert oms.get("c1").status == "PARTIAL"
+
+    oms.on_update(update("c1", "CANCELLED", 0.5))
+    oms.on_update(update("c1", "FILLED", 1.0))
+    assert oms.get("c1").status == "CANCELLED"
+
+
+def test_update_found_by_order_id_and_unknown_orders_adopted() -> None:
+    oms = OrderManager(clock=SimulatedClock(0))
+    oms.track(intent("c1"))
+    oms.on_update(update("c1", "NEW", order_id="o1"))
+    assert oms.on_update(update("", "FILLED", 1.0, order_id="o1")).client_id == "c1"
+
+    assert oms.on_update(update("", "NEW", order_id="o2")) is None
+    adopted = oms.on_update(update("manual", "NEW", order_id="o3"))
+    assert adopted.strategy is None and oms.for_symbol("BTCUSDT") == [oms.get("c1"), adopted]
+
+
+def test_indexes_and_retention() -> None:
+    clock = SimulatedClock(0)
+    oms = OrderManager(clock=clock, retention_ms=1_000)
+    oms.track(intent("c1", strategy="a"))
+    oms.track(intent("c2", strategy="b", symbol="ETHUSDT"))
+    assert [r.client_id for r in oms.for_strategy("a")] == ["c1"]
+    assert [r.client_id for r in oms.open_orders(symbol="ETHUSDT")] == ["c2"]
+
+    oms.on_update(update("c1", "FILLED", 1.0))
+    clock.advance(999)
+    assert oms.evict() == 0
+    clock.advance(1)
+    assert oms.evict() == 1
+    assert oms.get("c1") is None and oms.by_order_id("o1") is None
+    assert oms.for_strategy("a") == [] and len(oms) == 1
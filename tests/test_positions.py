@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Dict, List, Tuple
+
+from botplatform.core.clock import SimulatedClock
+from botplatform.core.models import PositionSnapshot
+from botplatform.engines.positions import PositionTracker
+from botplatform.exchanges.mock import MockExchange
+from tests.factories import intent, update
+
+
+def test_reconcile_skips_fills_already_in_snapshot() -> None:
+    async def run() -> None:
+        clock = SimulatedClock(1_000)
+        exchange = MockExchange(price_provider=lambda s: 100.0, clock=clock)
+        tracker = PositionTracker(exchange, reconcile_interval=0.0)
+
+        # Исполнение и сверка в одну миллисекунду.
+        queued = await exchange.place_order(intent("a"))
+        await tracker.reconcile()
+        assert tracker.get("BTCUSDT").size == 1.0
+
+        # Обновление о том же исполнении дошло по шине уже после сверки.
+        tracker.apply_update(queued)
+        assert tracker.get("BTCUSDT").size == 1.0
+
+        tracker.apply_update(await exchange.place_order(intent("b")))
+        assert tracker.get("BTCUSDT").size == 2.0
+
+    asyncio.run(run())
+
+
+class SnapshotExchange:
+    """Отдаёт заданный снимок; если задан ``gate``, ``get_positions`` ждёт его."""
+
+    def __init__(self, positions: Dict[str, PositionSnapshot], fills: Dict[str, Tuple[float, float]],
+                 gate: asyncio.Event | None = None) -> None:
+        self.positions = positions
+        self.fills = fills
+        self.gate = gate
+        self.requested = asyncio.Event()
+
+    async def get_positions(self, symbols: List[str] | None = None) -> Dict[str, PositionSnapshot]:
+        self.requested.set()
+        if self.gate is not None:
+            await self.gate.wait()
+        return self.positions
+
+    def order_fills(self) -> Dict[str, Tuple[float, float]]:
+        return self.fills
+
+
+def long(size: float) -> Dict[str, PositionSnapshot]:
+    return {"BTCUSDT": PositionSnapshot(symbol="BTCUSDT", side="LONG", size=size, entry_price=100.0)}
+
+
+def test_fill_after_reconcile_counts_only_the_rest_of_the_order() -> None:
+    async def run() -> None:
+        tracker = PositionTracker(SnapshotExchange(long(0.4), {"a": (0.4, 100.0)}), reconcile_interval=0.0)
+        await tracker.reconcile()
+
+        tracker.apply_update(update("a", "PARTIAL", 0.4, avg=100.0))
+        assert tracker.get("BTCUSDT").size == 0.4
+        tracker.apply_update(update("a", "FILLED", 1.0, avg=100.0))
+        assert abs(tracker.get("BTCUSDT").size - 1.0) < 1e-12
+
+    asyncio.run(run())
+
+
+def test_fill_arriving_during_reconcile_is_counted_once() -> None:
+    async def run(in_snapshot: bool) -> float:
+        gate = asyncio.Event()
+        exchange = SnapshotExchange(long(1.0) if in_snapshot else {},
+                                    {"a": (1.0, 100.0)} if in_snapshot else {}, gate)
+        tracker = PositionTracker(exchange, reconcile_interval=0.0)
+        task = asyncio.create_task(tracker.reconcile())
+        await exchange.requested.wait()
+        tracker.apply_update(update("a", "FILLED", 1.0, avg=100.0))
+        gate.set()
+        await task
+        if in_snapshot:
+            # Копия того же исполнения, стоявшая в очереди шины.
+            tracker.apply_update(update("a", "FILLED", 1.0, avg=100.0))
+        return tracker.get("BTCUSDT").size
+
+    assert asyncio.run(run(in_snapshot=True)) == 1.0
+    assert asyncio.run(run(in_snapshot=False)) == 1.0
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+from botplatform.core.event_bus import EventBus
+from botplatform.core.events import Event
+from botplatform.core.profiler import BusProfiler
+
+
+def blocking_handler_sleeps_synchronously() -> None:
+    time.sleep(0.3)
+
+
+def test_watchdog_captures_stack_of_blocking_handler() -> None:
+    async def run() -> BusProfiler:
+        profiler = BusProfiler(slow_ms=50.0)
+        bus = EventBus(profiler=profiler)
+
+        async def on_event(event: Event) -> None:
+            blocking_handler_sleeps_synchronously()
+
+        bus.subscribe("test.block", on_event)
+        await bus.start()
+        await asyncio.sleep(0.1)  # сторож и пульс запущены
+        await bus.publish(Event(type="test.block", timestamp=0, source="test"))
+        await bus.join()
+        await asyncio.sleep(0.1)
+        await bus.stop()
+        return profiler
+
+    profiler = asyncio.run(run())
+    assert profiler.stalls
+    stall = profiler.stalls[0]
+    assert "blocking_handler_sleeps_synchronously" in stall.stack
+    assert stall.handler.endswith("on_event") and stall.event_type == "test.block"
+    assert stall.blocked_ms >= 50.0
+
+    stats = profiler.report()["subscribers"]
+    (name,) = [n for n in stats if n.endswith("on_event")]
+    assert stats[name]["calls"] == 1 and stats[name]["slow"] == 1
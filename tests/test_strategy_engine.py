@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from typing import List, Optional
+
+from botplatform.core.context import StrategyContext
+from botplatform.core.models import ActionIntent, OrderUpdate
+from botplatform.engines.strategy import StrategyEngine
+from botplatform.strategies.base import BaseStrategy
+from tests.factories import ctx, update
+
+
+class Probe(BaseStrategy):
+    """Запоминает тики, обновления и освобождённые интенты; на тике выдаёт один интент."""
+
+    def __init__(self, name: str, symbols: Optional[List[str]], engine: StrategyEngine | None = None,
+                 drop: str | None = None) -> None:
+        super().__init__(name, symbols)
+        self.engine = engine
+        self.drop = drop
+        self.ticks: List[str] = []
+        self.updates: List[str] = []
+        self.released: List[dict] = []
+
+    def on_tick(self, ctx: StrategyContext) -> List[ActionIntent]:
+        self.ticks.append(ctx.symbol)
+        if self.drop is not None:
+            self.engine.unregister_strategy(self.drop)
+        return [ActionIntent(action="open", side="LONG", context={"leg": self.name})]
+
+    def on_order_update(self, update: OrderUpdate) -> None:
+        self.updates.append(update.client_id)
+
+    def release_intent(self, context: Optional[dict]) -> None:
+        self.released.append(context)
+
+
+def test_ticks_reach_subscribers_and_catch_all_strategies() -> None:
+    engine = StrategyEngine()
+    btc, eth, every = Probe("btc", ["BTCUSDT"]), Probe("eth", ["ETHUSDT"]), Probe("all", None)
+    for s in (btc, eth, every):
+        engine.register_strategy(s)
+
+    intents = engine.on_tick(ctx(0, "BTCUSDT"))
+    assert [i.context["strategy"] for i in intents] == ["btc", "all"]
+    assert (btc.ticks, eth.ticks, every.ticks) == (["BTCUSDT"], [], ["BTCUSDT"])
+    assert engine.strategies_for("XRPUSDT") == (every,)
+
+    engine.unregister_strategy("all")
+    assert engine.strategies_for("XRPUSDT") == ()
+
+
+def test_unregister_during_on_tick_does_not_skip_other_strategies() -> None:
+    engine = StrategyEngine()
+    first = Probe("first", ["BTCUSDT"], engine, drop="first")
+    second = Probe("second", ["BTCUSDT"])
+    engine.register_strategy(first)
+    engine.register_strategy(second)
+
+    engine.on_tick(ctx(0))
+    assert second.ticks == ["BTCUSDT"]
+    engine.on_tick(ctx(1))
+    assert first.ticks == ["BTCUSDT"] and second.ticks == ["BTCUSDT", "BTCUSDT"]
+
+
+def test_bound_orders_go_to_their_strategy_until_final_status() -> None:
+    engine = StrategyEngine()
+    a, b = Probe("a", ["BTCUSDT"]), Probe("b", ["BTCUSDT"])
+    engine.register_strategy(a)
+    engine.register_strategy(b)
+    engine.bind_order("c1", {"strategy": "b"})
+
+    assert engine.on_order_update(update("c1", "PARTIAL", 0.5, avg=100.0)) == ["b"]
+    assert engine.on_order_update(update("c1", "FILLED", 1.0, avg=100.0)) == ["b"]
+    # После финального статуса привязки нет: обновление получают все стратегии символа.
+    assert engine.on_order_update(update("c1", "FILLED", 1.0, avg=100.0)) == ["a", "b"]
+    assert (a.updates, b.updates) == (["c1"], ["c1", "c1", "c1"])
+
+    engine.bind_order("c2", {"strategy": "unknown"})
+    assert engine.on_order_update(update("c2", "NEW")) == ["a", "b"]
+
+
+def test_release_intent_reaches_the_author() -> None:
+    engine = StrategyEngine()
+    a, b = Probe("a", ["BTCUSDT"]), Probe("b", ["BTCUSDT"])
+    engine.register_strategy(a)
+    engine.register_strategy(b)
+
+    intents = engine.on_tick(ctx(0))
+    engine.release_intent(intents[1].context)
+    engine.release_intent(None)
+    assert a.released == [] and b.released == [{"leg": "b", "strategy": "b"}]
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import asyncio
+from typing import List
+
+import pytest
+
+from botplatform.core.context import StrategyContext
+from botplatform.core.event_bus import EventBus
+from botplatform.core.events import Event
+from botplatform.core.models import ActionIntent
+from botplatform.core.records import MarketRecord
+from botplatform.engines.backtest import random_walk_ticks
+from botplatform.engines.signals_indicators import IndicatorSignalsEngine
+from botplatform.engines.strategy_runtime import StrategyRuntime
+from botplatform.exchanges.mock import MockExchange
+from botplatform.storage.history import MarketHistory
+from botplatform.strategies.base import BaseStrategy
+
+SYMBOLS = ["BTCUSDT", "ETHUSDT"]
+
+
+def names(runtime: StrategyRuntime) -> list:
+    return sorted(s.name for s in runtime.strategy_engine.all())
+
+
+def test_one_strategy_for_the_first_symbol_by_default() -> None:
+    runtime = StrategyRuntime(EventBus(), MockExchange(), SYMBOLS)
+    assert names(runtime) == ["hedge-BTCUSDT"]
+
+
+def test_per_symbol_registers_a_strategy_for_each_symbol() -> None:
+    runtime = StrategyRuntime(EventBus(), MockExchange(), SYMBOLS, per_symbol=True)
+    assert names(runtime) == ["hedge-BTCUSDT", "hedge-ETHUSDT"]
+
+
+class Recorder(BaseStrategy):
+    def __init__(self) -> None:
+        super().__init__("recorder", symbols=None)
+        self.contexts: List[StrategyContext] = []
+
+    def on_tick(self, ctx: StrategyContext) -> List[ActionIntent]:
+        self.contexts.append(ctx)
+        return []
+
+
+def test_market_records_reach_strategies_without_model_conversion(monkeypatch: pytest.MonkeyPatch) -> None:
+    def forbidden(self: MarketRecord) -> None:
+        raise AssertionError("MarketRecord.to_model() on the hot path")
+
+    monkeypatch.setattr(MarketRecord, "to_model", forbidden)
+    record = next(random_walk_ticks(["BTCUSDT"], 1, seed=1))
+
+    async def run() -> Recorder:
+        bus = EventBus()
+        history = MarketHistory()
+        history.subscribe(bus)
+        runtime = StrategyRuntime(
+            bus, MockExchange(price_provider=lambda s: record.price), ["BTCUSDT"],
+            history=history, signals=IndicatorSignalsEngine(), reconcile_interval=0.0,
+        )
+        recorder = Recorder()
+        runtime.strategy_engine.register_strategy(recorder)
+        await bus.start()
+        await runtime.start()
+        await bus.publish(Event(type="market.snapshot", timestamp=record.timestamp, source="test", data=record))
+        await bus.join()
+        await runtime.stop()
+        await bus.stop()
+        return recorder
+
+    (ctx,) = asyncio.run(run()).contexts
+    assert ctx.market is record
+    assert ctx.signals is not None and ctx.history is not None
+
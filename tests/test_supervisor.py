@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import asyncio
+import os
+from typing import List
+
+from botplatform.core.event_bus import EventBus
+from botplatform.core.events import Event
+from botplatform.engines.backtest import random_walk_ticks
+from botplatform.engines.supervisor import ShardSupervisor, partition_symbols
+
+SYMBOLS = ["BTCUSDT", "ETHUSDT", "SOLUSDT", "XRPUSDT"]
+TICKS = 200
+
+
+def test_partition_is_even_and_deterministic() -> None:
+    assignment = partition_symbols(SYMBOLS, 2)
+    assert assignment == partition_symbols(list(reversed(SYMBOLS)), 2)
+    assert sorted(assignment.values()) == [0, 0, 1, 1]
+
+
+def test_two_shards_process_all_ticks() -> None:
+    async def run() -> ShardSupervisor:
+        bus = EventBus()
+        supervisor = ShardSupervisor(bus, SYMBOLS, shards=2, metrics_interval=0.1)
+        orders: List[Event] = []
+
+        async def on_update(event: Event) -> None:
+            orders.append(event)
+
+        bus.subscribe("order.update", on_update)
+        await bus.start()
+        await supervisor.start()
+        try:
+            for tick in random_walk_ticks(SYMBOLS, TICKS, seed=1):
+                await bus.publish(Event(type="market.snapshot", timestamp=tick.timestamp, source="test", data=tick))
+            await bus.join()
+        finally:
+            await supervisor.stop(timeout=30.0)
+        await bus.join()
+        await bus.stop()
+        assert len(orders) == supervisor.totals()["orders"]
+        return supervisor
+
+    supervisor = asyncio.run(run())
+    assert set(supervisor.metrics) == {0, 1}
+    pids = {m["pid"] for m in supervisor.metrics.values()}
+    assert len(pids) == 2 and os.getpid() not in pids
+    for shard_id, m in supervisor.metrics.items():
+        assert m["symbols"] == 2
+        assert m["ticks"] == 2 * TICKS, shard_id
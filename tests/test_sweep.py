@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from botplatform.engines.backtest import random_walk_ticks
+from botplatform.engines.replay import merge_ticks
+from botplatform.engines.sweep import run_sweep
+from botplatform.storage.tickstore import TickStore
+
+SYMBOLS = ["BTCUSDT", "ETHUSDT"]
+
+
+def write_store(root: Path) -> TickStore:
+    store = TickStore(root)
+    for tick in random_walk_ticks(SYMBOLS, 2_000, seed=2, volatility=0.01):
+        store.append(tick)
+    store.close()
+    return store
+
+
+def test_merge_ticks_orders_symbols_by_time(tmp_path: Path) -> None:
+    store = write_store(tmp_path)
+    ticks = list(merge_ticks(store, SYMBOLS))
+    assert len(ticks) == 2 * 2_000
+    assert {t.symbol for t in ticks} == set(SYMBOLS)
+    assert all(a.timestamp <= b.timestamp for a, b in zip(ticks, ticks[1:]))
+    assert len(list(merge_ticks(store, SYMBOLS[:1], end_ms=ticks[0].timestamp + 5_000))) == 10
+
+
+def test_sweep_reports_pnl_per_leg(tmp_path: Path) -> None:
+    write_store(tmp_path)
+    rows = run_sweep(str(tmp_path), SYMBOLS, {"base_size": [0.001, 0.002]}, processes=1, sort_by="long_pnl")
+    for row in rows:
+        assert row["ticks"] == 2 * 2_000
+        # Ноги хеджа гасят друг друга на бирже, но не в отчёте по ногам.
+        assert abs(row["pnl"]) < 1e-9
+        assert row["long_pnl"] != 0.0
+        assert abs(row["long_pnl"] + row["short_pnl"]) < 1e-9
+    assert rows[0]["long_pnl"] >= rows[1]["long_pnl"]
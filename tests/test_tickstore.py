@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+
+from botplatform.core.models import MarketSnapshot
+from botplatform.storage.tickstore import INDEX_DTYPE, TickFile, TickFileWriter, TickStore, day_of
+
+DAY_MS = 86_400_000
+# 100 тиков раз в секунду, полночь UTC между 50-м и 51-м.
+MIDNIGHT = 20_000 * DAY_MS
+STAMPS = [MIDNIGHT - 50_000 + 1_000 * i for i in range(100)]
+
+
+def tick(ts: int) -> MarketSnapshot:
+    price = float(ts % 1_000_000)
+    return MarketSnapshot(symbol="BTCUSDT", price=price, bid=price - 0.5, ask=price + 0.5,
+                          bids=[], asks=[], trades=[], timestamp=ts)
+
+
+def write_store(root: Path) -> TickStore:
+    store = TickStore(root, block_size=7)
+    for ts in STAMPS:
+        store.append(tick(ts))
+    store.close()
+    return store
+
+
+def read(store: TickStore, start: Optional[int], end: Optional[int]) -> List[int]:
+    stamps: List[int] = []
+    for w in store.read("BTCUSDT", start, end):
+        assert np.array_equal(w.price, (w.timestamp % 1_000_000).astype(float))
+        assert np.array_equal(w.ask - w.bid, np.ones(len(w.timestamp)))
+        stamps.extend(w.timestamp.tolist())
+    return stamps
+
+
+def test_ranges_across_blocks_and_days(tmp_path: Path) -> None:
+    store = write_store(tmp_path)
+    assert store.days("BTCUSDT") == [day_of(MIDNIGHT - 1), day_of(MIDNIGHT)]
+
+    ranges = [
+        (None, None),
+        (STAMPS[3], STAMPS[4]),          # одна строка внутри блока
+        (STAMPS[5], STAMPS[16]),         # через границы блоков
+        (STAMPS[40], STAMPS[60]),        # через полночь
+        (MIDNIGHT, MIDNIGHT + 1),        # первый тик нового дня
+        (STAMPS[10] + 1, STAMPS[11]),    # пусто между тиками
+        (STAMPS[-1], STAMPS[-1] + 1),
+        (STAMPS[0] - 10_000, STAMPS[0]),
+    ]
+    for start, end in ranges:
+        expected = [t for t in STAMPS if (start is None or t >= start) and (end is None or t < end)]
+        assert read(store, start, end) == expected, (start, end)
+
+
+def test_torn_index_is_rebuilt_from_block_headers(tmp_path: Path) -> None:
+    store = write_store(tmp_path)
+    path = store.path("BTCUSDT", day_of(MIDNIGHT))
+    idx = path.with_suffix(".idx")
+    full = idx.read_bytes()
+    idx.write_bytes(full[:-INDEX_DTYPE.itemsize // 2])  # оборванная последняя запись
+
+    with TickFile(path) as f:
+        assert len(f) == 50
+    assert read(store, MIDNIGHT, None) == STAMPS[50:]
+
+    # Писатель при открытии переписывает индекс целиком и дописывает дальше.
+    with TickFileWriter(path, block_size=7) as w:
+        w.append(STAMPS[-1] + 1_000, 1.0, 0.5, 1.5, 0.0)
+    assert idx.read_bytes()[:len(full)] == full
+    with TickFile(path) as f:
+        assert len(f) == 51 and f.end_ms == STAMPS[-1] + 1_000
+
+
+def test_torn_data_tail_is_cut_on_reopen(tmp_path: Path) -> None:
+    store = write_store(tmp_path)
+    path = store.path("BTCUSDT", day_of(MIDNIGHT))
+    size = path.stat().st_size
+    with open(path, "ab") as f:
+        f.write(np.array([MIDNIGHT * 2, MIDNIGHT * 2, 1_000], dtype=np.int64).tobytes() + b"\x00" * 16)
+
+    with TickFileWriter(path, block_size=7):
+        pass
+    assert path.stat().st_size == size
+    assert read(store, MIDNIGHT, None) == STAMPS[50:]
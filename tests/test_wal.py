@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from botplatform.storage import wal as wal_module
+from botplatform.storage.wal import WALStorage
+
+
+def records(path: Path) -> list:
+    return WALStorage._read_log(path / WALStorage.LOG_NAME)[0]
+
+
+def test_state_survives_reopen(tmp_path: Path) -> None:
+    store = WALStorage(tmp_path, commit_delay=0)
+    for i in range(10):
+        store.save_state(f"k{i % 3}", {"v": i})
+    assert store.flush(timeout=5)
+    store.close()
+
+    store = WALStorage(tmp_path, commit_delay=0)
+    assert {k: store.load_state(k) for k in store.keys()} == {"k0": {"v": 9}, "k1": {"v": 7}, "k2": {"v": 8}}
+    store.close()
+
+
+def test_torn_tail_is_truncated(tmp_path: Path) -> None:
+    store = WALStorage(tmp_path, commit_delay=0)
+    store.save_state("a", {"v": 1})
+    store.close()
+    log_path = tmp_path / WALStorage.LOG_NAME
+    good = log_path.stat().st_size
+    with open(log_path, "ab") as f:
+        f.write(wal_module.RECORD_HEADER.pack(100, 0) + b'{"q":2')
+
+    store = WALStorage(tmp_path, commit_delay=0)
+    assert store.load_state("a") == {"v": 1}
+    assert log_path.stat().st_size == good
+    store.save_state("a", {"v": 2})
+    store.close()
+    assert [r[2] for r in records(tmp_path)] == [{"v": 1}, {"v": 2}]
+
+
+def test_records_older_than_snapshot_are_skipped(tmp_path: Path) -> None:
+    store = WALStorage(tmp_path, commit_delay=0)
+    for i in range(3):
+        store.save_state("a", {"v": i})
+    store.close()
+    # Сбой во время компакции: снапшот уже записан, старый журнал ещё не обнулён.
+    (tmp_path / WALStorage.SNAPSHOT_NAME).write_text(json.dumps({"seq": 3, "data": {"a": {"v": "snap"}}}))
+
+    store = WALStorage(tmp_path, commit_delay=0)
+    assert store.load_state("a") == {"v": "snap"}
+    store.save_state("a", {"v": "after"})
+    store.close()
+
+    store = WALStorage(tmp_path, commit_delay=0)
+    assert store.load_state("a") == {"v": "after"}
+    store.close()
+
+
+def test_compaction_keeps_state(tmp_path: Path) -> None:
+    store = WALStorage(tmp_path, commit_delay=0, compact_bytes=64)
+    for i in range(20):
+        store.save_state(f"k{i % 4}", {"v": i})
+        store.flush(timeout=5)
+    assert store.compactions > 0
+    store.close()
+
+    store = WALStorage(tmp_path, commit_delay=0)
+    assert store.load_state("k3") == {"v": 19}
+    store.close()
+
+
+def test_failed_fsync_is_retried_without_duplicates(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    real_fsync = os.fsync
+    failures = {"left": 2}
+
+    def flaky_fsync(fd: int) -> None:
+        if failures["left"] > 0:
+            failures["left"] -= 1
+            raise OSError(5, "I/O error")
+        real_fsync(fd)
+
+    monkeypatch.setattr(wal_module.os, "fsync", flaky_fsync)
+    store = WALStorage(tmp_path, commit_delay=0, retry_delay=0.01)
+    store.save_state("a", {"v": 1})
+    with pytest.raises(OSError):
+        store.flush(timeout=5)
+    # Пока запись не удалась, flush() поднимает последнюю ошибку.
+    for _ in range(100):
+        try:
+            if store.flush(timeout=5):
+                break
+        except OSError:
+            time.sleep(0.01)
+    else:
+        pytest.fail("WAL write was not retried")
+    assert store.write_errors == 2
+    store.save_state("a", {"v": 2})
+    assert store.flush(timeout=5)
+    store.close()
+
+    # Недописанная пачка отрезана перед повтором: в журнале каждая запись один раз.
+    assert [(r[0], r[2]) for r in records(tmp_path)] == [(1, {"v": 1}), (2, {"v": 2})]